@@ -0,0 +1,79 @@
+"""Micro-benchmark for boxscore row extraction.
+
+Compares the old one-CSS-select-per-stat extraction against the
+single-pass `data-stat` extraction used by `BoxscorePageParser`. The
+page is parsed once up front so only row extraction is timed.
+
+    $ python -m benchmark.bench_boxscore_rows
+"""
+
+import timeit
+
+from bs4 import BeautifulSoup
+
+from fantalytix_python_crawler.crawler.sports_reference.basketball\
+    .boxscore_page_parser import BoxscorePageParser
+
+from test.sports_reference.basketball.fixtures import load_fixture
+
+FIXTURES = ['boxscore_201810310GSW.html']
+REPEAT = 5
+NUMBER = 20
+
+def select_per_stat(parser, handler, abbreviation, data):
+    """The extraction as it was before the single-pass row helper."""
+    for table_format, stats in (
+            (parser.TABLE_BASIC_BOX_SCORE, parser.BASIC_BOX_SCORE_STATS),
+            (parser.TABLE_ADVANCED_BOX_SCORE,
+             parser.ADVANCED_BOX_SCORE_STATS)):
+        table = handler.select(table_format.format(
+            abbreviation=abbreviation))[0]
+        for row in table.tbody.find_all('tr'):
+            if row.get('class') is not None and 'thead' in row.get('class'):
+                continue
+            if len(row.select("td[data-stat=reason]")) == 0:
+                player = {'player': row.select("th[data-stat=player]")[0].text}
+                for stat in stats:
+                    player[stat] = row.select(
+                        "td[data-stat={}]".format(stat))[0].text
+                data.append(player)
+            else:
+                data.append({
+                    'player': row.select("th[data-stat=player]")[0].text,
+                    'did_not_play': row.select(
+                        "td[data-stat=reason]")[0].text
+                })
+
+def single_pass(parser, handler, abbreviation, data):
+    parser.process_basic_box_table(handler, abbreviation, data)
+    parser.process_advanced_box_table(handler, abbreviation, data)
+
+def bench(name, extract, parser, handler, abbreviations):
+    rows = []
+    for abbreviation in abbreviations:
+        extract(parser, handler, abbreviation, rows)
+
+    def run():
+        for abbreviation in abbreviations:
+            extract(parser, handler, abbreviation, [])
+
+    best = min(timeit.repeat(run, repeat=REPEAT, number=NUMBER)) / NUMBER
+    print("  {:<16} {:>10.0f} rows/sec".format(name, len(rows) / best))
+    return len(rows) / best
+
+def main():
+    for fixture in FIXTURES:
+        parser = BoxscorePageParser(load_fixture(fixture))
+        handler = BeautifulSoup(parser.html, parser.parser)
+        abbreviations = [
+            parser.get_abbreviation_from_url(field.get('href')).lower()
+            for field in parser.get_team_season_url_fields(handler)]
+        print(fixture)
+        before = bench('select per stat', select_per_stat, parser, handler,
+                       abbreviations)
+        after = bench('single pass', single_pass, parser, handler,
+                      abbreviations)
+        print("  speedup          {:>10.1f}x".format(after / before))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Benchmark for writing parsed boxscores as Parquet and as JSON lines.
+
+Feeds the same parsed boxscore, under GAMES game ids spread over a
+season's dates, to `ColumnarSink` and to `json_lines_sink`, and reports
+the write time and the bytes on disk of each. Parquet is written both
+partitioned by date and by season only.
+
+    $ python -m benchmark.bench_columnar_sink [games]
+"""
+
+import os
+
+import sys
+
+import tempfile
+
+import time
+
+from datetime import date, timedelta
+
+from fantalytix_python_crawler.crawler.sports_reference.basketball\
+    .boxscore_page_parser import BoxscorePageParser
+from fantalytix_python_crawler.crawler.sports_reference.basketball\
+    .columnar_sink import ColumnarSink
+from fantalytix_python_crawler.crawler.sports_reference.basketball\
+    .crawl_pipeline import json_lines_sink
+
+from test.sports_reference.basketball.fixtures import load_fixture
+
+GAMES = 1230
+GAMES_PER_DAY = 7
+URL = 'https://www.basketball-reference.com/boxscores/{}.html'
+
+def get_pages(count):
+    data = BoxscorePageParser(
+        load_fixture('boxscore_201810310GSW.html')).get_data()
+    start = date(2018, 10, 16)
+    for index in range(count):
+        game_date = start + timedelta(days=index // GAMES_PER_DAY)
+        game_id = '{}{}GSW'.format(game_date.strftime('%Y%m%d'), index % 10)
+        yield (URL.format(game_id),
+               {'league': 'NBA', 'end_year': 2019, 'game_date': game_date},
+               data)
+
+def get_size(path):
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    return sum(os.path.getsize(os.path.join(root, name))
+               for root, _, names in os.walk(path) for name in names)
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else GAMES
+    pages = list(get_pages(count))
+    with tempfile.TemporaryDirectory() as temp_dir:
+        json_path = os.path.join(temp_dir, 'boxscores.jsonl')
+        start = time.perf_counter()
+        with open(json_path, 'w') as stream:
+            sink = json_lines_sink(stream)
+            for url, context, data in pages:
+                sink('boxscores', url, context, data)
+        json_seconds = time.perf_counter() - start
+
+        print("{} boxscores".format(count))
+        print("{:<20} {:>8} {:>8} {:>10}".format(
+            'format', 'files', 'seconds', 'KiB'))
+        print("{:<20} {:>8} {:>8.2f} {:>10.0f}".format(
+            'json lines', 1, json_seconds, get_size(json_path) / 1024))
+
+        for label, partition_dates in [('parquet by date', True),
+                                       ('parquet by season', False)]:
+            parquet_path = os.path.join(temp_dir, label.replace(' ', '_'))
+            start = time.perf_counter()
+            with ColumnarSink(parquet_path,
+                              partition_dates=partition_dates) as sink:
+                for url, context, data in pages:
+                    sink('boxscores', url, context, data)
+            seconds = time.perf_counter() - start
+            print("{:<20} {:>8} {:>8.2f} {:>10.0f}".format(
+                label, len(sink.files), seconds,
+                get_size(parquet_path) / 1024))
+
+if __name__ == "__main__":
+    main()
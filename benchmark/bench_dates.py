@@ -0,0 +1,77 @@
+"""Benchmark for converting the dates and start times of a full season's
+schedule rows.
+
+The season is SEASON_GAMES games spread over the days from OPENING_DAY to
+the end of the regular season and playoffs, each at one of START_TIMES,
+as the schedule pages show them. Each row's date and time text is
+converted with
+
+    strptime   the schedule parser's previous `datetime.strptime` path
+    match      `dates` without memoization
+    memoized   `dates` as the parsers use it, starting from an empty cache
+
+    $ python -m benchmark.bench_dates
+"""
+
+import timeit
+
+from datetime import date, timedelta
+
+from fantalytix_python_crawler.crawler.sports_reference.basketball import\
+    dates
+
+OPENING_DAY = date(2018, 10, 16)
+SEASON_DAYS = 240
+SEASON_GAMES = 1312
+START_TIMES = ['7:00p', '7:30p', '8:00p', '8:30p', '9:00p', '10:00p',
+               '10:30p', '1:00p', '3:30p', '12:00p']
+REPEAT = 5
+NUMBER = 10
+
+def get_season_rows():
+    rows = []
+    for game in range(SEASON_GAMES):
+        day = OPENING_DAY + timedelta(days=game * SEASON_DAYS // SEASON_GAMES)
+        rows.append(('{:%a, %b} {}, {}'.format(day, day.day, day.year),
+                     START_TIMES[game % len(START_TIMES)]))
+    return rows
+
+def convert_strptime(rows):
+    for date_text, time_text in rows:
+        dates.strptime_game_date(date_text)
+        dates.strptime_game_time(time_text)
+
+def convert_match(rows):
+    parse_game_date = dates.parse_game_date.__wrapped__
+    parse_game_time = dates.parse_game_time.__wrapped__
+    for date_text, time_text in rows:
+        parse_game_date(date_text)
+        parse_game_time(time_text)
+
+def convert_memoized(rows):
+    dates.parse_game_date.cache_clear()
+    dates.parse_game_time.cache_clear()
+    for date_text, time_text in rows:
+        dates.parse_game_date(date_text)
+        dates.parse_game_time(time_text)
+
+def main():
+    rows = get_season_rows()
+    print('{} rows, {} distinct dates, {} distinct times'.format(
+        len(rows), len({row[0] for row in rows}),
+        len({row[1] for row in rows})))
+    print("{:<10} {:>10} {:>10} {:>8}".format(
+        'path', 'ms', 'us/row', 'speedup'))
+    baseline = None
+    for name, convert in [('strptime', convert_strptime),
+                          ('match', convert_match),
+                          ('memoized', convert_memoized)]:
+        seconds = min(timeit.repeat(lambda: convert(rows), repeat=REPEAT,
+                                    number=NUMBER)) / NUMBER
+        baseline = baseline or seconds
+        print("{:<10} {:>10.2f} {:>10.2f} {:>7.1f}x".format(
+            name, seconds * 1000, seconds / len(rows) * 1e6,
+            baseline / seconds))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Benchmark for loading boxscores into SQLite with DatabaseLoader against
+inserting them a row at a time.
+
+Loads the saved boxscore GAMES times under different game ids into a
+fresh database file, and reports rows per second for
+
+    naive     one INSERT and one commit per row, as consumers do today
+    per-row   one INSERT per row, one commit per game
+    loader    DatabaseLoader: batched executemany upserts
+
+Every variant converts the stats to numbers the same way, so the time
+difference is in the writes.
+
+    $ python -m benchmark.bench_db_loader
+"""
+
+import os
+
+import sqlite3
+
+import tempfile
+
+import time
+
+from fantalytix_python_crawler.crawler.sports_reference.basketball\
+    .boxscore_page_parser import BoxscorePageParser
+from fantalytix_python_crawler.crawler.sports_reference.basketball\
+    .db_loader import (BOXSCORE_ADVANCED, BOXSCORE_BASIC, BOXSCORE_TEAMS,
+                       DatabaseLoader, TABLES, get_boxscore_rows,
+                       get_create_table)
+from fantalytix_python_crawler.crawler.sports_reference.basketball\
+    .records import ADVANCED_BOX_SCORE_STATS, BASIC_BOX_SCORE_STATS
+
+from test.sports_reference.basketball.fixtures import load_fixture
+
+GAMES = 300
+URL = 'https://www.basketball-reference.com/boxscores/{:09d}0GSW.html'
+
+def get_insert(table):
+    columns, _ = TABLES[table]
+    return 'INSERT INTO {} VALUES ({})'.format(
+        table, ', '.join('?' * len(columns)))
+
+def get_rows(game_id, boxscore):
+    """The rows the loader writes for a game, by table."""
+    return {table: [row for team in BOXSCORE_TEAMS
+                    for row in get_boxscore_rows(game_id, team,
+                                                 boxscore[team][key], stats,
+                                                 starters)]
+            for table, key, stats, starters in [
+                (BOXSCORE_BASIC, 'basic', BASIC_BOX_SCORE_STATS, True),
+                (BOXSCORE_ADVANCED, 'advanced', ADVANCED_BOX_SCORE_STATS,
+                 False)]}
+
+def load_per_row(path, boxscore, commit_every_row):
+    connection = sqlite3.connect(path)
+    for table in TABLES:
+        connection.execute(get_create_table(table))
+    inserts = {table: get_insert(table) for table in TABLES}
+    for game in range(GAMES):
+        game_id = '{:09d}0GSW'.format(game)
+        for table, table_rows in get_rows(game_id, boxscore).items():
+            for row in table_rows:
+                connection.execute(inserts[table], row)
+                if commit_every_row:
+                    connection.commit()
+        connection.commit()
+    connection.close()
+
+def load_naive(path, boxscore):
+    load_per_row(path, boxscore, True)
+
+def load_per_game(path, boxscore):
+    load_per_row(path, boxscore, False)
+
+def load_batched(path, boxscore):
+    with DatabaseLoader(path) as loader:
+        for game in range(GAMES):
+            loader.load_boxscore(URL.format(game), boxscore)
+
+def main():
+    boxscore = BoxscorePageParser(
+        load_fixture('boxscore_201810310GSW.html')).get_data()
+    rows = GAMES * sum(len(table_rows)
+                       for table_rows in get_rows('', boxscore).values())
+    print("{:<8} {:>8} {:>9} {:>12}".format('', 'rows', 'time', 'rows/sec'))
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for name, load in [('naive', load_naive), ('per-row', load_per_game),
+                           ('loader', load_batched)]:
+            path = os.path.join(temp_dir, name + '.sqlite')
+            start = time.perf_counter()
+            load(path, boxscore)
+            elapsed = time.perf_counter() - start
+            print("{:<8} {:>8} {:>8.2f}s {:>12.0f}".format(
+                name, rows, elapsed, rows / elapsed))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Benchmark for adding urls to and popping them from the crawl frontier.
+
+Adds URLS boxscore urls in batches of BATCH, adds them all again (every
+one a duplicate), then pops them all in batches of BATCH, and reports
+urls per second for each. Adding and popping one url per call is timed
+on a smaller sample for comparison.
+
+    $ python -m benchmark.bench_frontier
+"""
+
+import os
+
+import tempfile
+
+import time
+
+from datetime import date
+
+from fantalytix_python_crawler.crawler.frontier import Frontier
+
+URLS = 100000
+BATCH = 1000
+SINGLE = 2000
+
+def get_items(count, offset=0):
+    return [('https://www.basketball-reference.com/boxscores/{:09d}0GSW.html'
+             .format(offset + i), 'boxscores',
+             {'league': 'NBA', 'end_year': 2019,
+              'game_date': date(2018, 10, 31)}, -2019)
+            for i in range(count)]
+
+def batches(items):
+    for start in range(0, len(items), BATCH):
+        yield items[start:start + BATCH]
+
+def timed(label, count, run):
+    start = time.perf_counter()
+    run()
+    elapsed = time.perf_counter() - start
+    print("{:<22} {:>8} urls {:>8.2f}s {:>10.0f} urls/sec".format(
+        label, count, elapsed, count / elapsed))
+
+def main():
+    items = get_items(URLS)
+    singles = get_items(SINGLE, URLS)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        with Frontier(os.path.join(temp_dir, 'frontier.sqlite')) as frontier:
+            timed('add, batches', URLS,
+                  lambda: [frontier.add(batch) for batch in batches(items)])
+            timed('add duplicates', URLS,
+                  lambda: [frontier.add(batch) for batch in batches(items)])
+            timed('pop, batches', URLS,
+                  lambda: [frontier.pop(BATCH) for _ in batches(items)])
+            timed('add, one at a time', SINGLE,
+                  lambda: [frontier.add([item]) for item in singles])
+            timed('pop, one at a time', SINGLE,
+                  lambda: [frontier.pop() for _ in singles])
+            timed('done, one at a time', SINGLE,
+                  lambda: [frontier.done(item[0]) for item in singles])
+
+if __name__ == "__main__":
+    main()
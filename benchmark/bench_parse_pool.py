@@ -0,0 +1,41 @@
+"""Benchmark for parsing boxscores across processes with `parse_many`.
+
+Parses a corpus of saved boxscores with 1 up to `os.cpu_count()` worker
+processes and reports pages/sec and the speedup over one process. The
+pool is started inside each timed run, as `parse_many` does.
+
+    $ python -m benchmark.bench_parse_pool [pages [max workers]]
+"""
+
+import os
+
+import sys
+
+import time
+
+from fantalytix_python_crawler.crawler.parse_pool import parse_many
+from fantalytix_python_crawler.crawler.sports_reference.basketball\
+    .boxscore_page_parser import BoxscorePageParser
+
+from test.sports_reference.basketball.fixtures import load_fixture
+
+PAGES = 96
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else PAGES
+    max_workers = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count()
+    pages = [load_fixture('boxscore_201810310GSW.html')] * count
+    print("{} boxscores, {} cpus".format(count, os.cpu_count()))
+    print("{:>8} {:>10} {:>10} {:>8}".format(
+        'workers', 'seconds', 'pages/sec', 'speedup'))
+    baseline = None
+    for workers in range(1, (max_workers or 1) + 1):
+        start = time.perf_counter()
+        parse_many(BoxscorePageParser, pages, workers=workers)
+        seconds = time.perf_counter() - start
+        baseline = baseline or seconds
+        print("{:>8} {:>10.2f} {:>10.1f} {:>7.2f}x".format(
+            workers, seconds, count / seconds, baseline / seconds))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+"""Benchmark of every page parser over the saved page corpus, with results
+kept per commit so a change can be compared with an earlier one.
+
+For each page in CORPUS the parser is run in a fresh process, which
+reports
+
+    ms        best time per parse over REPEAT runs of NUMBER parses
+    alloc     memory allocated at the peak of one parse, by tracemalloc
+    rss       the process's peak resident set size after parsing
+    rss +     how much parsing raised the peak RSS over the process
+              with the page loaded
+
+The RSS columns need the `resource` module, so they are blank on
+Windows. `ru_maxrss` is in KiB on Linux and the BSDs and in bytes on
+macOS.
+
+`--save` writes the results to RESULTS_DIR/<commit>_<parser>.json, with
+'-dirty' added to the commit when `src` has uncommitted changes.
+RESULTS_DIR is not committed. `--compare <commit or file>` prints the
+change in time from results saved with the same parser.
+
+    $ git checkout master && python -m benchmark.bench_parsers --save
+    $ git checkout my-branch
+    $ python -m benchmark.bench_parsers --compare <master commit>
+
+`--compare baseline` compares with the committed results in
+BASELINE_DIR/<parser>.json, and `--save-baseline` replaces them. The
+baseline was recorded on one shared Linux machine, where times moved
+by up to 40% between identical runs, so read a change in time against
+a fresh run of the base commit on the same machine; the alloc column
+is deterministic and carries over.
+
+The corpus is small and none of it is captured from the site: one page
+per parser, each a trimmed reconstruction of the site's markup (see
+the fixtures README for each file's provenance). The `synthetic_`
+boxscores are hand edits of `boxscore_201810310GSW.html`, so all three
+boxscores share one game's markup. Markup drift on the live site, or a
+change that only shows up on other games, seasons or page layouts,
+won't show up here.
+"""
+
+import argparse
+
+import json
+
+import multiprocessing
+
+import os
+
+import platform
+
+import subprocess
+
+import sys
+
+import time
+
+import timeit
+
+import tracemalloc
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+from fantalytix_python_crawler.crawler.sports_reference.basketball\
+    .boxscore_page_parser import BoxscorePageParser
+from fantalytix_python_crawler.crawler.sports_reference.basketball\
+    .leagues_page_parser import LeaguesPageParser
+from fantalytix_python_crawler.crawler.sports_reference.basketball\
+    .player_dir_page_parser import PlayersDirPageParser
+from fantalytix_python_crawler.crawler.sports_reference.basketball\
+    .player_page_parser import PlayerPageParser
+from fantalytix_python_crawler.crawler.sports_reference.basketball\
+    .season_schedule_page_parser import SeasonSchedulePageParser
+from fantalytix_python_crawler.crawler.sports_reference.basketball\
+    .season_summary_page_parser import SeasonSummaryPageParser
+from fantalytix_python_crawler.crawler.sports_reference.basketball\
+    .teams_page_parser import TeamsPageParser
+
+from test.sports_reference.basketball.fixtures import load_fixture
+
+CORPUS = [
+    (LeaguesPageParser, 'leagues.html', 'get_data'),
+    (TeamsPageParser, 'teams.html', 'get_data'),
+    (PlayersDirPageParser, 'players.html', 'get_urls'),
+    (PlayerPageParser, 'player_simmobe01.html', 'get_data'),
+    (SeasonSummaryPageParser, 'NBA_2019.html', 'get_data'),
+    (SeasonSchedulePageParser, 'NBA_2019_games-october.html', 'get_data'),
+    (BoxscorePageParser, 'boxscore_201810310GSW.html', 'get_data'),
+    (BoxscorePageParser, 'synthetic_boxscore_overtime.html', 'get_data'),
+    (BoxscorePageParser, 'synthetic_boxscore_dnp_heavy.html', 'get_data'),
+]
+REPEAT = 5
+NUMBER = 10
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+RESULTS_DIR = os.path.join(BENCHMARK_DIR, 'results')
+BASELINE_DIR = os.path.join(BENCHMARK_DIR, 'baselines')
+BASELINE = 'baseline'
+# ru_maxrss is in bytes on macOS and in KiB everywhere else
+RSS_UNIT = 1 if sys.platform == 'darwin' else 1024
+
+def get_max_rss():
+    """Peak RSS of this process in bytes, or None without `resource`."""
+    if resource is None:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * RSS_UNIT
+
+def measure(parser_class, fixture, getter, parser):
+    page = load_fixture(fixture)
+    base_rss = get_max_rss()
+
+    def run():
+        getattr(parser_class(page, parser), getter)()
+
+    seconds = min(timeit.repeat(run, repeat=REPEAT, number=NUMBER)) / NUMBER
+    rss = get_max_rss()
+    tracemalloc.start()
+    run()
+    alloc = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    if rss is None:
+        return {'ms': seconds * 1000, 'alloc_kib': alloc / 1024,
+                'rss_mib': None, 'rss_delta_mib': None}
+    return {'ms': seconds * 1000, 'alloc_kib': alloc / 1024,
+            'rss_mib': rss / 2 ** 20,
+            'rss_delta_mib': (rss - base_rss) / 2 ** 20}
+
+def get_name(parser_class, fixture):
+    return '{}:{}'.format(parser_class.__name__, fixture)
+
+def run_corpus(parser):
+    """Measures each page in its own process so peak RSS is per page."""
+    context = multiprocessing.get_context('spawn')
+    results = dict()
+    for parser_class, fixture, getter in CORPUS:
+        with context.Pool(1) as pool:
+            results[get_name(parser_class, fixture)] = pool.apply(
+                measure, (parser_class, fixture, getter, parser))
+    return results
+
+def get_commit():
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+            text=True, check=True).stdout.strip()
+        dirty = subprocess.run(['git', 'diff', '--quiet', 'HEAD', '--', 'src'])
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+    return commit + ('-dirty' if dirty.returncode else '')
+
+def get_results_path(name, parser):
+    if name == BASELINE:
+        return os.path.join(BASELINE_DIR, '{}.json'.format(parser))
+    if os.path.exists(name):
+        return name
+    return os.path.join(RESULTS_DIR, '{}_{}.json'.format(name, parser))
+
+def save(commit, parser, results, path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump({
+            'commit': commit,
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'platform': sys.platform,
+            'parser': parser,
+            'results': results,
+        }, f, indent=2, sort_keys=True)
+    return path
+
+def print_results(results, baseline=None):
+    print("{:<52} {:>8} {:>10} {:>8} {:>8} {:>9}".format(
+        'parser:page', 'ms', 'alloc KiB', 'rss MiB', 'rss +', 'vs base'))
+    for name, result in results.items():
+        change = ''
+        if baseline is not None and name in baseline:
+            change = '{:+.1%}'.format(result['ms'] / baseline[name]['ms'] - 1)
+        rss = [format_mib(result[key])
+               for key in ('rss_mib', 'rss_delta_mib')]
+        print("{:<52} {:>8.2f} {:>10.0f} {:>8} {:>8} {:>9}".format(
+            name, result['ms'], result['alloc_kib'], rss[0], rss[1], change))
+
+def format_mib(value):
+    return '' if value is None else '{:.1f}'.format(value)
+
+def main(argv=None):
+    args = argparse.ArgumentParser(
+        description='Benchmark the page parsers over the saved corpus.')
+    args.add_argument('--parser', default='html.parser')
+    args.add_argument('--save', action='store_true',
+                      help='save the results under the current commit')
+    args.add_argument('--save-baseline', action='store_true',
+                      help='replace the committed baseline with the results')
+    args.add_argument('--compare', metavar='COMMIT',
+                      help="saved results, by commit or path, or 'baseline' "
+                           "for the committed ones, to compare to")
+    args = args.parse_args(argv)
+
+    baseline = None
+    if args.compare:
+        with open(get_results_path(args.compare, args.parser)) as f:
+            baseline = json.load(f)['results']
+
+    results = run_corpus(args.parser)
+    print_results(results, baseline)
+    commit = get_commit()
+    if args.save:
+        path = get_results_path(commit, args.parser)
+        print('Saved to {}'.format(save(commit, args.parser, results, path)))
+    if args.save_baseline:
+        path = get_results_path(BASELINE, args.parser)
+        print('Saved to {}'.format(save(commit, args.parser, results, path)))
+
+if __name__ == "__main__":
+    main()
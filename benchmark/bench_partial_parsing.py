@@ -0,0 +1,68 @@
+"""Benchmark for building only the page regions each parser declares.
+
+Times `get_data()` (or `get_urls()`) with the whole document built and
+with only the parser's REGIONS built, and reports the speedup and the
+peak memory of each, per parser class.
+
+    $ python -m benchmark.bench_partial_parsing
+"""
+
+import timeit
+import tracemalloc
+
+from fantalytix_python_crawler.crawler.sports_reference.basketball\
+    .boxscore_page_parser import BoxscorePageParser
+from fantalytix_python_crawler.crawler.sports_reference.basketball\
+    .leagues_page_parser import LeaguesPageParser
+from fantalytix_python_crawler.crawler.sports_reference.basketball\
+    .player_dir_page_parser import PlayersDirPageParser
+from fantalytix_python_crawler.crawler.sports_reference.basketball\
+    .player_page_parser import PlayerPageParser
+from fantalytix_python_crawler.crawler.sports_reference.basketball\
+    .season_schedule_page_parser import SeasonSchedulePageParser
+from fantalytix_python_crawler.crawler.sports_reference.basketball\
+    .season_summary_page_parser import SeasonSummaryPageParser
+from fantalytix_python_crawler.crawler.sports_reference.basketball\
+    .teams_page_parser import TeamsPageParser
+
+from test.sports_reference.basketball.fixtures import load_fixture
+
+PAGES = [
+    (LeaguesPageParser, 'leagues.html', 'get_data'),
+    (TeamsPageParser, 'teams.html', 'get_data'),
+    (PlayersDirPageParser, 'players.html', 'get_urls'),
+    (PlayerPageParser, 'player_simmobe01.html', 'get_data'),
+    (SeasonSchedulePageParser, 'NBA_2019_games-october.html', 'get_data'),
+    (SeasonSummaryPageParser, 'NBA_2019.html', 'get_data'),
+    (BoxscorePageParser, 'boxscore_201810310GSW.html', 'get_data'),
+]
+REPEAT = 5
+NUMBER = 5
+
+def measure(parser_class, page, getter):
+    def run():
+        getattr(parser_class(page), getter)()
+
+    seconds = min(timeit.repeat(run, repeat=REPEAT, number=NUMBER)) / NUMBER
+    tracemalloc.start()
+    run()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return seconds, peak
+
+def main():
+    print("{:<26} {:>10} {:>10} {:>8} {:>10} {:>10}".format(
+        'parser', 'full ms', 'region ms', 'speedup', 'full KiB',
+        'region KiB'))
+    for parser_class, fixture, getter in PAGES:
+        page = load_fixture(fixture)
+        full_parser_class = type(
+            parser_class.__name__, (parser_class,), {'REGIONS': None})
+        full, full_peak = measure(full_parser_class, page, getter)
+        partial, partial_peak = measure(parser_class, page, getter)
+        print("{:<26} {:>10.2f} {:>10.2f} {:>7.1f}x {:>10.0f} {:>10.0f}"
+              .format(parser_class.__name__, full * 1000, partial * 1000,
+                      full / partial, full_peak / 1024, partial_peak / 1024))
+
+if __name__ == "__main__":
+    main()
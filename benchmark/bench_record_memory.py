@@ -0,0 +1,62 @@
+"""Benchmark for the memory held by parsed rows as dicts and as records.
+
+Parses each saved page COPIES times with `records=False` and with
+`records=True`, keeps every result, and reports the memory allocated per
+row as measured by tracemalloc. The cell text strings are the same in
+both, so the difference is the container of each row.
+
+    $ python -m benchmark.bench_record_memory
+"""
+
+import gc
+
+import tracemalloc
+
+from fantalytix_python_crawler.crawler.sports_reference.basketball\
+    .boxscore_page_parser import BoxscorePageParser
+from fantalytix_python_crawler.crawler.sports_reference.basketball\
+    .leagues_page_parser import LeaguesPageParser
+from fantalytix_python_crawler.crawler.sports_reference.basketball\
+    .season_schedule_page_parser import SeasonSchedulePageParser
+from fantalytix_python_crawler.crawler.sports_reference.basketball\
+    .teams_page_parser import TeamsPageParser
+
+from test.sports_reference.basketball.fixtures import load_fixture
+
+def boxscore_rows(data):
+    return [row for team in data.values() for table in team.values()
+            for row in table]
+
+PAGES = [
+    (LeaguesPageParser, 'leagues.html', list),
+    (TeamsPageParser, 'teams.html', list),
+    (SeasonSchedulePageParser, 'NBA_2019_games-october.html', list),
+    (BoxscorePageParser, 'boxscore_201810310GSW.html', boxscore_rows),
+]
+COPIES = 20
+
+def measure(parser_class, page, get_rows, records):
+    gc.collect()
+    tracemalloc.start()
+    rows = []
+    for _ in range(COPIES):
+        rows.extend(get_rows(
+            parser_class(page, 'lxml.html', records=records).get_data()))
+    gc.collect()
+    held = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return held / len(rows), len(rows)
+
+def main():
+    print("{:<26} {:>6} {:>12} {:>14} {:>8}".format(
+        'parser', 'rows', 'dict B/row', 'record B/row', 'saved'))
+    for parser_class, fixture, get_rows in PAGES:
+        page = load_fixture(fixture)
+        dicts, count = measure(parser_class, page, get_rows, False)
+        records, _ = measure(parser_class, page, get_rows, True)
+        print("{:<26} {:>6} {:>12.0f} {:>14.0f} {:>7.0%}".format(
+            parser_class.__name__, count, dicts, records,
+            1 - records / dicts))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Benchmark for parsing the schedule and leagues pages from a string and
+from a stream of chunks.
+
+Each page is enlarged by repeating its table rows COPIES times, about the
+size of a full season schedule, and split into CHUNK_SIZE byte chunks as
+a download would deliver them. The string path joins and decodes the
+chunks before parsing; the stream path feeds them to the parser as they
+come. Reports the time to the first row, the total time, and the peak
+memory allocated as measured by tracemalloc, which sees the page text
+and the rows but not lxml's own tree.
+
+    $ python -m benchmark.bench_streaming
+"""
+
+import time
+
+import tracemalloc
+
+from fantalytix_python_crawler.crawler.sports_reference.basketball\
+    .leagues_page_parser import LeaguesPageParser
+from fantalytix_python_crawler.crawler.sports_reference.basketball\
+    .season_schedule_page_parser import SeasonSchedulePageParser
+
+from test.sports_reference.basketball.fixtures import load_fixture
+
+PAGES = [
+    (LeaguesPageParser, 'leagues.html', 'stats'),
+    (SeasonSchedulePageParser, 'NBA_2019_games-october.html', 'schedule'),
+]
+COPIES = 10
+CHUNK_SIZE = 64 * 1024
+
+def enlarge(page, table_id):
+    """Repeats the tbody rows of `table#<table_id>` COPIES times."""
+    table = page.index('id="{}"'.format(table_id))
+    start = page.index('<tbody>', table) + len('<tbody>')
+    end = page.index('</tbody>', start)
+    return page[:start] + page[start:end] * COPIES + page[end:]
+
+def get_chunks(page):
+    body = page.encode('utf-8')
+    return [body[i:i + CHUNK_SIZE] for i in range(0, len(body), CHUNK_SIZE)]
+
+def from_string(parser_class, chunks):
+    html = b''.join(chunks).decode('utf-8')
+    return parser_class(html, 'lxml.html').iter_rows()
+
+def from_stream(parser_class, chunks):
+    return parser_class(iter(chunks)).iter_rows()
+
+def measure(parser_class, chunks, parse):
+    tracemalloc.start()
+    start = time.perf_counter()
+    rows = parse(parser_class, chunks)
+    first = next(rows)
+    first_row = time.perf_counter() - start
+    count = 1 + sum(1 for _ in rows)
+    total = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return count, first_row, total, peak
+
+def main():
+    print("{:<26} {:<7} {:>6} {:>11} {:>9} {:>10}".format(
+        'parser', 'input', 'rows', 'first row', 'total', 'peak'))
+    for parser_class, fixture, table_id in PAGES:
+        chunks = get_chunks(enlarge(load_fixture(fixture), table_id))
+        for name, parse in [('string', from_string), ('stream', from_stream)]:
+            count, first_row, total, peak = measure(
+                parser_class, chunks, parse)
+            print("{:<26} {:<7} {:>6} {:>9.1f}ms {:>7.1f}ms {:>8.0f}KB"
+                  .format(parser_class.__name__, name, count,
+                          first_row * 1000, total * 1000, peak / 1024))
+
+if __name__ == "__main__":
+    main()
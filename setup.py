@@ -60,4 +60,10 @@ setup(
     version='1.0', 
     packages=find_packages("src"),
     package_dir={"":"src"},
+    entry_points={
+        'console_scripts': [
+            'fantalytix-crawl=fantalytix_python_crawler.crawler'
+            '.sports_reference.basketball.crawl_pipeline:main',
+        ],
+    },
 )
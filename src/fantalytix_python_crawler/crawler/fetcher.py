@@ -0,0 +1,221 @@
+"""An asyncio page fetcher for the crawlers.
+
+One `Fetcher` owns one aiohttp session, so connections are kept alive
+and reused across requests. Requests are limited in two ways:
+
+    concurrency  the most requests in flight at once
+    rate, burst  a token bucket per host; sports-reference bans clients
+                 that request pages too quickly
+
+Responses with a status in RETRY_STATUSES (429 and 5xx), connection
+errors and timeouts are retried with exponential backoff and full jitter,
+honouring `Retry-After` when the server sends one. gzip and deflate
+bodies are decoded by aiohttp, brotli bodies too when the Brotli package
+is installed.
+
+    async with Fetcher(rate=0.2) as fetcher:
+        parser = await fetcher.fetch_page(url, BoxscorePageParser)
+        data = parser.get_data()
+
+`iter_chunks` yields the body as it arrives instead, for parsers that
+read a page incrementally.
+"""
+
+import asyncio
+
+import random
+
+import time
+
+from urllib.parse import urlsplit
+
+import aiohttp
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+class FetchError(Exception):
+
+    def __init__(self, url, status):
+        super().__init__("Fetching '{}' failed with status {}"
+                         .format(url, status))
+        self.url = url
+        self.status = status
+
+class TokenBucket:
+    """Allows `rate` acquisitions per second on average and up to
+    `capacity` back to back.
+    """
+
+    def __init__(self, rate, capacity=1, clock=time.monotonic):
+        self.rate = rate
+        self.capacity = capacity
+        self.clock = clock
+        self.tokens = capacity
+        self.updated = clock()
+        self.lock = asyncio.Lock()
+
+    def refill(self):
+        now = self.clock()
+        self.tokens = min(self.capacity,
+                          self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self):
+        async with self.lock:
+            self.refill()
+            while self.tokens < 1:
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+                self.refill()
+            self.tokens -= 1
+
+class Fetcher:
+
+    USER_AGENT = 'FantalytixPythonCrawler/1.0'
+    ACCEPT_ENCODING = 'gzip, deflate, br' if brotli else 'gzip, deflate'
+    RETRY_STATUSES = frozenset([429, 500, 502, 503, 504])
+    NOT_MODIFIED = 304
+    DEFAULT_ENCODING = 'utf-8'
+    CHUNK_SIZE = 64 * 1024
+    RETRY_ERRORS = (aiohttp.ClientError, asyncio.TimeoutError)
+
+    def __init__(self, concurrency=4, rate=1.0, burst=1, retries=3,
+                 backoff=1.0, max_backoff=60.0, timeout=30.0,
+                 keepalive_timeout=30.0):
+        self.concurrency = concurrency
+        self.rate = rate
+        self.burst = burst
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+        self.keepalive_timeout = keepalive_timeout
+        self.buckets = dict()
+        self.session = None
+        self.semaphore = None
+
+    async def __aenter__(self):
+        await self.open()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def open(self):
+        connector = aiohttp.TCPConnector(
+            limit=self.concurrency,
+            limit_per_host=self.concurrency,
+            keepalive_timeout=self.keepalive_timeout)
+        self.session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+            headers={
+                'User-Agent': self.USER_AGENT,
+                'Accept-Encoding': self.ACCEPT_ENCODING,
+            })
+        self.semaphore = asyncio.Semaphore(self.concurrency)
+
+    async def close(self):
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    def get_bucket(self, url):
+        host = urlsplit(url).netloc
+        if host not in self.buckets:
+            self.buckets[host] = TokenBucket(self.rate, self.burst)
+        return self.buckets[host]
+
+    def get_retry_delay(self, attempt, retry_after=None):
+        """Seconds to wait before retry number `attempt` (from 0). A
+        numeric `Retry-After` header wins over the jittered backoff.
+        """
+        if retry_after is not None:
+            try:
+                return min(self.max_backoff, float(retry_after))
+            except ValueError:
+                pass
+        return random.uniform(
+            0, min(self.max_backoff, self.backoff * 2 ** attempt))
+
+    def decode(self, body, charset=None):
+        return body.decode(charset or self.DEFAULT_ENCODING, 'replace')
+
+    async def request(self, url, headers=None):
+        """Returns `(status, headers, body, charset)` for one GET, after
+        waiting for the host's rate limit and a free request slot.
+        """
+        await self.get_bucket(url).acquire()
+        async with self.semaphore:
+            async with self.session.get(url, headers=headers) as resp:
+                body = await resp.read()
+                return resp.status, resp.headers, body, resp.charset
+
+    async def get(self, url, headers=None):
+        """Returns `(status, headers, html)` for `url`, retrying on 429,
+        5xx, connection errors and timeouts. Any other error status raises
+        FetchError straight away; the last connection error or timeout is
+        raised as is. A 304 reply to a conditional request is returned with
+        `html` None.
+        """
+        for attempt in range(self.retries + 1):
+            try:
+                status, resp_headers, body, charset = await self.request(
+                    url, headers)
+            except self.RETRY_ERRORS:
+                if attempt == self.retries:
+                    raise
+                await asyncio.sleep(self.get_retry_delay(attempt))
+                continue
+            if status == self.NOT_MODIFIED:
+                return status, resp_headers, None
+            if status < 400:
+                return status, resp_headers, self.decode(body, charset)
+            if status not in self.RETRY_STATUSES or attempt == self.retries:
+                raise FetchError(url, status)
+            await asyncio.sleep(self.get_retry_delay(
+                attempt, resp_headers.get('Retry-After')))
+
+    async def iter_chunks(self, url, chunk_size=CHUNK_SIZE):
+        """Yields the raw body of `url` in chunks as it downloads. Error
+        statuses, connection errors and timeouts are retried like `get`
+        until the body starts; an error after that is raised, since the
+        chunks already yielded can't be taken back. The slot and the
+        connection are held until the body is read.
+        """
+        started = False
+        for attempt in range(self.retries + 1):
+            await self.get_bucket(url).acquire()
+            try:
+                async with self.semaphore:
+                    async with self.session.get(url) as resp:
+                        if resp.status < 400:
+                            async for chunk in resp.content.iter_chunked(
+                                    chunk_size):
+                                started = True
+                                yield chunk
+                            return
+                        status = resp.status
+                        retry_after = resp.headers.get('Retry-After')
+            except self.RETRY_ERRORS:
+                if started or attempt == self.retries:
+                    raise
+                await asyncio.sleep(self.get_retry_delay(attempt))
+                continue
+            if status not in self.RETRY_STATUSES or attempt == self.retries:
+                raise FetchError(url, status)
+            await asyncio.sleep(self.get_retry_delay(attempt, retry_after))
+
+    async def fetch(self, url):
+        """Returns the decoded html of `url`."""
+        return (await self.get(url))[2]
+
+    async def fetch_all(self, urls):
+        """Fetches `urls` concurrently and returns the html in input order."""
+        return await asyncio.gather(*(self.fetch(url) for url in urls))
+
+    async def fetch_page(self, url, parser_class, parser='html.parser'):
+        """Fetches `url` and returns `parser_class` ready to parse it."""
+        return parser_class(await self.fetch(url), parser)
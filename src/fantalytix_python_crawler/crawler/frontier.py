@@ -0,0 +1,234 @@
+"""A durable crawl frontier, so a long crawl that stops can resume where it
+stopped instead of starting over.
+
+Every url the crawl discovers is kept in an SQLite file with the stage
+that handles it, its context, a priority and a state:
+
+    PENDING -> IN_FLIGHT -> DONE
+                         -> FAILED
+
+Urls are normalized before they are stored, so each page is crawled
+once however it was linked. Lower priorities are crawled first, and
+urls of the same priority in the order they were added.
+
+Every change is committed as it is made, in WAL mode, so the file is
+always a consistent checkpoint; a crashed process loses nothing it has
+committed. On restart `resume()` puts the urls left IN_FLIGHT back to
+PENDING and returns everything still to crawl.
+
+A url is only added once, so a page that can change, like the schedule
+of the current season, would never be crawled again. `add(...,
+requeue=True)` puts such urls back to PENDING if they are done or
+failed.
+
+`add` and `pop` work on whole batches in one transaction, which is what
+makes them fast; adding or popping one url at a time costs a commit each.
+
+    with Frontier('crawl.sqlite') as frontier:
+        frontier.add([(url, 'boxscores', context, -2019)])
+        for item in frontier.pop(100):
+            ...
+            frontier.done(item.url)
+"""
+
+import pickle
+
+import sqlite3
+
+import time
+
+from collections import namedtuple
+
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+FrontierItem = namedtuple('FrontierItem',
+                          ['url', 'stage', 'context', 'priority'])
+
+PENDING = 0
+IN_FLIGHT = 1
+DONE = 2
+FAILED = 3
+
+STATE_NAMES = {
+    PENDING: 'pending',
+    IN_FLIGHT: 'in_flight',
+    DONE: 'done',
+    FAILED: 'failed',
+}
+
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+def normalize_url(url):
+    """Lowercases the scheme and host, drops the default port and the
+    fragment, and sorts the query.
+
+        'HTTPS://Example.com:443/a?b=2&a=1#x' -> 'https://example.com/a?a=1&b=2'
+    """
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    netloc = (parts.hostname or '').lower()
+    if parts.port is not None and parts.port != DEFAULT_PORTS.get(scheme):
+        netloc = '{}:{}'.format(netloc, parts.port)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((scheme, netloc, parts.path or '/', query, ''))
+
+class Frontier:
+
+    PICKLE_PROTOCOL = 5
+    # SQLite allows at most 999 parameters in a query by default
+    QUERY_BATCH = 900
+
+    SCHEMA = '''
+        CREATE TABLE IF NOT EXISTS frontier (
+            seq INTEGER PRIMARY KEY,
+            url TEXT NOT NULL UNIQUE,
+            stage TEXT NOT NULL,
+            context BLOB NOT NULL,
+            priority INTEGER NOT NULL,
+            state INTEGER NOT NULL,
+            attempts INTEGER NOT NULL,
+            updated_at REAL NOT NULL
+        )
+    '''
+
+    def __init__(self, path, normalize=normalize_url, clock=time.time):
+        self.path = path
+        self.normalize = normalize
+        self.clock = clock
+        self.db = sqlite3.connect(path)
+        self.db.execute('PRAGMA journal_mode = WAL')
+        self.db.execute('PRAGMA synchronous = NORMAL')
+        self.db.execute(self.SCHEMA)
+        self.db.execute('CREATE INDEX IF NOT EXISTS frontier_next '
+                        'ON frontier (state, priority, seq)')
+        self.db.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self.db.close()
+
+    def __len__(self):
+        return self.db.execute('SELECT COUNT(*) FROM frontier').fetchone()[0]
+
+    def __contains__(self, url):
+        return self.db.execute(
+            'SELECT 1 FROM frontier WHERE url = ?',
+            (self.normalize(url),)).fetchone() is not None
+
+    def get_states(self, urls):
+        """Returns `{url: state}` for the urls of `urls` already known."""
+        states = dict()
+        for start in range(0, len(urls), self.QUERY_BATCH):
+            batch = urls[start:start + self.QUERY_BATCH]
+            states.update(self.db.execute(
+                'SELECT url, state FROM frontier WHERE url IN ({})'.format(
+                    ','.join('?' * len(batch))), batch))
+        return states
+
+    def get_known(self, urls):
+        return set(self.get_states(urls))
+
+    def add(self, items, requeue=False):
+        """Adds `(url, stage, context, priority)` items and returns those
+        not seen before as FrontierItems, with their urls normalized. With
+        `requeue`, known urls that are done or failed are put back to
+        pending, with the new context and priority, and returned too.
+        """
+        items_by_url = dict()
+        for url, stage, context, priority in items:
+            url = self.normalize(url)
+            if url not in items_by_url:
+                items_by_url[url] = FrontierItem(url, stage, context, priority)
+        states = self.get_states(list(items_by_url))
+        new = [item for url, item in items_by_url.items()
+               if url not in states]
+        requeued = []
+        if requeue:
+            requeued = [item for url, item in items_by_url.items()
+                        if states.get(url) in (DONE, FAILED)]
+        now = self.clock()
+        with self.db:
+            self.db.executemany(
+                'INSERT INTO frontier (url, stage, context, priority, state, '
+                'attempts, updated_at) VALUES (?, ?, ?, ?, ?, 0, ?)',
+                [(item.url, item.stage,
+                  pickle.dumps(item.context, self.PICKLE_PROTOCOL),
+                  item.priority, PENDING, now) for item in new])
+            self.db.executemany(
+                'UPDATE frontier SET stage = ?, context = ?, priority = ?, '
+                'state = ?, updated_at = ? WHERE url = ?',
+                [(item.stage,
+                  pickle.dumps(item.context, self.PICKLE_PROTOCOL),
+                  item.priority, PENDING, now, item.url)
+                 for item in requeued])
+        return new + requeued
+
+    @staticmethod
+    def to_item(row):
+        url, stage, context, priority = row
+        return FrontierItem(url, stage, pickle.loads(context), priority)
+
+    def pop(self, limit=1, stage=None):
+        """Marks up to `limit` pending urls, of `stage` if given, in flight
+        and returns them in priority order.
+        """
+        query = ('SELECT seq, url, stage, context, priority FROM frontier '
+                 'WHERE state = ? {}ORDER BY priority, seq LIMIT ?')
+        if stage is None:
+            rows = self.db.execute(query.format(''), (PENDING, limit))
+        else:
+            rows = self.db.execute(query.format('AND stage = ? '),
+                                   (PENDING, stage, limit))
+        rows = rows.fetchall()
+        with self.db:
+            self.db.executemany(
+                'UPDATE frontier SET state = ?, attempts = attempts + 1, '
+                'updated_at = ? WHERE seq = ?',
+                [(IN_FLIGHT, self.clock(), row[0]) for row in rows])
+        return [self.to_item(row[1:]) for row in rows]
+
+    def set_state(self, url, state):
+        with self.db:
+            self.db.execute(
+                'UPDATE frontier SET state = ?, updated_at = ? WHERE url = ?',
+                (state, self.clock(), self.normalize(url)))
+
+    def start(self, url):
+        """Marks a url handed out by `add` or `resume` in flight."""
+        with self.db:
+            self.db.execute(
+                'UPDATE frontier SET state = ?, attempts = attempts + 1, '
+                'updated_at = ? WHERE url = ?',
+                (IN_FLIGHT, self.clock(), self.normalize(url)))
+
+    def done(self, url):
+        self.set_state(url, DONE)
+
+    def failed(self, url):
+        self.set_state(url, FAILED)
+
+    def resume(self, retry_failed=False):
+        """Puts urls left in flight, and failed urls if `retry_failed`, back
+        to pending and returns every pending url in priority order.
+        """
+        states = (IN_FLIGHT, FAILED) if retry_failed else (IN_FLIGHT,)
+        with self.db:
+            self.db.execute(
+                'UPDATE frontier SET state = ? WHERE state IN ({})'.format(
+                    ','.join('?' * len(states))), (PENDING,) + states)
+        return [self.to_item(row) for row in self.db.execute(
+            'SELECT url, stage, context, priority FROM frontier '
+            'WHERE state = ? ORDER BY priority, seq', (PENDING,))]
+
+    def get_counts(self):
+        """Returns the number of urls in each state, by state name."""
+        counts = dict.fromkeys(STATE_NAMES.values(), 0)
+        for state, count in self.db.execute(
+                'SELECT state, COUNT(*) FROM frontier GROUP BY state'):
+            counts[STATE_NAMES[state]] = count
+        return counts
@@ -0,0 +1,275 @@
+"""Per-phase timings and counters for page parsers.
+
+While installed, an Instrumentation times the parser methods each class
+lists in INSTRUMENTED_METHODS under a phase name, e.g.
+
+    build     building the document tree
+    select    CSS selection
+    convert   text conversion (dates, numbers)
+    rows      building the row dicts and records
+    parse     the rest of get_data()
+
+Times are exclusive: a `convert` call made inside `rows` is counted as
+`convert` only, so the phases of a parser add up to its total time. Per
+parser class it also counts pages parsed, rows returned, selector calls
+and failures (exceptions out of get_data(), and rows a parser had to
+skip).
+
+Instrumentation works by wrapping methods when it is installed and
+putting the originals back when it is uninstalled, so a parser that is
+not instrumented runs exactly the code it always did.
+
+    instrumentation = Instrumentation()
+    instrumentation.install(BasePageParser, [Tag, LxmlNode])
+    ...
+    instrumentation.uninstall()
+    print(instrumentation.to_prometheus())
+"""
+
+import functools
+
+import json
+
+import threading
+
+import time
+
+from collections import defaultdict
+
+PARSE_PHASE = 'parse'
+SELECT_PHASE = 'select'
+ENTRY_METHODS = ('get_data', 'get_urls')
+SELECT_METHODS = ('select',)
+
+PAGES = 'pages'
+ROWS = 'rows'
+SELECTS = 'selects'
+FAILURES = 'failures'
+COUNTERS = (PAGES, ROWS, SELECTS, FAILURES)
+COUNTER_HELP = {
+    PAGES: 'Pages parsed.',
+    ROWS: 'Rows returned.',
+    SELECTS: 'CSS selector calls.',
+    FAILURES: 'Pages that raised, and rows or fields that could not be read.',
+}
+
+METRIC_PREFIX = 'fantalytix_parser'
+
+def count_rows(data):
+    """Rows in what a parser returned: the length of a list, the sum over
+    a dict of lists or dicts of lists, and 1 for a single record.
+    """
+    if isinstance(data, list):
+        return len(data)
+    if isinstance(data, dict) and data and all(
+            isinstance(value, (list, dict)) for value in data.values()):
+        return sum(count_rows(value) for value in data.values())
+    return 1
+
+def get_subclasses(cls):
+    classes = [cls]
+    for subclass in cls.__subclasses__():
+        classes.extend(get_subclasses(subclass))
+    return classes
+
+def escape_label(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"')
+
+class Instrumentation:
+
+    def __init__(self, clock=time.perf_counter):
+        self.clock = clock
+        self.lock = threading.Lock()
+        # each thread's stack of [parser, phase, exclusive time, resumed at]
+        self.local = threading.local()
+        # (parser, phase) -> [calls, seconds]
+        self.phases = defaultdict(lambda: [0, 0.0])
+        # (parser, counter) -> count
+        self.counters = defaultdict(int)
+        self.patched = []
+        self.base_class = None
+
+    def get_stack(self):
+        stack = getattr(self.local, 'stack', None)
+        if stack is None:
+            stack = self.local.stack = []
+        return stack
+
+    def get_current(self):
+        """Returns `(parser, phase)` of the innermost timed call."""
+        stack = self.get_stack()
+        return (stack[-1][0], stack[-1][1]) if stack else (None, None)
+
+    def enter(self, parser, phase):
+        stack = self.get_stack()
+        now = self.clock()
+        if stack:
+            outer = stack[-1]
+            outer[2] += now - outer[3]
+        stack.append([parser, phase, 0.0, now])
+
+    def exit(self):
+        stack = self.get_stack()
+        now = self.clock()
+        parser, phase, elapsed, resumed = stack.pop()
+        if stack:
+            stack[-1][3] = now
+        with self.lock:
+            timing = self.phases[(parser, phase)]
+            timing[0] += 1
+            timing[1] += elapsed + now - resumed
+
+    def count(self, parser, counter, value=1):
+        with self.lock:
+            self.counters[(parser, counter)] += value
+
+    def time_method(self, function, phase):
+        @functools.wraps(function)
+        def timed(parser, *args, **kwargs):
+            self.enter(type(parser).__name__, phase)
+            try:
+                return function(parser, *args, **kwargs)
+            finally:
+                self.exit()
+        return timed
+
+    def time_entry(self, function):
+        """Wraps get_data() and the like: counts the page, its rows, and
+        a failure if it raises.
+        """
+        @functools.wraps(function)
+        def timed(parser, *args, **kwargs):
+            name = type(parser).__name__
+            self.enter(name, PARSE_PHASE)
+            try:
+                data = function(parser, *args, **kwargs)
+            except Exception:
+                self.count(name, FAILURES)
+                raise
+            finally:
+                self.exit()
+            self.count(name, PAGES)
+            self.count(name, ROWS, parser.count_rows(data))
+            return data
+        return timed
+
+    def time_select(self, function):
+        """Counts selector calls made while a parser is running, but not
+        the calls a selector makes itself.
+        """
+        @functools.wraps(function)
+        def timed(node, *args, **kwargs):
+            parser, phase = self.get_current()
+            if parser is None or phase == SELECT_PHASE:
+                return function(node, *args, **kwargs)
+            self.count(parser, SELECTS)
+            self.enter(parser, SELECT_PHASE)
+            try:
+                return function(node, *args, **kwargs)
+            finally:
+                self.exit()
+        return timed
+
+    def patch(self, cls, name, wrapper):
+        original = cls.__dict__[name]
+        self.patched.append((cls, name, original))
+        setattr(cls, name, wrapper(original))
+
+    def install(self, base_class, node_classes=()):
+        """Wraps the methods of `base_class` and its subclasses, and the
+        `select` of `node_classes`, and points `base_class.instrumentation`
+        at this instance. Raises AttributeError, before wrapping anything,
+        if a class lacks a method its INSTRUMENTED_METHODS lists, so a
+        renamed method can't quietly drop out of the metrics.
+        """
+        if self.patched:
+            raise RuntimeError('Instrumentation is already installed')
+        classes = get_subclasses(base_class)
+        for cls in classes:
+            for name in cls.INSTRUMENTED_METHODS:
+                if not callable(getattr(cls, name, None)):
+                    raise AttributeError(
+                        "{} lists '{}' in INSTRUMENTED_METHODS but has no "
+                        "such method".format(cls.__name__, name))
+        for cls in classes:
+            for name, phase in cls.INSTRUMENTED_METHODS.items():
+                if name in cls.__dict__:
+                    self.patch(cls, name, lambda function, phase=phase:
+                               self.time_method(function, phase))
+            for name in ENTRY_METHODS:
+                if name in cls.__dict__:
+                    self.patch(cls, name, self.time_entry)
+        for cls in node_classes:
+            for name in SELECT_METHODS:
+                if name in cls.__dict__:
+                    self.patch(cls, name, self.time_select)
+        base_class.instrumentation = self
+        self.base_class = base_class
+
+    def uninstall(self):
+        for cls, name, original in reversed(self.patched):
+            setattr(cls, name, original)
+        self.patched = []
+        if self.base_class is not None \
+                and self.base_class.instrumentation is self:
+            self.base_class.instrumentation = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.uninstall()
+
+    def get_stats(self):
+        """Returns `{parser: {'phases': {phase: {'calls': n, 'seconds': s}},
+        'pages': n, 'rows': n, 'selects': n, 'failures': n}}`.
+        """
+        stats = defaultdict(
+            lambda: dict({'phases': dict()}, **dict.fromkeys(COUNTERS, 0)))
+        with self.lock:
+            for (parser, phase), (calls, seconds) in self.phases.items():
+                stats[parser]['phases'][phase] = {'calls': calls,
+                                                  'seconds': seconds}
+            for (parser, counter), value in self.counters.items():
+                stats[parser][counter] = value
+        return dict(stats)
+
+    def to_prometheus(self, prefix=METRIC_PREFIX):
+        """The stats in the Prometheus text exposition format."""
+        stats = self.get_stats()
+        lines = [
+            '# HELP {}_phase_seconds_total Time spent in each parser phase.'
+            .format(prefix),
+            '# TYPE {}_phase_seconds_total counter'.format(prefix),
+        ]
+        for parser, parser_stats in sorted(stats.items()):
+            for phase, timing in sorted(parser_stats['phases'].items()):
+                lines.append('{}_phase_seconds_total{{parser="{}",phase="{}"}}'
+                             ' {!r}'.format(prefix, escape_label(parser),
+                                            phase, timing['seconds']))
+        lines.extend([
+            '# HELP {}_phase_calls_total Calls made in each parser phase.'
+            .format(prefix),
+            '# TYPE {}_phase_calls_total counter'.format(prefix),
+        ])
+        for parser, parser_stats in sorted(stats.items()):
+            for phase, timing in sorted(parser_stats['phases'].items()):
+                lines.append('{}_phase_calls_total{{parser="{}",phase="{}"}}'
+                             ' {}'.format(prefix, escape_label(parser), phase,
+                                          timing['calls']))
+        for counter in COUNTERS:
+            lines.extend([
+                '# HELP {}_{}_total {}'.format(prefix, counter,
+                                               COUNTER_HELP[counter]),
+                '# TYPE {}_{}_total counter'.format(prefix, counter),
+            ])
+            for parser, parser_stats in sorted(stats.items()):
+                lines.append('{}_{}_total{{parser="{}"}} {}'.format(
+                    prefix, counter, escape_label(parser),
+                    parser_stats[counter]))
+        return '\n'.join(lines) + '\n'
+
+    def to_log_line(self):
+        """The stats as one JSON line."""
+        return json.dumps({'parser_metrics': self.get_stats()},
+                          sort_keys=True)
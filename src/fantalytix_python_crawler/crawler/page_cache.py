@@ -0,0 +1,179 @@
+"""A persistent, content-addressed cache of fetched pages.
+
+Page bodies are stored zlib-compressed under the sha256 of their html,
+
+    <path>/objects/<digest[:2]>/<digest[2:]>
+
+so identical pages are stored once. An SQLite index maps each url to its
+digest, the `ETag` and `Last-Modified` headers it was served with, and
+the time it was fetched.
+
+How long a page stays fresh is decided per url by `max_age(url)`, which
+returns seconds, or None for pages that never change. `CachingFetcher`
+serves fresh pages from the cache and revalidates stale ones with a
+conditional GET, so an unchanged page costs a 304 instead of a download.
+A 304 is only taken from the cache; one with no cached page behind it,
+which an unconditional GET should never get, raises FetchError.
+With `offline=True` it never touches the network and raises `CacheMiss`
+for pages it does not have.
+"""
+
+import hashlib
+
+import os
+
+import sqlite3
+
+import time
+
+import zlib
+
+from collections import namedtuple
+
+from .fetcher import Fetcher, FetchError
+
+CachedPage = namedtuple(
+    'CachedPage', ['url', 'html', 'etag', 'last_modified', 'fetched_at'])
+
+class CacheMiss(FetchError):
+
+    def __init__(self, url):
+        super().__init__(url, None)
+        self.args = ("'{}' is not in the page cache".format(url),)
+
+class PageCache:
+
+    INDEX_FILE = 'index.sqlite'
+    OBJECTS_DIR = 'objects'
+    ENCODING = 'utf-8'
+    COMPRESSION_LEVEL = 6
+
+    SCHEMA = '''
+        CREATE TABLE IF NOT EXISTS pages (
+            url TEXT PRIMARY KEY,
+            digest TEXT NOT NULL,
+            etag TEXT,
+            last_modified TEXT,
+            fetched_at REAL NOT NULL
+        )
+    '''
+
+    def __init__(self, path, max_age=None, clock=time.time):
+        """`max_age(url)` defaults to keeping every page forever."""
+        self.path = path
+        self.max_age = max_age or (lambda url: None)
+        self.clock = clock
+        os.makedirs(os.path.join(path, self.OBJECTS_DIR), exist_ok=True)
+        self.db = sqlite3.connect(os.path.join(path, self.INDEX_FILE))
+        self.db.execute(self.SCHEMA)
+        self.db.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self.db.close()
+
+    def object_path(self, digest):
+        return os.path.join(self.path, self.OBJECTS_DIR, digest[:2],
+                            digest[2:])
+
+    def write_object(self, body):
+        digest = hashlib.sha256(body).hexdigest()
+        path = self.object_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temp_path = '{}.{}.tmp'.format(path, os.getpid())
+            with open(temp_path, 'wb') as f:
+                f.write(zlib.compress(body, self.COMPRESSION_LEVEL))
+            os.replace(temp_path, path)
+        return digest
+
+    def read_object(self, digest):
+        with open(self.object_path(digest), 'rb') as f:
+            return zlib.decompress(f.read())
+
+    def get(self, url):
+        """Returns the CachedPage for `url`, fresh or not, or None."""
+        row = self.db.execute(
+            'SELECT digest, etag, last_modified, fetched_at FROM pages '
+            'WHERE url = ?', (url,)).fetchone()
+        if row is None:
+            return None
+        digest, etag, last_modified, fetched_at = row
+        try:
+            html = self.read_object(digest).decode(self.ENCODING)
+        except FileNotFoundError:
+            return None
+        return CachedPage(url, html, etag, last_modified, fetched_at)
+
+    def put(self, url, html, etag=None, last_modified=None):
+        digest = self.write_object(html.encode(self.ENCODING))
+        self.db.execute(
+            'INSERT OR REPLACE INTO pages '
+            '(url, digest, etag, last_modified, fetched_at) '
+            'VALUES (?, ?, ?, ?, ?)',
+            (url, digest, etag, last_modified, self.clock()))
+        self.db.commit()
+
+    def touch(self, url):
+        """Marks `url` as revalidated now."""
+        self.db.execute('UPDATE pages SET fetched_at = ? WHERE url = ?',
+                        (self.clock(), url))
+        self.db.commit()
+
+    def is_fresh(self, page):
+        max_age = self.max_age(page.url)
+        return max_age is None or self.clock() - page.fetched_at < max_age
+
+    def __contains__(self, url):
+        return self.db.execute('SELECT 1 FROM pages WHERE url = ?',
+                               (url,)).fetchone() is not None
+
+    def __len__(self):
+        return self.db.execute('SELECT COUNT(*) FROM pages').fetchone()[0]
+
+class CachingFetcher(Fetcher):
+    """A Fetcher that reads through a PageCache. `hits`, `revalidated` and
+    `downloads` count how each page was served.
+    """
+
+    def __init__(self, cache, offline=False, **kwargs):
+        super().__init__(**kwargs)
+        self.cache = cache
+        self.offline = offline
+        self.hits = 0
+        self.revalidated = 0
+        self.downloads = 0
+
+    async def fetch(self, url):
+        """Returns the html of `url` from the cache, or fetched and cached.
+        A 304 is answered with the page read before the request, even if
+        it has left the cache since; a 304 with no page read raises
+        FetchError, and nothing is stored.
+        """
+        page = self.cache.get(url)
+        if page is not None and (self.offline or self.cache.is_fresh(page)):
+            self.hits += 1
+            return page.html
+        if self.offline:
+            raise CacheMiss(url)
+        headers = dict()
+        if page is not None and page.etag:
+            headers['If-None-Match'] = page.etag
+        if page is not None and page.last_modified:
+            headers['If-Modified-Since'] = page.last_modified
+        status, resp_headers, html = await self.get(url, headers)
+        if status == self.NOT_MODIFIED:
+            if page is None:
+                raise FetchError(url, status)
+            self.cache.touch(url)
+            self.revalidated += 1
+            return page.html
+        self.cache.put(url, html, resp_headers.get('ETag'),
+                       resp_headers.get('Last-Modified'))
+        self.downloads += 1
+        return html
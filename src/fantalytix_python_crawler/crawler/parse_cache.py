@@ -0,0 +1,210 @@
+"""Memoizes what page parsers return, so re-running a crawl over cached
+pages does not parse them again.
+
+Results are pickled (protocol 5) into an SQLite file, keyed by
+
+    (sha256 of the html, parser class, parse engine, SCHEMA_VERSION)
+
+The engine is the `parser=` name, e.g. 'html.parser' or 'lxml.html';
+engines do not build the same tree from every page, so their results
+are kept apart.
+
+The file is kept under `max_bytes` by evicting the least recently used
+results. Hits only note the time in memory; the times are written with
+the next `put`, or on `close`, so a hit costs no write. When a parser's
+SCHEMA_VERSION is bumped, its entries for other versions are deleted the
+first time the parser is used; other parsers' entries are kept. A cache
+file written before the engine was part of the key is emptied when it
+is opened.
+
+    with ParseCache('parsed.sqlite') as cache:
+        data = cache.parse(BoxscorePageParser, html)
+        urls = cache.parse(PlayersDirPageParser, html)
+"""
+
+import hashlib
+
+import pickle
+
+import sqlite3
+
+import threading
+
+import time
+
+from .instrumentation import ENTRY_METHODS
+
+class ParseCache:
+
+    PICKLE_PROTOCOL = 5
+    ENCODING = 'utf-8'
+
+    SCHEMA = '''
+        CREATE TABLE IF NOT EXISTS results (
+            digest TEXT NOT NULL,
+            parser_class TEXT NOT NULL,
+            parser TEXT NOT NULL,
+            version INTEGER NOT NULL,
+            data BLOB NOT NULL,
+            used_at REAL NOT NULL,
+            PRIMARY KEY (digest, parser_class, parser, version)
+        )
+    '''
+    KEY_COLUMNS = ('digest', 'parser_class', 'parser', 'version')
+    KEY_WHERE = ' AND '.join('{} = ?'.format(column)
+                             for column in KEY_COLUMNS)
+
+    def __init__(self, path, max_bytes=256 * 1024 * 1024, clock=time.time):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self.purged = set()
+        # key -> time of the last hit, not yet written
+        self.used = dict()
+        # parsing runs in worker threads, so one connection is shared
+        # under a lock
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.drop_unkeyed_results()
+        self.db.execute(self.SCHEMA)
+        self.db.execute('CREATE INDEX IF NOT EXISTS results_used_at '
+                        'ON results (used_at)')
+        self.db.commit()
+        self.size = self.db.execute(
+            'SELECT COALESCE(SUM(LENGTH(data)), 0) FROM results').fetchone()[0]
+
+    def drop_unkeyed_results(self):
+        """Drops a results table of a layout without the `parser`
+        column, whose entries cannot be told apart by engine.
+        """
+        columns = [row[1] for row in self.db.execute(
+            'PRAGMA table_info(results)')]
+        if columns and 'parser' not in columns:
+            self.db.execute('DROP TABLE results')
+            self.db.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        with self.lock:
+            self.write_used()
+            self.db.commit()
+        self.db.close()
+
+    def __len__(self):
+        with self.lock:
+            return self.db.execute(
+                'SELECT COUNT(*) FROM results').fetchone()[0]
+
+    @staticmethod
+    def get_parser_name(parser_class):
+        return '{}.{}'.format(parser_class.__module__,
+                              parser_class.__qualname__)
+
+    def get_key(self, parser_class, html, parser):
+        return (hashlib.sha256(html.encode(self.ENCODING)).hexdigest(),
+                self.get_parser_name(parser_class), parser,
+                parser_class.SCHEMA_VERSION)
+
+    def purge_stale(self, parser_class):
+        """Deletes `parser_class` results of other schema versions."""
+        name = self.get_parser_name(parser_class)
+        self.size -= self.db.execute(
+            'SELECT COALESCE(SUM(LENGTH(data)), 0) FROM results '
+            'WHERE parser_class = ? AND version != ?',
+            (name, parser_class.SCHEMA_VERSION)).fetchone()[0]
+        self.db.execute(
+            'DELETE FROM results WHERE parser_class = ? AND version != ?',
+            (name, parser_class.SCHEMA_VERSION))
+        self.db.commit()
+        self.purged.add(parser_class)
+
+    def get(self, key):
+        """Returns `(True, data)` for a cached result, else `(False, None)`."""
+        with self.lock:
+            row = self.db.execute(
+                'SELECT data FROM results WHERE ' + self.KEY_WHERE,
+                key).fetchone()
+            if row is None:
+                return False, None
+            self.used[key] = self.clock()
+        return True, pickle.loads(row[0])
+
+    def write_used(self):
+        """Writes the times of the hits since the last write, without
+        committing.
+        """
+        if self.used:
+            self.db.executemany(
+                'UPDATE results SET used_at = ? WHERE ' + self.KEY_WHERE,
+                [(used_at,) + key for key, used_at in self.used.items()])
+            self.used = dict()
+
+    def put(self, key, data):
+        blob = pickle.dumps(data, protocol=self.PICKLE_PROTOCOL)
+        if len(blob) > self.max_bytes:
+            return
+        with self.lock:
+            self.write_used()
+            old = self.db.execute(
+                'SELECT LENGTH(data) FROM results WHERE ' + self.KEY_WHERE,
+                key).fetchone()
+            self.db.execute(
+                'INSERT OR REPLACE INTO results '
+                '(digest, parser_class, parser, version, data, used_at) '
+                'VALUES (?, ?, ?, ?, ?, ?)', key + (blob, self.clock()))
+            self.size += len(blob) - (old[0] if old else 0)
+            self.evict()
+            self.db.commit()
+
+    def evict(self):
+        """Deletes least recently used results until under `max_bytes`."""
+        while self.size > self.max_bytes:
+            rows = self.db.execute(
+                'SELECT digest, parser_class, parser, version, LENGTH(data) '
+                'FROM results ORDER BY used_at LIMIT 64').fetchall()
+            if not rows:
+                self.size = 0
+                break
+            for row in rows:
+                if self.size <= self.max_bytes:
+                    break
+                self.db.execute(
+                    'DELETE FROM results WHERE ' + self.KEY_WHERE, row[:-1])
+                self.size -= row[-1]
+
+    @staticmethod
+    def get_entry_method(parser_class):
+        """The method that returns a parser's result, e.g. `get_data`, or
+        `get_urls` for PlayersDirPageParser.
+        """
+        for name in ENTRY_METHODS:
+            if hasattr(parser_class, name):
+                return name
+        raise TypeError('{} has none of the methods {}'.format(
+            parser_class.__name__, ', '.join(ENTRY_METHODS)))
+
+    def parse(self, parser_class, html, parser='html.parser'):
+        """Returns `parser_class(html, parser).get_data()`, or the parser's
+        other entry method (see `get_entry_method`), parsing only if the
+        result is not cached yet.
+        """
+        method = self.get_entry_method(parser_class)
+        if parser_class not in self.purged:
+            with self.lock:
+                self.purge_stale(parser_class)
+        key = self.get_key(parser_class, html, parser)
+        found, data = self.get(key)
+        if found:
+            self.hits += 1
+            return data
+        self.misses += 1
+        data = getattr(parser_class(html, parser), method)()
+        self.put(key, data)
+        return data
@@ -0,0 +1,102 @@
+"""Parses many pages at once across a pool of processes.
+
+Parsing is pure Python and CPU bound, so threads do not help. Each page
+is sent to a worker process as utf-8 bytes together with the parser
+class, which pickles by name, and the worker sends back what `get_data()`
+returns. Batches smaller than `min_batch`, or a pool of one worker, are
+parsed in this process, where starting workers would cost more than it
+saves.
+
+    data = parse_many(BoxscorePageParser, pages, workers=4)
+
+    with ParsePool(workers=4) as pool:
+        for index, data in pool.imap_unordered(BoxscorePageParser, pages):
+            ...
+"""
+
+import multiprocessing
+
+import os
+
+ENCODING = 'utf-8'
+
+def encode_page(page):
+    return page if isinstance(page, bytes) else page.encode(ENCODING)
+
+def parse_page(parser_class, page, parser='html.parser'):
+    """Returns `parser_class(page, parser).get_data()` for a str or utf-8
+    encoded page.
+    """
+    if isinstance(page, bytes):
+        page = page.decode(ENCODING)
+    return parser_class(page, parser).get_data()
+
+def _parse_task(task):
+    index, parser_class, page, parser = task
+    return index, parse_page(parser_class, page, parser)
+
+class ParsePool:
+
+    MIN_BATCH = 8
+
+    def __init__(self, workers=None, parser='html.parser', min_batch=MIN_BATCH,
+                 chunksize=1):
+        self.workers = workers or os.cpu_count() or 1
+        self.parser = parser
+        self.min_batch = min_batch
+        self.chunksize = chunksize
+        self.pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.close()
+            self.pool.join()
+            self.pool = None
+
+    def get_pool(self):
+        """Worker processes are started on the first batch large enough to
+        need them and reused after that.
+        """
+        if self.pool is None:
+            self.pool = multiprocessing.Pool(self.workers)
+        return self.pool
+
+    def in_process(self, pages):
+        return self.workers == 1 or len(pages) < self.min_batch
+
+    def imap_unordered(self, parser_class, pages):
+        """Yields `(index, data)` for each of `pages` as they are parsed."""
+        pages = list(pages)
+        if self.in_process(pages):
+            for index, page in enumerate(pages):
+                yield index, parse_page(parser_class, page, self.parser)
+            return
+        tasks = ((index, parser_class, encode_page(page), self.parser)
+                 for index, page in enumerate(pages))
+        yield from self.get_pool().imap_unordered(
+            _parse_task, tasks, self.chunksize)
+
+    def map(self, parser_class, pages):
+        """Returns the data of each of `pages` in input order."""
+        pages = list(pages)
+        results = [None] * len(pages)
+        for index, data in self.imap_unordered(parser_class, pages):
+            results[index] = data
+        return results
+
+def parse_many(parser_class, pages, workers=None, parser='html.parser',
+               ordered=True, min_batch=ParsePool.MIN_BATCH, chunksize=1):
+    """Parses `pages` with a pool of `workers` processes started for this
+    batch. Returns a list in input order, or when `ordered` is False a
+    list of `(index, data)` in the order parsing finished.
+    """
+    with ParsePool(workers, parser, min_batch, chunksize) as pool:
+        if ordered:
+            return pool.map(parser_class, pages)
+        return list(pool.imap_unordered(parser_class, pages))
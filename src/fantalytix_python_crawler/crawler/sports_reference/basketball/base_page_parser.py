@@ -1,9 +1,55 @@
 """This is a base parser class for inheriting. Contains basic helper 
-functions such as getting team name abbreviations from urls.
+functions such as getting team name abbreviations from urls, reading 
+table rows by their `data-stat` attributes and finding tables that 
+basketball-reference hides inside html comments.
+
+Parsers that read one table row at a time (ROWS_SELECTOR and 
+`get_row_data`) can also be given a file-like object, an iterable of 
+chunks or an async iterable of chunks instead of an html string. The 
+page is then parsed incrementally with lxml and `iter_rows` / 
+`aiter_rows` yield each row as soon as it has arrived. The rest of the 
+page is dropped as it is read, so the tree only holds the open elements 
+and the latest chunk's rows (see `RowStream`). Streams skip the end tag 
+repair of `balance_end_tags`, so rows can differ from a string parse on 
+a page with misnested end tags. Tables inside html comments need the 
+whole page, so a streamed parser raises TypeError when asked for one.
+
+    with open('NBA_2019_games-october.html', 'rb') as f:
+        for game in SeasonSchedulePageParser(f).iter_rows():
+            ...
+
+    chunks = fetcher.iter_chunks(url)
+    async for game in SeasonSchedulePageParser(chunks).aiter_rows():
+        ...
+
+Parsers can declare the fields of their rows as `{output_key: field}` 
+mappings plus converters (see `field_schema`). `get_plan` compiles a 
+mapping once per class and `read_fields` reads a row with it in one pass 
+over the cells.
+
+Players and teams are identified by the slug in their sports-reference 
+urls, e.g. 'duranke01' in `/players/d/duranke01.html` and 'GSW' in 
+`/teams/GSW/2019.html`. `get_slug` reads them with the patterns in 
+SLUG_PATTERNS, compiled once; parsers emit them next to the names so 
+joins do not depend on matching names.
+
+`enable_instrumentation()` starts recording per-phase timings and 
+counters for every parser class, see `instrumentation`. The methods each 
+class lists in INSTRUMENTED_METHODS are timed under their phase. Until 
+it is enabled the parsers run uninstrumented code.
 """
 
 import re
 
+from bs4.element import Tag
+
+from fantalytix_python_crawler.crawler.instrumentation import (
+    FAILURES, Instrumentation, count_rows)
+
+from .field_schema import LINK, compile_fields
+from .parse_engines import (LxmlNode, RowStream, combine_regions, 
+                            decode_markup, iter_chunks, make_handler)
+
 class BasePageParser:
 
     RE_TEAM_SEASON_URL = re.compile(r'/teams'
@@ -11,11 +57,155 @@ class BasePageParser:
                                     r'/(?P<year>\d{4})'
                                     r'.html')
 
+    PLAYER_SLUG = 'player'
+    TEAM_SLUG = 'team'
+    SLUG_PATTERNS = {
+        PLAYER_SLUG: re.compile(r'/players/[a-z]/(?P<slug>[a-z0-9]+)\.html'),
+        TEAM_SLUG: re.compile(r'/teams/(?P<slug>[A-Z0-9]{3})/'),
+    }
+
+    STAT_ATTR = 'data-stat'
+    CELL_TAGS = ['th', 'td']
+
+    TABLE_ID_ATTR = 'id="{table_id}"'
+    COMMENT_START = '<!--'
+    COMMENT_END = '-->'
+
+    # Bump when a parser's get_data() output changes shape, so results 
+    # memoized by `ParseCache` for the old version are not reused.
+    SCHEMA_VERSION = 1
+
+    # SoupStrainers for the parts of the page a parser reads. Only these 
+    # subtrees are built; None builds the whole document.
+    REGIONS = None
+
+    # The rows read by `iter_rows`, and the id of their table (and the 
+    # table section, if only one) when the page is parsed from a stream.
+    ROWS_SELECTOR = None
+    STREAM_TABLE_ID = None
+    STREAM_SECTION = None
+    CHUNK_SIZE = 64 * 1024
+
+    # Parsers built with `records=True` return rows as the slotted types 
+    # in `records` instead of dicts.
+    records = False
+
+    # method name -> phase it is timed under while instrumented
+    INSTRUMENTED_METHODS = {
+        'get_handler': 'build',
+        'get_commented_table': 'build',
+        'get_row_data': 'rows',
+        'get_row_text_by_stat': 'rows',
+        'get_cells_by_stat': 'select',
+        'read_fields': 'rows',
+        'make_record': 'rows',
+        'get_abbreviation_and_year_from_url': 'convert',
+        'get_slug': 'convert',
+    }
+
+    # The installed Instrumentation, None while disabled
+    instrumentation = None
+
+    @classmethod
+    def enable_instrumentation(cls, instrumentation=None):
+        """Instruments every parser class and returns the Instrumentation 
+        recording them.
+        """
+        if instrumentation is None:
+            instrumentation = Instrumentation()
+        instrumentation.install(BasePageParser, [Tag, LxmlNode])
+        return instrumentation
+
+    @classmethod
+    def disable_instrumentation(cls):
+        if BasePageParser.instrumentation is not None:
+            BasePageParser.instrumentation.uninstall()
+
+    def count_failure(self):
+        """Counts a row or field the parser could not read."""
+        if self.instrumentation is not None:
+            self.instrumentation.count(type(self).__name__, FAILURES)
+
+    def count_rows(self, data):
+        return count_rows(data)
+
+    def get_parse_only(self):
+        """Combines REGIONS into one strainer, built once per class."""
+        cls = type(self)
+        if '_parse_only' not in cls.__dict__:
+            cls._parse_only = combine_regions(cls.REGIONS)
+        return cls._parse_only
+
+    def get_handler(self):
+        """Builds the document tree with the engine named by `self.parser`, 
+        restricted to the parser's REGIONS. See `parse_engines` for the 
+        available engines.
+        """
+        return make_handler(self.html, self.parser, self.get_parse_only())
+
+    def is_stream(self):
+        return not isinstance(self.html, (str, bytes))
+
+    def iter_stream_rows(self):
+        stream = RowStream(self.STREAM_TABLE_ID, self.STREAM_SECTION)
+        chunks = self.html
+        if hasattr(chunks, 'read'):
+            chunks = iter_chunks(chunks, self.CHUNK_SIZE)
+        for chunk in chunks:
+            yield from stream.feed(chunk)
+        yield from stream.close()
+
+    async def aiter_stream_rows(self):
+        stream = RowStream(self.STREAM_TABLE_ID, self.STREAM_SECTION)
+        async for chunk in self.html:
+            for row in stream.feed(chunk):
+                yield row
+        for row in stream.close():
+            yield row
+
+    def start_rows(self):
+        """Resets any state `get_row_data` keeps between rows."""
+        pass
+
+    def get_row_data(self, row):
+        """Returns the data of one row of ROWS_SELECTOR, or None to skip 
+        the row. By default the text of each cell by its `data-stat`.
+        """
+        return self.get_row_text_by_stat(row)
+
+    def iter_rows(self):
+        if self.is_stream():
+            rows = self.iter_stream_rows()
+        else:
+            rows = self.get_handler().select(self.ROWS_SELECTOR)
+        self.start_rows()
+        for row in rows:
+            data = self.get_row_data(row)
+            if data is not None:
+                yield data
+
+    async def aiter_rows(self):
+        """`iter_rows` for a page given as an async iterable of chunks."""
+        self.start_rows()
+        async for row in self.aiter_stream_rows():
+            data = self.get_row_data(row)
+            if data is not None:
+                yield data
+
+    def make_record(self, record_class, fields):
+        """Returns the `fields` dict as a `record_class` when the parser 
+        was built with `records=True`.
+        """
+        if self.records:
+            return record_class(**fields)
+        return fields
+
     def get_abbreviation_and_year_from_url(self, rel_href):
         try:
             abbreviation, end_year = self.RE_TEAM_SEASON_URL.match(
                 rel_href).groups()
         except AttributeError:
+            self.count_failure()
             print("Regex error: Abbreviation or year not found. Is "
                   "rel_href '{}' in the correct format?".format(rel_href))
             abbreviation, end_year = "", ""
@@ -23,3 +213,152 @@ class BasePageParser:
 
     def get_abbreviation_from_url(self, rel_href):
         return self.get_abbreviation_and_year_from_url(rel_href)['abbreviation']
+
+    def get_slug(self, href, kind):
+        """Returns the slug of a `kind` url, e.g. 'duranke01' for 
+        '/players/d/duranke01.html' and PLAYER_SLUG. Returns an empty 
+        string for a missing href or a url of another kind.
+        """
+        if not href:
+            return ""
+        match = self.SLUG_PATTERNS[kind].search(href)
+        if match is None:
+            self.count_failure()
+            return ""
+        return match.group('slug')
+
+    def get_player_slug(self, link):
+        """The player slug of an `a` element, as read by a LINK field."""
+        return self.get_slug(link.get('href') if link is not None else None,
+                             self.PLAYER_SLUG)
+
+    def get_team_slug(self, link):
+        return self.get_slug(link.get('href') if link is not None else None,
+                             self.TEAM_SLUG)
+
+    def get_row_text_by_stat(self, row):
+        """Walks the cells of a table row once and returns a dict of 
+        `{'<data-stat>': '<text>'}`. This replaces one CSS select per 
+        stat with a single pass over the row. If a stat appears more than 
+        once, the first cell wins, the same as `row.select(...)[0]`.
+        """
+        cells = dict()
+        for cell in row.find_all(self.CELL_TAGS, recursive=False):
+            stat = cell.get(self.STAT_ATTR)
+            if stat is not None and stat not in cells:
+                cells[stat] = cell.text
+        return cells
+
+    def get_cells_by_stat(self, row):
+        """Returns `{'<data-stat>': <cell>}` for the cells of a table row, 
+        the first cell winning as in `get_row_text_by_stat`.
+        """
+        cells = dict()
+        for cell in row.find_all(self.CELL_TAGS, recursive=False):
+            stat = cell.get(self.STAT_ATTR)
+            if stat is not None and stat not in cells:
+                cells[stat] = cell
+        return cells
+
+    def get_plan(self, name='FIELDS'):
+        """Compiles the field mapping in the class attribute `name`, once 
+        per class.
+        """
+        cls = type(self)
+        if '_plans' not in cls.__dict__:
+            cls._plans = dict()
+        plan = cls._plans.get(name)
+        if plan is None:
+            plan = cls._plans[name] = compile_fields(getattr(cls, name))
+        return plan
+
+    def read_fields(self, cells, plan):
+        """Returns the fields of `plan` read from `cells`, as given by 
+        `get_cells_by_stat`. A missing cell raises KeyError.
+        """
+        data = dict()
+        for key, stat, source, converters in plan:
+            cell = cells[stat]
+            value = cell.a if source == LINK else cell.text
+            for convert in converters:
+                if isinstance(convert, str):
+                    value = getattr(self, convert)(value)
+                else:
+                    value = convert(value)
+            data[key] = value
+        return data
+
+    def get_table_data(self, table):
+        """Returns one `{'<data-stat>': '<text>'}` dict per body row, 
+        skipping the repeated header rows marked with the `thead` class.
+        """
+        data = []
+        for row in table.tbody.find_all('tr'):
+            if row.get('class') is not None and 'thead' in row.get('class'):
+                continue
+            data.append(self.get_row_text_by_stat(row))
+        return data
+
+    def get_markup(self):
+        """The page as str, decoded once if it was given as bytes. Raises 
+        TypeError for a stream, which is read row by row and never held 
+        whole.
+        """
+        if self.is_stream():
+            raise TypeError("{} was given a stream, which only iter_rows "
+                            "can read; pass the page as str or bytes"
+                            .format(type(self).__name__))
+        if not isinstance(self.html, bytes):
+            return self.html
+        try:
+            return self._markup
+        except AttributeError:
+            self._markup = decode_markup(self.html)
+            return self._markup
+
+    def find_commented_markup(self, table_id):
+        """Returns the text of the html comment holding `table#<table_id>`, 
+        found with plain string searches on the raw html. Returns None if 
+        the table is missing or is not inside a comment.
+        """
+        html = self.get_markup()
+        position = html.find(self.TABLE_ID_ATTR.format(table_id=table_id))
+        if position == -1:
+            return None
+        start = html.rfind(self.COMMENT_START, 0, position)
+        if start == -1 or html.rfind(self.COMMENT_END, start, position) != -1:
+            return None
+        end = html.find(self.COMMENT_END, position)
+        if end == -1:
+            return None
+        return html[start + len(self.COMMENT_START):end]
+
+    @property
+    def commented_tables(self):
+        """The tables read by `get_commented_table`, by id, created on 
+        first use.
+        """
+        try:
+            return self._commented_tables
+        except AttributeError:
+            self._commented_tables = dict()
+            return self._commented_tables
+
+    def get_commented_table(self, table_id):
+        """basketball-reference ships many secondary tables inside html 
+        comments, which neither engine turns into elements. Only the 
+        comment holding the table is parsed, the first time the table is 
+        asked for, and the result is cached per id. Returns None if the 
+        table is not inside a comment.
+        """
+        tables = self.commented_tables
+        if table_id not in tables:
+            markup = self.find_commented_markup(table_id)
+            tables[table_id] = None
+            if markup is not None:
+                handler = make_handler(markup, self.parser)
+                for table in handler.find_all('table'):
+                    if table.get('id') == table_id:
+                        tables[table_id] = table
+                        break
+        return tables[table_id]
@@ -4,22 +4,52 @@ for both the home and away teams.
 
     {
         'home_team': { 
+            'abbreviation': '<abbreviation>',
             'basic': [{<player_data>}, ... ],
             'advanced': [{<player_data>}, ...]
         },
         'away_team': {
+            'abbreviation': '<abbreviation>',
             'basic': [{<player_data>}, ... ],
             'advanced': [{<player_data>}, ...]
         }
     }
+
+The line score and four factors tables are commented out in the page 
+source. `get_line_score` and `get_four_factors` parse only those 
+comments, on demand, and return one `{'<data-stat>': '<text>'}` 
+dictionary per team, away team first.
+
+With `records=True` each player row is a slotted `BasicBoxScoreRow`, 
+`AdvancedBoxScoreRow` or `DidNotPlayRow` from `records` instead.
+
+`iter_rows` yields `(team, table, player_data)` one player at a time as 
+the rows are read, e.g. `('home_team', 'basic', {...})`, in the order 
+home basic, away basic, home advanced, away advanced. Its stats are 
+always text; typed conversion needs whole columns and is applied by 
+`get_data`.
+
+Each row has the player's slug, e.g. 'duranke01', as `player_id`. 
+The columns read for each table are declared in BASIC_FIELDS, 
+ADVANCED_FIELDS and DID_NOT_PLAY_FIELDS (see `field_schema`), built from 
+the stat lists in `records`, so adding a stat is a change to one list.
+
+With `typed=True` stats are numbers instead of text, converted a column 
+at a time by `typed_stats`. `get_columns` returns those columns as 
+arrays, one per stat, for aggregating without a conversion pass.
 """
 
-from bs4 import BeautifulSoup
+from bs4 import SoupStrainer
 
 from fantalytix_python_crawler.crawler.sports_reference.basketball\
     .settings import BASE_URL
 
 from .base_page_parser import BasePageParser
+from .field_schema import LINK, Field, get_stat_fields
+from .records import (BASIC_BOX_SCORE_STATS, ADVANCED_BOX_SCORE_STATS,
+                      AdvancedBoxScoreRow, BasicBoxScoreRow, DidNotPlayRow)
+from .parse_engines import has_class
+from .typed_stats import get_stat_columns, set_typed_values
 
 from urllib.parse import urljoin
 
@@ -33,63 +63,77 @@ class BoxscorePageParser(BasePageParser):
     TEAM_NAME_FIELD = "a[itemprop=name]"
     AWAY_TEAM_INDEX = 0
     HOME_TEAM_INDEX = 1
+    RE_BOX_SCORE_TABLE_ID = re.compile(r'^box_[a-z]{3}_(basic|advanced)$')
+    REGIONS = [
+        SoupStrainer('div', class_=has_class('scorebox')),
+        SoupStrainer('table', id=RE_BOX_SCORE_TABLE_ID),
+    ]
 
-    DID_NOT_PLAY_FIELD = "td[data-stat=reason]"
-    PLAYER_FIELD = "th[data-stat=player]"
-    MP_FIELD = "td[data-stat=mp]"
+    TABLE_LINE_SCORE = "line_score"
+    TABLE_FOUR_FACTORS = "four_factors"
+
+    DID_NOT_PLAY_STAT = "reason"
+    PLAYER_STAT = "player"
     NO_MINUTES = "00:00"
 
+    PLAYER_FIELDS = {
+        'player': PLAYER_STAT,
+        'player_id': Field(PLAYER_STAT, 'get_player_slug', LINK),
+    }
+    DID_NOT_PLAY_FIELDS = dict(PLAYER_FIELDS, did_not_play=DID_NOT_PLAY_STAT)
+
     TABLE_BASIC_BOX_SCORE = "table#box_{abbreviation}_basic"
-    FG_FIELD = "td[data-stat=fg]"
-    FGA_FIELD = "td[data-stat=fga]"
-    FG_PCT_FIELD = "td[data-stat=fg_pct]"
-    FG3_FIELD = "td[data-stat=fg3]"
-    FG3A_FIELD = "td[data-stat=fg3a]"
-    FG3_PCT_FIELD = "td[data-stat=fg3_pct]"
-    FT_FIELD = "td[data-stat=ft]"
-    FTA_FIELD = "td[data-stat=fta]"
-    FT_PCT_FIELD = "td[data-stat=ft_pct]"
-    ORB_FIELD = "td[data-stat=orb]"
-    DRB_FIELD = "td[data-stat=drb]"
-    TRB_FIELD = "td[data-stat=trb]"
-    AST_FIELD = "td[data-stat=ast]"
-    STL_FIELD = "td[data-stat=stl]"
-    BLK_FIELD = "td[data-stat=blk]"
-    TOV_FIELD = "td[data-stat=tov]"
-    PF_FIELD = "td[data-stat=pf]"
-    PTS_FIELD = "td[data-stat=pts]"
-    PLUS_MINUS_FIELD = "td[data-stat=plus_minus]"
+    BASIC_BOX_SCORE_STATS = BASIC_BOX_SCORE_STATS
+    BASIC_FIELDS = get_stat_fields(BASIC_BOX_SCORE_STATS)
 
     TABLE_ADVANCED_BOX_SCORE = "table#box_{abbreviation}_advanced"
-    TS_PCT_FIELD = "td[data-stat=ts_pct]"
-    EFG_PCT_FIELD = "td[data-stat=efg_pct]"
-    FG3A_PER_FGA_PCT_FIELD = "td[data-stat=fg3a_per_fga_pct]"
-    FTA_PER_FGA_PCT_FIELD = "td[data-stat=fta_per_fga_pct]"
-    ORB_PCT_FIELD = "td[data-stat=orb_pct]"
-    DRB_PCT_FIELD = "td[data-stat=drb_pct]"
-    TRB_PCT_FIELD = "td[data-stat=trb_pct]"
-    AST_PCT_FIELD = "td[data-stat=ast_pct]"
-    STL_PCT_FIELD = "td[data-stat=stl_pct]"
-    BLK_PCT_FIELD = "td[data-stat=blk_pct]"
-    TOV_PCT_FIELD = "td[data-stat=tov_pct]"
-    USG_PCT_FIELD = "td[data-stat=usg_pct]"
-    OFF_RTG_FIELD = "td[data-stat=off_rtg]"
-    DEF_RTG_FIELD = "td[data-stat=def_rtg]"
-
-    def __init__(self, html, parser='html.parser'):
+    ADVANCED_BOX_SCORE_STATS = ADVANCED_BOX_SCORE_STATS
+    ADVANCED_FIELDS = get_stat_fields(ADVANCED_BOX_SCORE_STATS)
+
+    # 2: rows have the player's `player_id`
+    # 3: teams have their `abbreviation`
+    SCHEMA_VERSION = 3
+
+    INSTRUMENTED_METHODS = dict(BasePageParser.INSTRUMENTED_METHODS,
+                                get_player_data='rows',
+                                build_columns='convert')
+
+    def __init__(self, html, parser='html.parser', records=False,
+                 typed=False):
         self.data = {
-            'home_team': {'basic': [], 'advanced': []},
-            'away_team': {'basic': [], 'advanced': []}
+            'home_team': {'abbreviation': '', 'basic': [], 'advanced': []},
+            'away_team': {'abbreviation': '', 'basic': [], 'advanced': []}
         }
+        # {'home_team': '<abbreviation>', 'away_team': ...}, set by 
+        # `iter_rows`
+        self.abbreviations = dict()
         self.html = html
         self.parser = parser
+        self.records = records
+        self.typed = typed
+        self.columns = None
 
     def get_team_season_url_fields(self, handler):
         url_fields = handler.select(" ".join([self.DIV_SCOREBOX, 
             self.TEAM_NAME_FIELD]))
         return url_fields[self.HOME_TEAM_INDEX], url_fields[self.AWAY_TEAM_INDEX]
 
-    def process_basic_box_table(self, handler, abbreviation, data):
+    def get_player_data(self, row, record_class, plan_name, **fields):
+        """Builds a player's dict from a single pass over the row cells, 
+        reading the fields declared in the class attribute `plan_name`. 
+        Extra fields such as `is_starter` are placed after the player name. 
+        Players who did not play only have the reason recorded.
+        """
+        cells = self.get_cells_by_stat(row)
+        if self.DID_NOT_PLAY_STAT in cells:
+            return self.make_record(DidNotPlayRow, self.read_fields(
+                cells, self.get_plan('DID_NOT_PLAY_FIELDS')))
+        player = self.read_fields(cells, self.get_plan('PLAYER_FIELDS'))
+        player.update(fields)
+        player.update(self.read_fields(cells, self.get_plan(plan_name)))
+        return self.make_record(record_class, player)
+
+    def iter_basic_box_table(self, handler, abbreviation):
         table = handler.select(self.TABLE_BASIC_BOX_SCORE.format(
             abbreviation=abbreviation))[0]
         is_starter = True
@@ -97,96 +141,91 @@ class BoxscorePageParser(BasePageParser):
             if row.get('class') is not None and 'thead' in row.get('class'):
                 is_starter = False
                 continue
-            if len(row.select(self.DID_NOT_PLAY_FIELD)) == 0:
-                data.append({
-                    'player': row.select(self.PLAYER_FIELD)[0].text,
-                    'is_starter': is_starter,
-                    'mp': row.select(self.MP_FIELD)[0].text,
-                    'fg': row.select(self.FG_FIELD)[0].text,
-                    'fga': row.select(self.FGA_FIELD)[0].text,
-                    'fg_pct': row.select(self.FG_PCT_FIELD)[0].text,
-                    'fg3': row.select(self.FG3_FIELD)[0].text,
-                    'fg3a': row.select(self.FG3A_FIELD)[0].text,
-                    'fg3_pct': row.select(self.FG3_PCT_FIELD)[0].text,
-                    'ft': row.select(self.FT_FIELD)[0].text,
-                    'fta': row.select(self.FTA_FIELD)[0].text,
-                    'ft_pct': row.select(self.FT_PCT_FIELD)[0].text,
-                    'orb': row.select(self.ORB_FIELD)[0].text,
-                    'drb': row.select(self.DRB_FIELD)[0].text,
-                    'trb': row.select(self.TRB_FIELD)[0].text,
-                    'ast': row.select(self.AST_FIELD)[0].text,
-                    'stl': row.select(self.STL_FIELD)[0].text,
-                    'blk': row.select(self.BLK_FIELD)[0].text,
-                    'tov': row.select(self.TOV_FIELD)[0].text,
-                    'pf': row.select(self.PF_FIELD)[0].text,
-                    'pts': row.select(self.PTS_FIELD)[0].text,
-                    'plus_minus': row.select(self.PLUS_MINUS_FIELD)[0].text,
-                })
-            else:
-                data.append({
-                    'player': row.select(self.PLAYER_FIELD)[0].text,
-                    'did_not_play': row.select(self.DID_NOT_PLAY_FIELD)[0].text
-                })
-
-    def process_advanced_box_table(self, handler, abbreviation, data):
+            yield self.get_player_data(
+                row, BasicBoxScoreRow, 'BASIC_FIELDS', is_starter=is_starter)
+
+    def iter_advanced_box_table(self, handler, abbreviation):
         table = handler.select(self.TABLE_ADVANCED_BOX_SCORE.format(
             abbreviation=abbreviation))[0]
         for row in table.tbody.find_all('tr'):
             if row.get('class') is not None and 'thead' in row.get('class'):
                 continue
-            if len(row.select(self.DID_NOT_PLAY_FIELD)) == 0:
-                data.append({
-                    'player': row.select(self.PLAYER_FIELD)[0].text,
-                    'mp': row.select(self.MP_FIELD)[0].text,
-                    'ts_pct': row.select(self.TS_PCT_FIELD)[0].text,
-                    'efg_pct': row.select(self.EFG_PCT_FIELD)[0].text,
-                    'fg3a_per_fga_pct': row.select(
-                        self.FG3A_PER_FGA_PCT_FIELD)[0].text,
-                    'fta_per_fga_pct': row.select(
-                        self.FTA_PER_FGA_PCT_FIELD)[0].text,
-                    'orb_pct': row.select(self.ORB_PCT_FIELD)[0].text,
-                    'drb_pct': row.select(self.DRB_PCT_FIELD)[0].text,
-                    'trb_pct': row.select(self.TRB_PCT_FIELD)[0].text,
-                    'ast_pct': row.select(self.AST_PCT_FIELD)[0].text,
-                    'stl_pct': row.select(self.STL_PCT_FIELD)[0].text,
-                    'blk_pct': row.select(self.BLK_PCT_FIELD)[0].text,
-                    'tov_pct': row.select(self.TOV_PCT_FIELD)[0].text,
-                    'usg_pct': row.select(self.USG_PCT_FIELD)[0].text,
-                    'off_rtg': row.select(self.OFF_RTG_FIELD)[0].text,
-                    'def_rtg': row.select(self.DEF_RTG_FIELD)[0].text
-                })
-            else:
-                data.append({
-                    'player': row.select(self.PLAYER_FIELD)[0].text,
-                    'did_not_play': row.select(self.DID_NOT_PLAY_FIELD)[0].text
-                })
+            yield self.get_player_data(
+                row, AdvancedBoxScoreRow, 'ADVANCED_FIELDS')
+
+    def process_commented_table(self, table_id):
+        table = self.get_commented_table(table_id)
+        if table is None:
+            return []
+        return self.get_table_data(table)
+
+    def get_line_score(self):
+        return self.process_commented_table(self.TABLE_LINE_SCORE)
+
+    def get_four_factors(self):
+        return self.process_commented_table(self.TABLE_FOUR_FACTORS)
+
+    def build_columns(self):
+        return {
+            team: {
+                'basic': get_stat_columns(
+                    tables['basic'], self.BASIC_BOX_SCORE_STATS),
+                'advanced': get_stat_columns(
+                    tables['advanced'], self.ADVANCED_BOX_SCORE_STATS),
+            } for team, tables in self.data.items()
+        }
 
-    def handle_data(self):
-        handler = BeautifulSoup(self.html, self.parser)
+    def get_columns(self):
+        """Returns the stats of the players who played as typed arrays,
+
+            {'home_team': {'basic': {'player': [...], 'pts': array, ..., 
+                                     'nulls': {'pts': mask, ...}}, 
+                           'advanced': {...}}, 'away_team': {...}}
+
+        Blank cells are 0 in int columns, marked in their `nulls` mask, 
+        and NaN in float columns; see `typed_stats` before aggregating.
+        """
+        self.get_data()
+        if self.columns is None:
+            self.columns = self.build_columns()
+        return self.columns
+
+    def iter_rows(self):
+        handler = self.get_handler()
         home_team_field, away_team_field = self.get_team_season_url_fields(handler)
         home_team = self.get_abbreviation_from_url(home_team_field.get('href'))
         away_team = self.get_abbreviation_from_url(away_team_field.get('href'))
+        self.abbreviations = {'home_team': home_team, 'away_team': away_team}
+
+        for team, abbreviation in [('home_team', home_team), 
+                                   ('away_team', away_team)]:
+            for row in self.iter_basic_box_table(handler, abbreviation.lower()):
+                yield team, 'basic', row
+        for team, abbreviation in [('home_team', home_team), 
+                                   ('away_team', away_team)]:
+            for row in self.iter_advanced_box_table(
+                    handler, abbreviation.lower()):
+                yield team, 'advanced', row
 
-        self.process_basic_box_table(
-            handler, 
-            home_team.lower(), 
-            self.data['home_team']['basic']
-        )
-        self.process_basic_box_table(
-            handler, 
-            away_team.lower(), 
-            self.data['away_team']['basic']
-        )
-        self.process_advanced_box_table(
-            handler, 
-            home_team.lower(),
-            self.data['home_team']['advanced']
-        )
-        self.process_advanced_box_table(
-            handler, 
-            away_team.lower(),
-            self.data['away_team']['advanced']
-        )
+    def handle_data(self):
+        for team, table, row in self.iter_rows():
+            self.data[team][table].append(row)
+        for team, abbreviation in self.abbreviations.items():
+            self.data[team]['abbreviation'] = abbreviation
+
+        if self.typed:
+            self.columns = self.build_columns()
+            for team, tables in self.data.items():
+                set_typed_values(tables['basic'], self.columns[team]['basic'],
+                                 self.BASIC_BOX_SCORE_STATS)
+                set_typed_values(tables['advanced'],
+                                 self.columns[team]['advanced'],
+                                 self.ADVANCED_BOX_SCORE_STATS)
+
+    def count_rows(self, data):
+        """Player rows in both teams' basic and advanced tables."""
+        return sum(len(tables['basic']) + len(tables['advanced'])
+                   for tables in data.values())
 
     def get_data(self):
         if (len(self.data['home_team']['basic']) == 0 
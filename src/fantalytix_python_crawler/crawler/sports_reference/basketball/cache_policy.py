@@ -0,0 +1,60 @@
+"""How long basketball-reference pages stay fresh in the page cache.
+
+    boxscores of finished games        forever
+    pages of past seasons              forever
+    schedules of the current season    SCHEDULE_MAX_AGE
+    everything else                    DEFAULT_MAX_AGE
+
+A boxscore is only treated as final once RECENT_GAME_DAYS have passed
+since the game, so late stat corrections are still picked up. The
+current season is the one ending next year from September on.
+"""
+
+import re
+
+from datetime import date, timedelta
+
+SEASON_START_MONTH = 9
+
+def get_end_year(day):
+    """The end year of the season `day` falls in."""
+    if day.month >= SEASON_START_MONTH:
+        return day.year + 1
+    return day.year
+
+class CachePolicy:
+
+    RE_BOXSCORE_URL = re.compile(r'/boxscores/(\d{4})(\d{2})(\d{2})0\w+\.html$')
+    RE_SEASON_URL = re.compile(
+        r'/leagues/[A-Z]+_(\d{4})(?P<schedule>_games(-[a-z]+)?)?\.html$')
+
+    RECENT_GAME_DAYS = 2
+    SCHEDULE_MAX_AGE = 60 * 60
+    DEFAULT_MAX_AGE = 24 * 60 * 60
+
+    def __init__(self, today=date.today):
+        self.today = today
+
+    def get_current_end_year(self):
+        return get_end_year(self.today())
+
+    def get_max_age(self, url):
+        """Returns seconds `url` stays fresh, or None if it never changes."""
+        match = self.RE_BOXSCORE_URL.search(url)
+        if match:
+            game_date = date(*map(int, match.groups()))
+            if self.today() - game_date >= timedelta(
+                    days=self.RECENT_GAME_DAYS):
+                return None
+            return self.SCHEDULE_MAX_AGE
+        match = self.RE_SEASON_URL.search(url)
+        if match:
+            end_year = int(match.group(1))
+            if end_year < self.get_current_end_year():
+                return None
+            if match.group('schedule'):
+                return self.SCHEDULE_MAX_AGE
+        return self.DEFAULT_MAX_AGE
+
+    def __call__(self, url):
+        return self.get_max_age(url)
@@ -0,0 +1,253 @@
+"""A pipeline sink that writes boxscores and schedules as partitioned
+Parquet files instead of JSON lines.
+
+Three datasets are written under `path`, each partitioned Hive style by
+league, season end year and game date:
+
+    <path>/games/league=NBA/season=2019/date=2018-10-16/part-<id>.parquet
+    <path>/boxscore_basic/league=NBA/season=2019/date=2018-10-31/...
+    <path>/boxscore_advanced/...
+
+Every file of a dataset has the fixed schema in SCHEMAS, with stats as
+numbers (see `typed_stats`) and null for blank cells. A boxscore row's
+`team` is the team's abbreviation and its `player_id` the player's
+slug, or their name for a row without a player link, as in
+`DatabaseLoader`. The schema's version is stored in each file's
+metadata under SCHEMA_VERSION_KEY. Files of version 1, which did not
+record it, held 'home_team' or 'away_team' in `team`; do not mix them
+with newer files in one dataset.
+
+Rows are buffered per partition and written out as a new part file once
+a partition has `batch_rows` rows, or all partitions once
+`max_buffered_rows` are held, so memory stays bounded however long the
+crawl runs.
+
+Every partition costs at least one file per flush, and a season has
+about 170 game dates. With `partition_dates=False` the date level is
+dropped, which writes far fewer and larger files.
+
+    with ColumnarSink('warehouse/') as sink:
+        await CrawlPipeline('NBA', [2019], fetcher, sink=sink).run()
+
+    pyarrow.dataset.dataset('warehouse/games', partitioning='hive')
+
+Requires pyarrow.
+"""
+
+import math
+
+import os
+
+import uuid
+
+from array import array
+
+from collections import defaultdict
+
+from .db_loader import get_boxscore_columns, get_id_from_url
+from .records import BASIC_BOX_SCORE_STATS, ADVANCED_BOX_SCORE_STATS
+from .typed_stats import FLOAT, INT, SECONDS, NULL_INT, STAT_TYPES
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+GAMES = 'games'
+BOXSCORE_BASIC = 'boxscore_basic'
+BOXSCORE_ADVANCED = 'boxscore_advanced'
+
+SCHEDULES_STAGE = 'schedules'
+BOXSCORES_STAGE = 'boxscores'
+
+TEAMS = ('home_team', 'away_team')
+
+# 2: a boxscore row's `team` is the team's abbreviation
+SCHEMA_VERSION = 2
+SCHEMA_VERSION_KEY = b'fantalytix_schema_version'
+
+def get_stat_fields(stats):
+    return [(stat, pa.float64() if STAT_TYPES[stat] == FLOAT else pa.int32())
+            for stat in stats]
+
+def with_version(schema):
+    return schema.with_metadata(
+        {SCHEMA_VERSION_KEY: str(SCHEMA_VERSION).encode()})
+
+if pa is not None:
+    SCHEMAS = {
+        GAMES: with_version(pa.schema([
+            ('game_date', pa.date32()),
+            ('game_start_time', pa.time32('ms')),
+            ('visitor_team_name', pa.string()),
+            ('visitor_team_id', pa.string()),
+            ('visitor_pts', pa.int32()),
+            ('home_team_name', pa.string()),
+            ('home_team_id', pa.string()),
+            ('home_pts', pa.int32()),
+            ('box_score_text', pa.string()),
+            ('overtimes', pa.string()),
+            ('attendance', pa.int32()),
+            ('type', pa.string()),
+        ])),
+        BOXSCORE_BASIC: with_version(pa.schema([
+            ('game_id', pa.string()),
+            ('team', pa.string()),
+            ('player', pa.string()),
+            ('player_id', pa.string()),
+            ('is_starter', pa.bool_()),
+            ('did_not_play', pa.string()),
+        ] + get_stat_fields(BASIC_BOX_SCORE_STATS))),
+        BOXSCORE_ADVANCED: with_version(pa.schema([
+            ('game_id', pa.string()),
+            ('team', pa.string()),
+            ('player', pa.string()),
+            ('player_id', pa.string()),
+            ('did_not_play', pa.string()),
+        ] + get_stat_fields(ADVANCED_BOX_SCORE_STATS))),
+    }
+
+def stat_column_to_arrow(values, arrow_type):
+    """Wraps a `typed_stats` array without copying it, then swaps its
+    null markers, if any, for Arrow nulls.
+    """
+    if values.typecode == FLOAT:
+        column = pa.Array.from_buffers(
+            pa.float64(), len(values), [None, pa.py_buffer(values)])
+        has_nulls = any(map(math.isnan, values))
+    else:
+        column = pa.Array.from_buffers(
+            pa.int64(), len(values), [None, pa.py_buffer(values)])
+        has_nulls = NULL_INT in values
+    if has_nulls:
+        nulls = pc.is_nan(column) if values.typecode == FLOAT \
+            else pc.equal(column, NULL_INT)
+        column = pc.if_else(nulls, pa.scalar(None, column.type), column)
+    return column.cast(arrow_type)
+
+def new_columns(dataset):
+    """Empty buffers for a dataset: an `array` per stat, a list for the
+    other fields.
+    """
+    return {
+        field.name: array(STAT_TYPES[field.name].replace(SECONDS, INT))
+        if field.name in STAT_TYPES else [] for field in SCHEMAS[dataset]
+    }
+
+def columns_to_table(dataset, columns):
+    schema = SCHEMAS[dataset]
+    return pa.Table.from_arrays([
+        stat_column_to_arrow(columns[field.name], field.type)
+        if field.name in STAT_TYPES
+        else pa.array(columns[field.name], field.type)
+        for field in schema], schema=schema)
+
+class ColumnarSink:
+
+    BATCH_ROWS = 50000
+    MAX_BUFFERED_ROWS = 500000
+    COMPRESSION = 'zstd'
+
+    def __init__(self, path, batch_rows=BATCH_ROWS,
+                 max_buffered_rows=MAX_BUFFERED_ROWS,
+                 compression=COMPRESSION, partition_dates=True):
+        if pa is None:
+            raise ImportError('ColumnarSink requires pyarrow.')
+        self.path = path
+        self.batch_rows = batch_rows
+        self.max_buffered_rows = max_buffered_rows
+        self.compression = compression
+        self.partition_dates = partition_dates
+        self.run_id = uuid.uuid4().hex[:12]
+        # (dataset, league, season, date) -> {column: values}
+        self.buffers = dict()
+        self.buffered_rows = defaultdict(int)
+        self.total_rows = 0
+        self.parts = 0
+        self.files = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __call__(self, stage, url, context, data):
+        if stage == SCHEDULES_STAGE:
+            self.add_games(context, data)
+        elif stage == BOXSCORES_STAGE:
+            self.add_boxscore(context, url, data)
+
+    def get_columns(self, dataset, context, game_date):
+        if not self.partition_dates:
+            game_date = None
+        key = (dataset, context['league'], context['end_year'], game_date)
+        if key not in self.buffers:
+            self.buffers[key] = new_columns(dataset)
+        return key, self.buffers[key]
+
+    def add_games(self, context, games):
+        for game in games:
+            key, columns = self.get_columns(GAMES, context, game['game_date'])
+            for name, values in columns.items():
+                values.append(game[name])
+            self.added(key, 1)
+
+    def add_table(self, columns, game_id, team, rows, stats):
+        """Appends a team's table, as `get_boxscore_columns` converts it."""
+        table = get_boxscore_columns(game_id, team, rows, stats,
+                                     'is_starter' in columns)
+        for name, values in table.items():
+            columns[name].extend(values)
+        return len(rows)
+
+    def add_boxscore(self, context, url, data):
+        game_id = get_id_from_url(url)
+        for dataset, table, stats in [
+                (BOXSCORE_BASIC, 'basic', BASIC_BOX_SCORE_STATS),
+                (BOXSCORE_ADVANCED, 'advanced', ADVANCED_BOX_SCORE_STATS)]:
+            key, columns = self.get_columns(dataset, context,
+                                            context['game_date'])
+            self.added(key, sum(
+                self.add_table(columns, game_id, data[team]['abbreviation'],
+                               data[team][table], stats) for team in TEAMS))
+
+    def added(self, key, rows):
+        self.buffered_rows[key] += rows
+        self.total_rows += rows
+        if self.buffered_rows[key] >= self.batch_rows:
+            self.flush(key)
+        if self.total_rows >= self.max_buffered_rows:
+            self.flush_all()
+
+    def get_partition_dir(self, key):
+        dataset, league, end_year, game_date = key
+        directory = os.path.join(
+            self.path, dataset, 'league={}'.format(league),
+            'season={}'.format(end_year))
+        if game_date is None:
+            return directory
+        return os.path.join(directory,
+                            'date={}'.format(game_date.isoformat()))
+
+    def flush(self, key):
+        dataset = key[0]
+        columns = self.buffers.pop(key)
+        self.total_rows -= self.buffered_rows.pop(key)
+        directory = self.get_partition_dir(key)
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, 'part-{}-{:05d}.parquet'.format(
+            self.run_id, self.parts))
+        self.parts += 1
+        pq.write_table(columns_to_table(dataset, columns), path,
+                       compression=self.compression)
+        self.files.append(path)
+
+    def flush_all(self):
+        for key in list(self.buffers):
+            self.flush(key)
+
+    def close(self):
+        self.flush_all()
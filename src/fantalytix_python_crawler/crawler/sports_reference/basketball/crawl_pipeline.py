@@ -0,0 +1,594 @@
+"""This pipeline crawls basketball-reference from the leagues page down to
+the boxscores of the requested seasons.
+
+    leagues -> season summaries -> monthly schedules -> boxscores
+
+A season's months are read from the month filter links of its schedule
+page, `/leagues/NBA_2019_games.html`, which shows the first month. That
+page stands in for the first month, and the worker that crawled a month
+page crawls the month after it, so a season's months are crawled in
+order. The header
+row that starts the playoffs is only on the month they start in, so
+whether they have started is carried in the context of the next month,
+and every game of a later month is tagged as a playoff game before it
+reaches the sink (see `tag_month`). A month that is missing or fails
+ends its season's schedules; `--retry-failed` picks a failed one up
+again with its context. With a GameStateStore each month reached is
+recorded with whether the playoffs had started before it, so a later
+crawl can start from any month reached before.
+
+Each level is a stage with a bounded queue of `(url, context)` items and
+its own worker tasks. Queues hand out the most recent season first. A
+worker fetches a page, parses it in a thread so the event loop keeps
+fetching, passes the parsed data to the sink and expands it into the
+next stage's urls using the `settings` templates. A full queue blocks
+the stage feeding it, so memory stays bounded while every stage runs at
+once.
+
+While it runs, throughput (pages/sec) and the depth of each stage's queue
+are reported every `report_interval` seconds.
+
+    $ fantalytix-crawl --league NBA --seasons 2015-2019 --output nba.jsonl
+
+With `--cache DIR` pages are kept in a page cache and revalidated as
+`CachePolicy` decides, so a re-run only downloads what changed.
+`--offline` crawls from the cache alone. `--parse-cache FILE` also keeps
+what each page parsed to, so unchanged pages are not parsed again.
+`--parquet DIR` writes schedules and boxscores as partitioned Parquet
+(see `ColumnarSink`) instead of JSON lines, and `--database FILE` loads
+them into SQLite tables (see `DatabaseLoader`).
+
+During the season `--daily --state FILE` crawls the monthly schedules
+from the month of `--days` ago up to the month of today, compares their
+games with the GameStateStore in FILE, and fetches just the boxscores of
+games that were added, played or rescored since the last run. The
+playoff state the first month starts with is the one recorded in FILE;
+months FILE has not reached yet are crawled from the last one it has,
+and a season it knows nothing of from its first month. When `--days`
+reaches back across the start of a season, the previous season's
+schedules are crawled too. Each change is reported on stderr.
+
+    $ fantalytix-crawl --daily --state nba_games.sqlite --output today.jsonl
+
+With `--frontier FILE` every url found is also kept in a Frontier with
+its state, so a crawl that was stopped resumes from FILE where it left
+off, and pages already done are not crawled again. The start pages, the
+pages `CachePolicy` does not treat as final and, with `--state`, the
+boxscores the GameStateStore has pending are crawled again on every
+run, so `--daily --state --frontier` keeps picking up new games.
+`--retry-failed` crawls the pages that failed last time too.
+
+`--metrics FILE` instruments the parsers (see `instrumentation`) and
+writes their per-phase timings and counters to FILE in the Prometheus
+text format at the end of the crawl, and as one JSON line to stderr.
+"""
+
+import argparse
+
+import asyncio
+
+import itertools
+
+import json
+
+import re
+
+import sys
+
+import time
+
+from datetime import date, timedelta
+
+from urllib.parse import urljoin, urlsplit
+
+from fantalytix_python_crawler.crawler.fetcher import Fetcher, FetchError
+from fantalytix_python_crawler.crawler.frontier import Frontier
+from fantalytix_python_crawler.crawler.page_cache import (CachingFetcher,
+                                                          PageCache)
+from fantalytix_python_crawler.crawler.parse_cache import ParseCache
+from fantalytix_python_crawler.crawler.sports_reference.basketball\
+    .settings import (BASE_URL, LEAGUES_URL, MONTH_NAMES, SEASON_SUMMARY_URL,
+                      SEASON_GAMES_URL, SEASON_SCHEDULE_URL,
+                      REQUESTS_PER_MINUTE)
+
+from .base_page_parser import BasePageParser
+from .boxscore_page_parser import BoxscorePageParser
+from .cache_policy import CachePolicy, get_end_year
+from .columnar_sink import ColumnarSink
+from .db_loader import DatabaseLoader
+from .game_state import GameStateStore, format_change
+from .leagues_page_parser import LeaguesPageParser
+from .season_schedule import ends_in_playoffs, tag_month
+from .season_schedule_page_parser import SeasonSchedulePageParser
+from .season_summary_page_parser import SeasonSummaryPageParser
+
+class Stage:
+
+    def __init__(self, name, parser_class, expand, workers, queue_size,
+                 follow=None):
+        self.name = name
+        self.parser_class = parser_class
+        self.expand = expand
+        # (url, context, html, data) -> (context, data, more items of this
+        # stage), crawled by the same worker rather than queued
+        self.follow = follow
+        self.workers = workers
+        # (priority, seq, url, context)
+        self.queue = asyncio.PriorityQueue(queue_size)
+        self.seen = set()
+        self.done = 0
+        self.missing = 0
+        self.failed = 0
+
+class CrawlPipeline:
+
+    LEAGUES = 'leagues'
+    SEASONS = 'seasons'
+    SCHEDULES = 'schedules'
+    BOXSCORES = 'boxscores'
+    NOT_FOUND = 404
+    RE_MONTH_URL = re.compile(r'_games-(?P<month>[a-z]+)\.html$')
+
+    def __init__(self, league, end_years, fetcher, sink=None,
+                 parser='html.parser', base_url=BASE_URL, workers=2,
+                 queue_size=100, report_interval=10.0, report=None,
+                 parse_cache=None, game_state=None, frontier=None,
+                 retry_failed=False, cache_policy=None):
+        self.league = league
+        self.end_years = set(end_years)
+        self.fetcher = fetcher
+        self.sink = sink
+        self.parser = parser
+        self.base_url = base_url
+        self.report_interval = report_interval
+        self.report = report or self.print_report
+        self.parse_cache = parse_cache
+        self.game_state = game_state
+        self.frontier = frontier
+        self.retry_failed = retry_failed
+        self.cache_policy = cache_policy or CachePolicy()
+        self.seq = itertools.count()
+        self.changes = []
+        self.stages = [
+            Stage(self.LEAGUES, LeaguesPageParser, self.expand_leagues,
+                  1, queue_size),
+            Stage(self.SEASONS, SeasonSummaryPageParser,
+                  self.expand_season_summary, workers, queue_size),
+            Stage(self.SCHEDULES, SeasonSchedulePageParser,
+                  self.expand_season_schedule, workers, queue_size,
+                  follow=self.follow_months),
+            Stage(self.BOXSCORES, BoxscorePageParser, None,
+                  workers, queue_size),
+        ]
+        self.started = None
+
+    def expand_leagues(self, context, data):
+        for season in data:
+            end_year = season['end_year'].year
+            if season['league'] == self.league and end_year in self.end_years:
+                yield (urljoin(self.base_url, SEASON_SUMMARY_URL.format(
+                    league=self.league, end_year=end_year)),
+                    {'league': self.league, 'end_year': end_year})
+
+    def expand_season_summary(self, context, data):
+        """The summary page does not link to the months of the season, so
+        the season's schedule page is crawled, which does.
+        """
+        yield (urljoin(self.base_url, SEASON_GAMES_URL.format(**context)),
+               context)
+
+    def get_url(self, url):
+        """Rebuilds a page url on `base_url`."""
+        return urljoin(self.base_url, urlsplit(url).path)
+
+    def get_month(self, url):
+        match = self.RE_MONTH_URL.search(url)
+        return match.group('month') if match is not None else None
+
+    def follow_months(self, url, context, html, data):
+        """Tags the games of a month page as playoff games if the playoffs
+        started in an earlier month, and returns the month after it from
+        the page's month filter links. A season's schedule page, crawled
+        without a month, stands in for the month its filter marks as
+        current. With a `through` date in the context, no month after the
+        one with games past it is queued.
+        """
+        parser = SeasonSchedulePageParser(html, self.parser)
+        if 'month' in context:
+            current = url
+        else:
+            current = parser.get_current_month_url()
+            current = self.get_url(current) if current is not None else url
+            context = dict(context, month=self.get_month(current))
+        playoffs = context.get('playoffs', False)
+        data = tag_month(data, playoffs)
+        through = context.get('through')
+        if through is not None and any(
+                game['game_date'] > through for game in data):
+            return context, data, []
+        urls = [self.get_url(month_url)
+                for month_url in parser.get_month_urls()]
+        if current not in urls or current == urls[-1]:
+            return context, data, []
+        next_url = urls[urls.index(current) + 1]
+        return context, data, [(next_url, dict(
+            context, month=self.get_month(next_url),
+            playoffs=playoffs or ends_in_playoffs(data)))]
+
+    def expand_season_schedule(self, context, data):
+        """Boxscore urls are rebuilt on `base_url` from the path of each
+        game's `box_score_text`. Games not yet played have no boxscore.
+        With a `game_state` only the boxscores it has pending are fetched,
+        and the month is recorded as reached.
+        """
+        if self.game_state is not None:
+            if context.get('month') is not None:
+                self.game_state.reach_month(
+                    context['league'], context['end_year'], context['month'],
+                    context.get('playoffs', False))
+            self.changes.extend(
+                self.game_state.update(context['league'], data))
+            data = self.game_state.pending_boxscores(context['league'], data)
+        for game in data:
+            if game['box_score_text']:
+                yield (urljoin(self.base_url,
+                               urlsplit(game['box_score_text']).path),
+                       dict(context, game_date=game['game_date']))
+
+    def parse(self, stage, html):
+        if self.parse_cache is not None:
+            return self.parse_cache.parse(stage.parser_class, html,
+                                          self.parser)
+        return stage.parser_class(html, self.parser).get_data()
+
+    @staticmethod
+    def get_priority(context):
+        """Pages of the most recent season are crawled first."""
+        return -context.get('end_year', 0)
+
+    def is_final(self, stage, url):
+        """Whether a page crawled by an earlier run can be skipped. The
+        boxscores a game state has pending are never final.
+        """
+        if stage.name == self.BOXSCORES and self.game_state is not None:
+            return False
+        return self.cache_policy(url) is None
+
+    def get_new(self, stage, items, requeue=False):
+        """The `(url, context)` items not seen in this run, which are now
+        seen. With a frontier, pages an earlier run crawled are only
+        returned again if `requeue` or they are not final.
+        """
+        items = [(url, context) for url, context in dict(items).items()
+                 if url not in stage.seen]
+        stage.seen.update(url for url, _ in items)
+        if self.frontier is not None:
+            final, changing = [], []
+            for url, context in items:
+                (changing if requeue or not self.is_final(stage, url)
+                 else final).append(
+                    (url, stage.name, context, self.get_priority(context)))
+            items = [(item.url, item.context) for item in
+                     self.frontier.add(final)
+                     + self.frontier.add(changing, requeue=True)]
+        return items
+
+    async def put_many(self, stage, items, requeue=False):
+        """Queues the items `get_new` returns."""
+        for url, context in self.get_new(stage, items, requeue):
+            await stage.queue.put(
+                (self.get_priority(context), next(self.seq), url, context))
+
+    async def put(self, stage, url, context, requeue=False):
+        await self.put_many(stage, [(url, context)], requeue)
+
+    async def process(self, index, url, context):
+        """Crawls one page. Returns `(crawled, following)`, `crawled` False
+        if it failed and could be tried again, and `following` the items
+        of the same stage to crawl next.
+        """
+        stage = self.stages[index]
+        try:
+            html = await self.fetcher.fetch(url)
+        except FetchError as err:
+            if err.status == self.NOT_FOUND:
+                stage.missing += 1
+                return True, []
+            stage.failed += 1
+            print(err, file=sys.stderr)
+            return False, []
+        data = await asyncio.to_thread(self.parse, stage, html)
+        following = []
+        if stage.follow is not None:
+            context, data, following = await asyncio.to_thread(
+                stage.follow, url, context, html, data)
+        stage.done += 1
+        if self.sink is not None:
+            self.sink(stage.name, url, context, data)
+        if stage.name == self.BOXSCORES and self.game_state is not None:
+            self.game_state.mark_fetched(url)
+        if stage.expand is not None:
+            await self.put_many(self.stages[index + 1],
+                                list(stage.expand(context, data)))
+        return True, following
+
+    async def crawl(self, index, url, context):
+        """Crawls a page and then, in this worker, the pages of the same
+        stage it leads to. They are not queued: with the stage's queue
+        full, every worker of the stage would wait on itself.
+        """
+        stage = self.stages[index]
+        items = [(url, context)]
+        while items:
+            url, context = items.pop(0)
+            following = []
+            try:
+                if self.frontier is not None:
+                    self.frontier.start(url)
+                crawled, following = await self.process(index, url, context)
+                following = self.get_new(stage, following)
+            except Exception as err:
+                stage.failed += 1
+                print("Failed to crawl '{}': {!r}".format(url, err),
+                      file=sys.stderr)
+                crawled = False
+            # a page is only checkpointed once its links are in the
+            # frontier, so a crash in between crawls it again
+            if self.frontier is not None:
+                if crawled:
+                    self.frontier.done(url)
+                else:
+                    self.frontier.failed(url)
+            items.extend(following)
+
+    async def work(self, index):
+        queue = self.stages[index].queue
+        while True:
+            _, _, url, context = await queue.get()
+            try:
+                await self.crawl(index, url, context)
+            finally:
+                queue.task_done()
+
+    def get_stats(self):
+        elapsed = time.monotonic() - self.started
+        done = sum(stage.done for stage in self.stages)
+        changes = dict()
+        for change in self.changes:
+            changes[change.kind] = changes.get(change.kind, 0) + 1
+        return {
+            'elapsed': elapsed,
+            'pages_per_sec': done / elapsed if elapsed > 0 else 0.0,
+            'stages': {
+                stage.name: {
+                    'queued': stage.queue.qsize(),
+                    'done': stage.done,
+                    'missing': stage.missing,
+                    'failed': stage.failed,
+                } for stage in self.stages
+            },
+            'changes': changes,
+        }
+
+    def print_report(self, stats):
+        print("{:.0f}s {:.2f} pages/sec | {}".format(
+            stats['elapsed'], stats['pages_per_sec'], ' | '.join(
+                "{} {} done {} queued {} failed".format(
+                    name, stage['done'], stage['queued'], stage['failed'])
+                for name, stage in stats['stages'].items())),
+            file=sys.stderr)
+
+    async def report_progress(self):
+        while True:
+            await asyncio.sleep(self.report_interval)
+            self.report(self.get_stats())
+
+    def get_stage_index(self, name):
+        for index, stage in enumerate(self.stages):
+            if stage.name == name:
+                return index
+        raise ValueError("No stage named '{}'".format(name))
+
+    def get_daily_start(self, today, days=1):
+        """The schedule pages to crawl the `days` days up to `today` from,
+        one per season, as `start` items for `run`. A season is crawled
+        from the month of its first of those days, or the last month
+        before it the `game_state` has reached, with the playoff state
+        recorded for that month. Without either it is crawled from its
+        first month. Months are crawled up to the month of `today`.
+        """
+        first_days = dict()
+        for offset in range(days, -1, -1):
+            day = today - timedelta(days=offset)
+            first_days.setdefault(get_end_year(day), day)
+        start = []
+        for end_year, day in first_days.items():
+            context = {'league': self.league, 'end_year': end_year,
+                       'through': today}
+            month = None
+            if self.game_state is not None:
+                month = self.game_state.get_month(
+                    self.league, end_year, MONTH_NAMES[day.month - 1])
+            if month is None:
+                url = SEASON_GAMES_URL.format(**context)
+            else:
+                context.update(month=month.month, playoffs=month.playoffs)
+                url = SEASON_SCHEDULE_URL.format(**context)
+            start.append((self.SCHEDULES, urljoin(self.base_url, url),
+                          context))
+        return start
+
+    async def run(self, start=None):
+        """Crawls until every stage's queue is drained and returns the
+        final stats. `start` is a list of `(stage name, url, context)` to
+        begin from, by default the leagues page. With a frontier, the
+        pages it has pending are crawled too, and `start` pages are
+        crawled again even if an earlier run crawled them.
+        """
+        self.started = time.monotonic()
+        tasks = [asyncio.create_task(self.report_progress())]
+        for index, stage in enumerate(self.stages):
+            tasks.extend(asyncio.create_task(self.work(index))
+                         for _ in range(stage.workers))
+        if start is None:
+            start = [(self.LEAGUES, urljoin(self.base_url, LEAGUES_URL),
+                      {'league': self.league})]
+        try:
+            if self.frontier is not None:
+                for item in self.frontier.resume(self.retry_failed):
+                    stage = self.stages[self.get_stage_index(item.stage)]
+                    stage.seen.add(item.url)
+                    await stage.queue.put((item.priority, next(self.seq),
+                                           item.url, item.context))
+            for name, url, context in start:
+                await self.put(self.stages[self.get_stage_index(name)], url,
+                               context, requeue=True)
+            for stage in self.stages:
+                await stage.queue.join()
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        stats = self.get_stats()
+        self.report(stats)
+        return stats
+
+def parse_seasons(text):
+    """Parses season end years given as `2019` or `2015-2019`."""
+    try:
+        first, _, last = text.partition('-')
+        first, last = int(first), int(last or first)
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            "Seasons '{}' must be in the format 2019 or 2015-2019"
+            .format(text))
+    return list(range(first, last + 1))
+
+def json_lines_sink(stream):
+    """Writes one JSON line per parsed page."""
+    def sink(stage, url, context, data):
+        stream.write(json.dumps(
+            {'stage': stage, 'url': url, 'context': context, 'data': data},
+            default=str) + '\n')
+    return sink
+
+def main(argv=None):
+    args = argparse.ArgumentParser(
+        description='Crawl basketball-reference seasons down to boxscores.')
+    args.add_argument('--league', default='NBA')
+    args.add_argument('--seasons', type=parse_seasons,
+                      help='season end years, e.g. 2019 or 2015-2019')
+    args.add_argument('--daily', action='store_true',
+                      help='fetch only games new or changed in the last days')
+    args.add_argument('--days', type=int, default=1,
+                      help='days before today the daily update covers')
+    args.add_argument('--state', metavar='FILE',
+                      help='file to keep the known games in')
+    args.add_argument('--output', default='-',
+                      help='JSON lines file, defaults to stdout')
+    args.add_argument('--parquet', metavar='DIR',
+                      help='write Parquet datasets to DIR instead')
+    args.add_argument('--database', metavar='FILE',
+                      help='load into an SQLite database instead')
+    args.add_argument('--parser', default='html.parser')
+    args.add_argument('--concurrency', type=int, default=4)
+    args.add_argument('--rate', type=float, default=REQUESTS_PER_MINUTE / 60,
+                      help='requests per second')
+    args.add_argument('--workers', type=int, default=2,
+                      help='workers per stage')
+    args.add_argument('--queue-size', type=int, default=100)
+    args.add_argument('--report-interval', type=float, default=10.0)
+    args.add_argument('--cache', metavar='DIR',
+                      help='page cache directory')
+    args.add_argument('--offline', action='store_true',
+                      help='crawl from the page cache alone')
+    args.add_argument('--frontier', metavar='FILE',
+                      help='file to keep the crawl frontier in, to resume '
+                           'a stopped crawl')
+    args.add_argument('--retry-failed', action='store_true',
+                      help='crawl again the pages that failed last time')
+    args.add_argument('--parse-cache', metavar='FILE',
+                      help='file to keep parsed results in')
+    args.add_argument('--parse-cache-size', type=int, default=256,
+                      help='parsed results to keep, in MB')
+    args.add_argument('--metrics', metavar='FILE',
+                      help='file to write parser metrics to, in the '
+                           'Prometheus text format')
+    arg_parser = args
+    args = args.parse_args(argv)
+    if args.offline and not args.cache:
+        arg_parser.error('--offline requires --cache')
+    if args.daily and not args.state:
+        arg_parser.error('--daily requires --state')
+    if not args.daily and not args.seasons:
+        arg_parser.error('--seasons is required unless --daily is given')
+
+    if args.parquet and args.database:
+        arg_parser.error('--parquet and --database cannot be combined')
+
+    output = None
+    if args.parquet:
+        sink = ColumnarSink(args.parquet)
+    elif args.database:
+        sink = DatabaseLoader(args.database)
+    else:
+        output = sys.stdout if args.output == '-' else open(args.output, 'w')
+        sink = json_lines_sink(output)
+
+    cache = PageCache(args.cache, CachePolicy()) if args.cache else None
+    parse_cache = None
+    if args.parse_cache:
+        parse_cache = ParseCache(args.parse_cache,
+                                 args.parse_cache_size * 1024 * 1024)
+    game_state = GameStateStore(args.state) if args.state else None
+    frontier = Frontier(args.frontier) if args.frontier else None
+    instrumentation = None
+    if args.metrics:
+        instrumentation = BasePageParser.enable_instrumentation()
+
+    async def crawl():
+        if cache is None:
+            fetcher = Fetcher(concurrency=args.concurrency, rate=args.rate)
+        else:
+            fetcher = CachingFetcher(cache, offline=args.offline,
+                                     concurrency=args.concurrency,
+                                     rate=args.rate)
+        async with fetcher:
+            pipeline = CrawlPipeline(
+                args.league, args.seasons or [], fetcher,
+                sink=sink, parser=args.parser,
+                workers=args.workers, queue_size=args.queue_size,
+                report_interval=args.report_interval,
+                parse_cache=parse_cache, game_state=game_state,
+                frontier=frontier, retry_failed=args.retry_failed)
+            start = None
+            if args.daily:
+                start = pipeline.get_daily_start(date.today(), args.days)
+            stats = await pipeline.run(start)
+            for change in pipeline.changes:
+                print(format_change(change), file=sys.stderr)
+            return stats
+
+    try:
+        asyncio.run(crawl())
+    finally:
+        if output is None:
+            sink.close()
+        elif output is not sys.stdout:
+            output.close()
+        if cache is not None:
+            cache.close()
+        if parse_cache is not None:
+            parse_cache.close()
+        if game_state is not None:
+            game_state.close()
+        if frontier is not None:
+            frontier.close()
+        if instrumentation is not None:
+            BasePageParser.disable_instrumentation()
+            with open(args.metrics, 'w') as f:
+                f.write(instrumentation.to_prometheus())
+            print(instrumentation.to_log_line(), file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""Converts the date and time text of basketball-reference pages.
+
+    game dates   'Tue, Oct 16, 2018'   date(2018, 10, 16)
+    game times   '8:00p', '12:30a'     time(20, 0), time(0, 30)
+    ISO dates    '1996-07-20'          date(1996, 7, 20)
+    birth dates  'July 20, 1996'       date(1996, 7, 20)
+
+Text that fully matches the page's usual shape, e.g. ASCII digits and
+known day and month names with single spaces, is read with `int` and a
+name table, which is much faster than `datetime.strptime`. Those shapes
+are a strict subset of what strptime accepts, and every other text,
+including a matching one that makes an invalid date or time, falls back
+to strptime with the page's format, so it converts, or raises
+ValueError, exactly as before.
+
+A season has only ~170 game dates and a handful of start times, so the
+converted values are memoized: most rows of a schedule are a dict
+lookup. The values are immutable `date` and `time` objects and safe to
+share between rows.
+"""
+
+import functools
+
+import re
+
+from datetime import date, datetime, time
+
+GAME_DATE_FORMAT = '%a, %b %d, %Y'    # Tue, Oct 16, 2018
+GAME_TIME_FORMAT = '%I:%M%p'          # 8:00PM
+ISO_DATE_FORMAT = '%Y-%m-%d'          # 1996-07-20
+BIRTH_DATE_FORMAT = '%B %d, %Y'       # July 20, 1996
+
+# the shapes read without strptime
+RE_GAME_DATE = re.compile(r'([A-Za-z]{3}), ([A-Za-z]{3}) (\d{1,2}), (\d{4})',
+                          re.ASCII)
+RE_GAME_TIME = re.compile(r'(\d{1,2}):(\d{2})([ap])', re.ASCII)
+RE_ISO_DATE = re.compile(r'(\d{4})-(\d{1,2})-(\d{1,2})', re.ASCII)
+RE_BIRTH_DATE = re.compile(r'([A-Za-z]+) (\d{1,2}), (\d{4})', re.ASCII)
+
+# the last letter of a game time as shown on the page, and as strptime
+# reads it
+GAME_TIME_AM = 'a'
+GAME_TIME_PM = 'p'
+DATETIME_AM = 'AM'
+DATETIME_PM = 'PM'
+
+WEEKDAYS = frozenset(['mon', 'tue', 'wed', 'thu', 'fri', 'sat', 'sun'])
+MONTHS = {
+    'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'jun': 6,
+    'jul': 7, 'aug': 8, 'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12,
+}
+MONTH_NAMES = {
+    'january': 1, 'february': 2, 'march': 3, 'april': 4, 'may': 5,
+    'june': 6, 'july': 7, 'august': 8, 'september': 9, 'october': 10,
+    'november': 11, 'december': 12,
+}
+
+CACHE_SIZE = 4096
+
+def strptime_game_date(text):
+    return datetime.strptime(text, GAME_DATE_FORMAT).date()
+
+def strptime_game_time(text):
+    if text[-1:] == GAME_TIME_AM:
+        text = text[:-1] + DATETIME_AM
+    elif text[-1:] == GAME_TIME_PM:
+        text = text[:-1] + DATETIME_PM
+    return datetime.strptime(text, GAME_TIME_FORMAT).time()
+
+def strptime_iso_date(text):
+    return datetime.strptime(text, ISO_DATE_FORMAT).date()
+
+def strptime_birth_date(text):
+    return datetime.strptime(text, BIRTH_DATE_FORMAT).date()
+
+@functools.lru_cache(maxsize=CACHE_SIZE)
+def parse_game_date(text):
+    """'Tue, Oct 16, 2018' -> date(2018, 10, 16)"""
+    match = RE_GAME_DATE.fullmatch(text)
+    if match is not None:
+        weekday, month, day, year = match.groups()
+        month = MONTHS.get(month.lower())
+        if weekday.lower() in WEEKDAYS and month is not None:
+            try:
+                return date(int(year), month, int(day))
+            except ValueError:
+                pass
+    return strptime_game_date(text)
+
+@functools.lru_cache(maxsize=CACHE_SIZE)
+def parse_game_time(text):
+    """'8:00p' -> time(20, 0). Takes the text lower-cased, as the
+    schedule parser passes it.
+    """
+    match = RE_GAME_TIME.fullmatch(text)
+    if match is not None:
+        hour, minute, suffix = match.groups()
+        hour, minute = int(hour), int(minute)
+        if 1 <= hour <= 12 and minute < 60:
+            return time(hour % 12 + (12 if suffix == GAME_TIME_PM else 0),
+                        minute)
+    return strptime_game_time(text)
+
+@functools.lru_cache(maxsize=CACHE_SIZE)
+def parse_iso_date(text):
+    """'1996-07-20' -> date(1996, 7, 20)"""
+    match = RE_ISO_DATE.fullmatch(text)
+    if match is not None:
+        try:
+            return date(*map(int, match.groups()))
+        except ValueError:
+            pass
+    return strptime_iso_date(text)
+
+@functools.lru_cache(maxsize=CACHE_SIZE)
+def parse_birth_date(text):
+    """'July 20, 1996' -> date(1996, 7, 20)"""
+    match = RE_BIRTH_DATE.fullmatch(text)
+    if match is not None:
+        month, day, year = match.groups()
+        month = MONTH_NAMES.get(month.lower())
+        if month is not None:
+            try:
+                return date(int(year), month, int(day))
+            except ValueError:
+                pass
+    return strptime_birth_date(text)
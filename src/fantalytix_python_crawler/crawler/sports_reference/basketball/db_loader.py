@@ -0,0 +1,342 @@
+"""Loads parsed pages into database tables with batched upserts.
+
+    TeamsPageParser       teams               (abbreviation)
+    PlayerPageParser      players             (player_id)
+    SeasonSchedule...     games               (league, game_date, home_team_name)
+    BoxscorePageParser    boxscore_basic      (game_id, player_id)
+                          boxscore_advanced   (game_id, player_id)
+
+Rows are buffered per table and written `batch_rows` at a time with one
+`executemany` and one commit per batch. Every insert is an upsert on the
+table's key (`INSERT ... ON CONFLICT (...) DO UPDATE`), so loading a page
+again updates its rows instead of failing or duplicating them. Stats are
+stored as numbers (see `typed_stats`), with NULL for blank cells and for
+players who did not play; dates and times as ISO text. A boxscore row's
+`team` is the team's abbreviation, and its `player_id` the player's
+slug, e.g. 'duranke01', or their name for a row without a player link.
+
+The tables' layout has a version, kept in the `schema_version` table.
+A database whose tables have another layout, such as one written before
+boxscores were keyed by player_id (version 1, which did not record its
+version), is refused with a ValueError rather than written to; load
+into a new database instead.
+
+The target is any DB-API connection whose database understands
+`ON CONFLICT`, which SQLite (3.24+) and PostgreSQL both do; pass
+`placeholder='%s'` for drivers that use the format paramstyle. Given a
+path instead, an SQLite database is opened.
+
+    with DatabaseLoader('fantalytix.sqlite') as loader:
+        loader.load_teams(TeamsPageParser(html).get_data())
+        loader.load_boxscore(url, BoxscorePageParser(html).get_data())
+
+A loader is also a CrawlPipeline sink, loading schedules and boxscores:
+
+    CrawlPipeline('NBA', [2019], fetcher, sink=loader)
+"""
+
+import os
+
+import sqlite3
+
+from .records import BASIC_BOX_SCORE_STATS, ADVANCED_BOX_SCORE_STATS
+from .typed_stats import (DID_NOT_PLAY, FLOAT, NULL_FLOAT, NULL_INT,
+                          STAT_TYPES, convert_column, to_python)
+
+TEAMS = 'teams'
+PLAYERS = 'players'
+GAMES = 'games'
+BOXSCORE_BASIC = 'boxscore_basic'
+BOXSCORE_ADVANCED = 'boxscore_advanced'
+
+SCHEDULES_STAGE = 'schedules'
+BOXSCORES_STAGE = 'boxscores'
+
+BOXSCORE_TEAMS = ('home_team', 'away_team')
+
+# 2: boxscores keyed by (game_id, player_id), ids of teams and players
+SCHEMA_VERSION = 2
+SCHEMA_VERSION_TABLE = 'schema_version'
+# the tables of version 1 were created without a version
+UNVERSIONED = 1
+
+def get_stat_columns(stats):
+    return [(stat, 'REAL' if STAT_TYPES[stat] == FLOAT else 'INTEGER')
+            for stat in stats]
+
+# table -> ([(column, type)], key columns)
+TABLES = {
+    TEAMS: ([
+        ('abbreviation', 'TEXT'),
+        ('name', 'TEXT'),
+        ('status', 'TEXT'),
+        ('url', 'TEXT'),
+    ], ('abbreviation',)),
+    PLAYERS: ([
+        ('player_id', 'TEXT'),
+        ('name', 'TEXT'),
+        ('height', 'TEXT'),
+        ('weight', 'INTEGER'),
+        ('birthday', 'TEXT'),
+        ('birthplace', 'TEXT'),
+        ('nationality', 'TEXT'),
+    ], ('player_id',)),
+    GAMES: ([
+        ('league', 'TEXT'),
+        ('game_date', 'TEXT'),
+        ('home_team_name', 'TEXT'),
+        ('game_start_time', 'TEXT'),
+        ('visitor_team_name', 'TEXT'),
+        ('home_team_id', 'TEXT'),
+        ('visitor_team_id', 'TEXT'),
+        ('visitor_pts', 'INTEGER'),
+        ('home_pts', 'INTEGER'),
+        ('box_score_text', 'TEXT'),
+        ('overtimes', 'TEXT'),
+        ('attendance', 'INTEGER'),
+        ('type', 'TEXT'),
+    ], ('league', 'game_date', 'home_team_name')),
+    BOXSCORE_BASIC: ([
+        ('game_id', 'TEXT'),
+        ('team', 'TEXT'),
+        ('player', 'TEXT'),
+        ('player_id', 'TEXT'),
+        ('is_starter', 'INTEGER'),
+        ('did_not_play', 'TEXT'),
+    ] + get_stat_columns(BASIC_BOX_SCORE_STATS),
+        ('game_id', 'player_id')),
+    BOXSCORE_ADVANCED: ([
+        ('game_id', 'TEXT'),
+        ('team', 'TEXT'),
+        ('player', 'TEXT'),
+        ('player_id', 'TEXT'),
+        ('did_not_play', 'TEXT'),
+    ] + get_stat_columns(ADVANCED_BOX_SCORE_STATS),
+        ('game_id', 'player_id')),
+}
+
+def get_create_table(table):
+    columns, key = TABLES[table]
+    return 'CREATE TABLE IF NOT EXISTS {} ({}, PRIMARY KEY ({}))'.format(
+        table, ', '.join('{} {}'.format(*column) for column in columns),
+        ', '.join(key))
+
+def get_upsert(table, placeholder='?'):
+    columns, key = TABLES[table]
+    names = [name for name, _ in columns]
+    return ('INSERT INTO {} ({}) VALUES ({}) ON CONFLICT ({}) '
+            'DO UPDATE SET {}'.format(
+                table, ', '.join(names), ', '.join([placeholder] * len(names)),
+                ', '.join(key), ', '.join(
+                    '{0} = excluded.{0}'.format(name)
+                    for name in names if name not in key)))
+
+def get_id_from_url(url):
+    """'.../boxscores/201810310GSW.html' -> '201810310GSW'"""
+    return os.path.splitext(os.path.basename(url.rstrip('/')))[0]
+
+def to_iso(value):
+    return value.isoformat() if value is not None else None
+
+def get_player_key(row):
+    """The player's slug, or their name if the row has none."""
+    return row['player_id'] or row['player']
+
+def get_boxscore_columns(game_id, team, rows, stats, starters):
+    """Returns a team's table as {column: values}, in TABLES column order:
+    the players who played, with stats converted a column at a time into
+    arrays, then those who did not, with NULL_INT or NaN stats. Both this
+    loader and `ColumnarSink` build their boxscore rows from it.
+    """
+    played = [row for row in rows if DID_NOT_PLAY not in row]
+    benched = [row for row in rows if DID_NOT_PLAY in row]
+    rows = played + benched
+    columns = {
+        'game_id': [game_id] * len(rows),
+        'team': [team] * len(rows),
+        'player': [row['player'] for row in rows],
+        'player_id': [get_player_key(row) for row in rows],
+    }
+    if starters:
+        columns['is_starter'] = ([row['is_starter'] for row in played]
+                                 + [None] * len(benched))
+    columns[DID_NOT_PLAY] = ([None] * len(played)
+                             + [row[DID_NOT_PLAY] for row in benched])
+    for stat in stats:
+        values = convert_column(stat, [row[stat] for row in played])
+        null = NULL_FLOAT if values.typecode == FLOAT else NULL_INT
+        values.extend([null] * len(benched))
+        columns[stat] = values
+    return columns
+
+def get_boxscore_rows(game_id, team, rows, stats, starters):
+    """Returns one tuple per row of a team's table, in TABLES column order,
+    with null stats as None.
+    """
+    columns = get_boxscore_columns(game_id, team, rows, stats, starters)
+    for stat in stats:
+        columns[stat] = [to_python(value, STAT_TYPES[stat])
+                         for value in columns[stat]]
+    return list(zip(*columns.values()))
+
+class DatabaseLoader:
+
+    BATCH_ROWS = 5000
+
+    def __init__(self, connection, batch_rows=BATCH_ROWS, placeholder='?',
+                 create_tables=True):
+        if isinstance(connection, (str, os.PathLike)):
+            connection = sqlite3.connect(connection)
+            self.owns_connection = True
+        else:
+            self.owns_connection = False
+        self.connection = connection
+        self.batch_rows = batch_rows
+        self.placeholder = placeholder
+        self.upserts = {table: get_upsert(table, placeholder)
+                        for table in TABLES}
+        self.buffers = {table: [] for table in TABLES}
+        self.loaded = dict.fromkeys(TABLES, 0)
+        if create_tables:
+            try:
+                self.create_tables()
+            except ValueError:
+                if self.owns_connection:
+                    self.connection.close()
+                raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def try_select(self, query):
+        """Returns the first row of `query`, or None if it has none or
+        fails, e.g. because the table does not exist.
+        """
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute(query)
+            return cursor.fetchone()
+        except Exception:
+            self.connection.rollback()
+            return None
+
+    def get_schema_version(self):
+        """The version of the tables in the database, or None if it has
+        none of them.
+        """
+        version = self.try_select(
+            'SELECT version FROM {}'.format(SCHEMA_VERSION_TABLE))
+        if version is not None:
+            return version[0]
+        if self.try_select('SELECT COUNT(*) FROM {}'.format(TEAMS)):
+            return UNVERSIONED
+        return None
+
+    def create_tables(self):
+        """Creates the tables, or checks that the existing ones have the
+        layout of SCHEMA_VERSION. Raises ValueError if they do not.
+        """
+        version = self.get_schema_version()
+        if version is not None and version != SCHEMA_VERSION:
+            raise ValueError(
+                "The database has tables of version {}, but this loader "
+                "writes version {}. Load into a new database.".format(
+                    version, SCHEMA_VERSION))
+        cursor = self.connection.cursor()
+        self.begin(cursor)
+        try:
+            for table in TABLES:
+                cursor.execute(get_create_table(table))
+            if version is None:
+                cursor.execute('CREATE TABLE IF NOT EXISTS {} '
+                               '(version INTEGER NOT NULL)'.format(
+                                   SCHEMA_VERSION_TABLE))
+                cursor.execute('INSERT INTO {} (version) VALUES ({})'.format(
+                    SCHEMA_VERSION_TABLE, SCHEMA_VERSION))
+        except Exception:
+            self.connection.rollback()
+            raise
+        self.connection.commit()
+
+    def begin(self, cursor):
+        """Opens a transaction, unless one is open already. sqlite3 runs
+        `CREATE TABLE` outside of a transaction otherwise, so a crash
+        after creating the tables but before recording their version
+        would leave a database that is refused as version 1.
+        """
+        if not getattr(self.connection, 'in_transaction', False):
+            cursor.execute('BEGIN')
+
+    def __call__(self, stage, url, context, data):
+        if stage == SCHEDULES_STAGE:
+            self.load_games(context['league'], data)
+        elif stage == BOXSCORES_STAGE:
+            self.load_boxscore(url, data)
+
+    def add(self, table, rows):
+        buffer = self.buffers[table]
+        buffer.extend(rows)
+        if len(buffer) >= self.batch_rows:
+            self.flush(table)
+
+    def load_teams(self, teams):
+        self.add(TEAMS, [(team['abbreviation'], team['name'], team['status'],
+                          team['url']) for team in teams])
+
+    def load_player(self, url, player):
+        """`url` is the player's page, e.g. '.../players/s/simmobe01.html'."""
+        self.add(PLAYERS, [(
+            get_id_from_url(url), player['name'], player['height'],
+            player['weight'], to_iso(player['birthday']),
+            player['birthplace'], player['nationality'])])
+
+    def load_games(self, league, games):
+        self.add(GAMES, [(
+            league, game['game_date'].isoformat(), game['home_team_name'],
+            to_iso(game['game_start_time']), game['visitor_team_name'],
+            game['home_team_id'], game['visitor_team_id'],
+            game['visitor_pts'], game['home_pts'], game['box_score_text'],
+            game['overtimes'], game['attendance'], game['type'])
+            for game in games])
+
+    def load_boxscore(self, url, boxscore):
+        game_id = get_id_from_url(url)
+        for table, key, stats, starters in [
+                (BOXSCORE_BASIC, 'basic', BASIC_BOX_SCORE_STATS, True),
+                (BOXSCORE_ADVANCED, 'advanced', ADVANCED_BOX_SCORE_STATS,
+                 False)]:
+            rows = []
+            for team in BOXSCORE_TEAMS:
+                rows.extend(get_boxscore_rows(
+                    game_id, boxscore[team]['abbreviation'],
+                    boxscore[team][key], stats, starters))
+            self.add(table, rows)
+
+    def flush(self, table):
+        """Writes the buffered rows of `table` in one transaction. If it
+        fails the transaction is rolled back and the rows stay buffered.
+        """
+        rows = self.buffers[table]
+        if not rows:
+            return
+        cursor = self.connection.cursor()
+        try:
+            cursor.executemany(self.upserts[table], rows)
+            self.connection.commit()
+        except Exception:
+            self.connection.rollback()
+            raise
+        self.buffers[table] = []
+        self.loaded[table] += len(rows)
+
+    def flush_all(self):
+        for table in TABLES:
+            self.flush(table)
+
+    def close(self):
+        self.flush_all()
+        if self.owns_connection:
+            self.connection.close()
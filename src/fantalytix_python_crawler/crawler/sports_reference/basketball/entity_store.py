@@ -0,0 +1,300 @@
+"""An in-memory store of crawled teams, players, games and boxscore lines,
+indexed for the lookups we keep making after a crawl.
+
+    get_team(abbreviation)                     teams page rows
+    get_team_season(abbreviation, end_year)    season summary rows
+    get_abbreviation(team_name, end_year)
+    get_team_name(abbreviation, end_year)
+    get_season_teams(end_year)
+    get_player(player_id), find_players(name)  player pages or index rows
+    get_game(game_id), get_games_on(day)       schedule rows
+    get_season_games(end_year)
+    get_team_games(team, end_year=None)        by name or abbreviation
+    get_player_lines(player, end_year=None)    by name or player_id
+
+Every lookup is a dict access returning the k matching entities, instead
+of a scan over parser output. Rows are stored as the parsers return
+them, dicts or records, with their text values interned, so the team
+names, abbreviations and stat text repeated across thousands of rows are
+each kept once.
+
+Games are keyed by the id in their boxscore url, e.g. '201810310GSW', or
+by `(game_date, home_team_name)` before they are played. A boxscore line
+is a BoxscoreLine of the game id, the player's side ('home_team' or
+'away_team'), the table ('basic' or 'advanced') and the row. Lines are
+indexed by the player's name and by the `player_id` slug the boxscore
+parser reads from the player's link, which stays the same when two
+players share a name or a name is spelled differently.
+
+`save(path)` snapshots the store with pickle and `EntityStore.load(path)`
+reloads it. A store is also a CrawlPipeline sink:
+
+    store = EntityStore()
+    await CrawlPipeline('NBA', [2019], fetcher, sink=store).run()
+    store.save('nba_2019.pickle')
+"""
+
+import os
+
+import pickle
+
+import sys
+
+from collections import defaultdict, namedtuple
+
+from urllib.parse import urlsplit
+
+from .db_loader import get_id_from_url
+
+BoxscoreLine = namedtuple('BoxscoreLine', ['game_id', 'team', 'table', 'row'])
+
+SEASONS_STAGE = 'seasons'
+SCHEDULES_STAGE = 'schedules'
+BOXSCORES_STAGE = 'boxscores'
+
+BOXSCORE_TEAMS = ('home_team', 'away_team')
+BOXSCORE_TABLES = ('basic', 'advanced')
+
+def intern_row(row):
+    """Interns the text values of a dict or record in place."""
+    for key, value in row.items():
+        if isinstance(value, str):
+            row[key] = sys.intern(value)
+    return row
+
+def get_line_keys(row):
+    """The keys a boxscore row is indexed by: the player's name, and the
+    player_id when the row has one.
+    """
+    if row.get('player_id'):
+        return row['player'], row['player_id']
+    return row['player'],
+
+def get_boxscore_path(url):
+    return urlsplit(url).path
+
+class EntityStore:
+
+    PICKLE_PROTOCOL = 5
+
+    def __init__(self):
+        # abbreviation -> team
+        self.teams = dict()
+        # (abbreviation, end_year) -> team season
+        self.team_seasons = dict()
+        # (team_name, end_year) -> abbreviation
+        self.abbreviations = dict()
+        # end_year -> [team season]
+        self.season_teams = defaultdict(list)
+        # player_id -> player
+        self.players = dict()
+        # name -> [player_id]
+        self.player_ids = defaultdict(list)
+        # game_id -> game, end_year
+        self.games = dict()
+        self.game_seasons = dict()
+        # boxscore path -> game_id
+        self.boxscore_games = dict()
+        # date -> [game_id], end_year -> [game_id]
+        self.games_by_date = defaultdict(list)
+        self.games_by_season = defaultdict(list)
+        # team_name -> [game_id], (team_name, end_year) -> [game_id]
+        self.games_by_team = defaultdict(list)
+        self.games_by_team_season = defaultdict(list)
+        # name or player_id -> [BoxscoreLine],
+        # (name or player_id, end_year) -> [BoxscoreLine]
+        self.lines = defaultdict(list)
+        self.lines_by_season = defaultdict(list)
+        # game_id -> (end_year, line keys of the players)
+        self.boxscores = dict()
+
+    def __call__(self, stage, url, context, data):
+        if stage == SEASONS_STAGE:
+            self.add_team_seasons(data)
+        elif stage == SCHEDULES_STAGE:
+            self.add_games(context['end_year'], data)
+        elif stage == BOXSCORES_STAGE:
+            self.add_boxscore(url, data, context.get('end_year'))
+
+    def add_teams(self, teams):
+        """Adds the rows of TeamsPageParser."""
+        for team in teams:
+            team = intern_row(team)
+            self.teams[team['abbreviation']] = team
+
+    def add_team_seasons(self, teams):
+        """Adds the rows of SeasonSummaryPageParser."""
+        for team in teams:
+            team = intern_row(team)
+            end_year = int(team['end_year'])
+            key = (team['abbreviation'], end_year)
+            if key not in self.team_seasons:
+                self.season_teams[end_year].append(team)
+            self.team_seasons[key] = team
+            self.abbreviations[(team['team_name'], end_year)] = \
+                team['abbreviation']
+
+    def add_player(self, url, player):
+        """Adds the data of PlayerPageParser for the player page `url`."""
+        player_id = sys.intern(get_id_from_url(url))
+        player = intern_row(player)
+        if player_id not in self.players:
+            self.player_ids[player['name']].append(player_id)
+        self.players[player_id] = player
+
+    def add_players(self, players):
+        """Adds the rows of PlayerIndexPageParser, or a PlayerDirectory.
+        A player added from their page keeps the page's data.
+        """
+        for player in players:
+            player_id = sys.intern(player['player_id'])
+            if player_id not in self.players:
+                self.players[player_id] = intern_row(player)
+                self.player_ids[player['name']].append(player_id)
+
+    def get_game_id(self, game):
+        if game['box_score_text']:
+            return sys.intern(get_id_from_url(game['box_score_text']))
+        return game['game_date'], game['home_team_name']
+
+    def remove_game(self, game_id):
+        """Drops a game stored before it was played, by its old key."""
+        game = self.games.pop(game_id)
+        end_year = self.game_seasons.pop(game_id)
+        self.games_by_date[game['game_date']].remove(game_id)
+        self.games_by_season[end_year].remove(game_id)
+        for team in (game['visitor_team_name'], game['home_team_name']):
+            self.games_by_team[team].remove(game_id)
+            self.games_by_team_season[(team, end_year)].remove(game_id)
+
+    def add_games(self, end_year, games):
+        """Adds the rows of SeasonSchedulePageParser for the season ending
+        in `end_year`. A game added again replaces the stored one.
+        """
+        for game in games:
+            game = intern_row(game)
+            game_id = self.get_game_id(game)
+            unplayed_id = (game['game_date'], game['home_team_name'])
+            if game_id != unplayed_id and unplayed_id in self.games:
+                self.remove_game(unplayed_id)
+            if game_id not in self.games:
+                self.games_by_date[game['game_date']].append(game_id)
+                self.games_by_season[end_year].append(game_id)
+                for team in (game['visitor_team_name'],
+                             game['home_team_name']):
+                    self.games_by_team[team].append(game_id)
+                    self.games_by_team_season[(team, end_year)].append(
+                        game_id)
+            self.games[game_id] = game
+            self.game_seasons[game_id] = end_year
+            if game['box_score_text']:
+                self.boxscore_games[get_boxscore_path(
+                    game['box_score_text'])] = game_id
+
+    def remove_boxscore(self, game_id):
+        end_year, players = self.boxscores.pop(game_id)
+        for player in players:
+            self.lines[player] = [line for line in self.lines[player]
+                                  if line.game_id != game_id]
+            if end_year is not None:
+                key = (player, end_year)
+                self.lines_by_season[key] = [
+                    line for line in self.lines_by_season[key]
+                    if line.game_id != game_id]
+
+    def add_boxscore(self, url, boxscore, end_year=None):
+        """Adds the data of BoxscorePageParser for the boxscore `url`,
+        replacing the lines of a boxscore added before. The season is the
+        stored game's, or `end_year` if the game is not stored.
+        """
+        game_id = self.boxscore_games.get(get_boxscore_path(url))
+        if game_id is None:
+            game_id = sys.intern(get_id_from_url(url))
+        else:
+            end_year = self.game_seasons[game_id]
+        if game_id in self.boxscores:
+            self.remove_boxscore(game_id)
+        players = set()
+        for team in BOXSCORE_TEAMS:
+            for table in BOXSCORE_TABLES:
+                for row in boxscore[team][table]:
+                    line = BoxscoreLine(game_id, team, table, intern_row(row))
+                    for player in get_line_keys(row):
+                        players.add(player)
+                        self.lines[player].append(line)
+                        if end_year is not None:
+                            self.lines_by_season[(player, end_year)]\
+                                .append(line)
+        self.boxscores[game_id] = (end_year, players)
+
+    def get_team(self, abbreviation):
+        return self.teams.get(abbreviation)
+
+    def get_team_season(self, abbreviation, end_year):
+        return self.team_seasons.get((abbreviation, end_year))
+
+    def get_abbreviation(self, team_name, end_year):
+        return self.abbreviations.get((team_name.lower(), end_year))
+
+    def get_team_name(self, abbreviation, end_year):
+        team = self.get_team_season(abbreviation, end_year)
+        return team['team_name'] if team is not None else None
+
+    def get_season_teams(self, end_year):
+        return self.season_teams.get(end_year, [])
+
+    def get_player(self, player_id):
+        return self.players.get(player_id)
+
+    def find_players(self, name):
+        """Players can share a name, so this returns all of them."""
+        return [self.players[player_id]
+                for player_id in self.player_ids.get(name, [])]
+
+    def get_game(self, game_id):
+        return self.games.get(game_id)
+
+    def get_games(self, game_ids):
+        return [self.games[game_id] for game_id in game_ids]
+
+    def get_games_on(self, day):
+        return self.get_games(self.games_by_date.get(day, []))
+
+    def get_season_games(self, end_year):
+        return self.get_games(self.games_by_season.get(end_year, []))
+
+    def get_team_games(self, team, end_year=None):
+        """`team` is a team name, or an abbreviation when `end_year` is
+        given and the season's teams are stored.
+        """
+        if end_year is None:
+            return self.get_games(self.games_by_team.get(team.lower(), []))
+        team_name = self.get_team_name(team, end_year) or team.lower()
+        return self.get_games(
+            self.games_by_team_season.get((team_name, end_year), []))
+
+    def get_player_lines(self, player, end_year=None, table=None):
+        """A player's boxscore lines, of one season and one table if
+        given. `player` is a name or a player_id, e.g. 'duranke01'.
+        """
+        if end_year is None:
+            lines = self.lines.get(player, [])
+        else:
+            lines = self.lines_by_season.get((player, end_year), [])
+        if table is not None:
+            lines = [line for line in lines if line.table == table]
+        return lines
+
+    def save(self, path):
+        """Snapshots the store to `path`, replacing it atomically."""
+        temp_path = '{}.tmp'.format(path)
+        with open(temp_path, 'wb') as f:
+            pickle.dump(self.__dict__, f, self.PICKLE_PROTOCOL)
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        store = cls.__new__(cls)
+        with open(path, 'rb') as f:
+            store.__dict__.update(pickle.load(f))
+        return store
@@ -0,0 +1,221 @@
+"""Remembers the games already crawled, so a daily update only fetches the
+boxscores of games that are new or changed.
+
+Games are kept in an SQLite file keyed by league, game date and home
+team. `update(league, games)` compares freshly parsed schedule rows with
+what is stored and returns what changed:
+
+    ADDED          a game not seen before
+    PLAYED         a known game that now has a boxscore
+    SCORE_CHANGED  a played game whose score is different
+
+`pending_boxscores(league, games)` then returns the games whose boxscore
+still has to be fetched: those that changed, and those whose boxscore
+has not been fetched yet, e.g. because the fetch failed last time. Call
+`mark_fetched(url)` once a boxscore has been parsed.
+
+    with GameStateStore('games.sqlite') as state:
+        for change in state.update('NBA', games):
+            print(format_change(change))
+        for game in state.pending_boxscores('NBA', games):
+            ...
+
+The store also keeps, per season, the schedule months a crawl reached
+and whether the playoffs had started before each. The playoffs header
+row is only on the month they start in, so this is what lets a daily
+crawl start from the current month instead of the season's first.
+`reach_month` records a month and `get_month` returns the last one
+reached, up to a given month.
+"""
+
+import sqlite3
+
+import time
+
+from collections import namedtuple
+
+from urllib.parse import urlsplit
+
+from fantalytix_python_crawler.crawler.sports_reference.basketball\
+    .settings import MONTH_NAMES
+
+from .cache_policy import SEASON_START_MONTH
+
+ADDED = 'added'
+PLAYED = 'played'
+SCORE_CHANGED = 'score_changed'
+
+# `previous` is the stored (visitor_pts, home_pts), None for ADDED
+GameChange = namedtuple('GameChange', ['kind', 'game', 'previous'])
+
+# `playoffs` is whether they had started before the month
+SeasonMonth = namedtuple('SeasonMonth', ['month', 'playoffs'])
+
+def get_boxscore_path(url):
+    return urlsplit(url).path if url else ''
+
+def get_month_position(month):
+    """A month's place in the season, counted from SEASON_START_MONTH, or
+    None for a name that is not in MONTH_NAMES.
+    """
+    if month not in MONTH_NAMES:
+        return None
+    return (MONTH_NAMES.index(month) + 1 - SEASON_START_MONTH) % 12
+
+def format_change(change):
+    """'played 2018-10-16 philadelphia 76ers 87 @ boston celtics 105'"""
+    game = change.game
+    text = '{} {} {} {} @ {} {}'.format(
+        change.kind, game['game_date'].isoformat(),
+        game['visitor_team_name'], game['visitor_pts'],
+        game['home_team_name'], game['home_pts'])
+    if change.kind == SCORE_CHANGED:
+        text += ' (was {}-{})'.format(*change.previous)
+    return text
+
+class GameStateStore:
+
+    SCHEMA = '''
+        CREATE TABLE IF NOT EXISTS games (
+            league TEXT NOT NULL,
+            game_date TEXT NOT NULL,
+            home_team_name TEXT NOT NULL,
+            visitor_team_name TEXT NOT NULL,
+            visitor_pts INTEGER,
+            home_pts INTEGER,
+            boxscore_path TEXT NOT NULL,
+            boxscore_fetched INTEGER NOT NULL,
+            updated_at REAL NOT NULL,
+            PRIMARY KEY (league, game_date, home_team_name)
+        )
+    '''
+    MONTHS_SCHEMA = '''
+        CREATE TABLE IF NOT EXISTS season_months (
+            league TEXT NOT NULL,
+            end_year INTEGER NOT NULL,
+            month TEXT NOT NULL,
+            position INTEGER NOT NULL,
+            playoffs INTEGER NOT NULL,
+            updated_at REAL NOT NULL,
+            PRIMARY KEY (league, end_year, month)
+        )
+    '''
+
+    def __init__(self, path, clock=time.time):
+        self.path = path
+        self.clock = clock
+        self.db = sqlite3.connect(path)
+        self.db.execute(self.SCHEMA)
+        self.db.execute(self.MONTHS_SCHEMA)
+        self.db.execute('CREATE INDEX IF NOT EXISTS games_boxscore_path '
+                        'ON games (boxscore_path)')
+        self.db.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self.db.close()
+
+    def __len__(self):
+        return self.db.execute('SELECT COUNT(*) FROM games').fetchone()[0]
+
+    @staticmethod
+    def get_key(league, game):
+        return (league, game['game_date'].isoformat(), game['home_team_name'])
+
+    def get(self, league, game):
+        """Returns the stored `(visitor_pts, home_pts, boxscore_path,
+        boxscore_fetched)` of `game`, or None.
+        """
+        return self.db.execute(
+            'SELECT visitor_pts, home_pts, boxscore_path, boxscore_fetched '
+            'FROM games '
+            'WHERE league = ? AND game_date = ? AND home_team_name = ?',
+            self.get_key(league, game)).fetchone()
+
+    def get_change(self, game, stored):
+        if stored is None:
+            return GameChange(ADDED, game, None)
+        visitor_pts, home_pts, boxscore_path, _ = stored
+        if game['box_score_text'] and not boxscore_path:
+            return GameChange(PLAYED, game, None)
+        if boxscore_path and (visitor_pts, home_pts) != (
+                game['visitor_pts'], game['home_pts']):
+            return GameChange(SCORE_CHANGED, game, (visitor_pts, home_pts))
+        return None
+
+    def update(self, league, games):
+        """Stores `games` and returns a GameChange for each that is new or
+        changed. A changed game's boxscore is fetched again.
+        """
+        changes = []
+        for game in games:
+            stored = self.get(league, game)
+            change = self.get_change(game, stored)
+            if change is None:
+                continue
+            changes.append(change)
+            self.db.execute(
+                'INSERT OR REPLACE INTO games '
+                '(league, game_date, home_team_name, visitor_team_name, '
+                'visitor_pts, home_pts, boxscore_path, boxscore_fetched, '
+                'updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                self.get_key(league, game) + (
+                    game['visitor_team_name'], game['visitor_pts'],
+                    game['home_pts'],
+                    get_boxscore_path(game['box_score_text']), 0,
+                    self.clock()))
+        self.db.commit()
+        return changes
+
+    def pending_boxscores(self, league, games):
+        """Returns the games of `games` with a boxscore not fetched yet."""
+        pending = []
+        for game in games:
+            stored = self.get(league, game)
+            if game['box_score_text'] and (stored is None or not stored[3]):
+                pending.append(game)
+        return pending
+
+    def reach_month(self, league, end_year, month, playoffs):
+        """Records that a crawl reached `month` of a season, and whether
+        the playoffs had started before it. A month `get_month_position`
+        can't place is not recorded.
+        """
+        position = get_month_position(month)
+        if position is None:
+            return
+        self.db.execute(
+            'INSERT OR REPLACE INTO season_months '
+            '(league, end_year, month, position, playoffs, updated_at) '
+            'VALUES (?, ?, ?, ?, ?, ?)',
+            (league, end_year, month, position, int(playoffs), self.clock()))
+        self.db.commit()
+
+    def get_month(self, league, end_year, through=None):
+        """Returns the SeasonMonth of the last month of a season a crawl
+        reached, no later than the month `through` if given, or None.
+        """
+        query = ('SELECT month, playoffs FROM season_months '
+                 'WHERE league = ? AND end_year = ? {}'
+                 'ORDER BY position DESC LIMIT 1')
+        position = get_month_position(through)
+        if position is None:
+            row = self.db.execute(query.format(''),
+                                  (league, end_year)).fetchone()
+        else:
+            row = self.db.execute(query.format('AND position <= ? '),
+                                  (league, end_year, position)).fetchone()
+        if row is None:
+            return None
+        return SeasonMonth(row[0], bool(row[1]))
+
+    def mark_fetched(self, url):
+        self.db.execute(
+            'UPDATE games SET boxscore_fetched = 1 WHERE boxscore_path = ?',
+            (get_boxscore_path(url),))
+        self.db.commit()
@@ -8,40 +8,57 @@ It returns an array of dictionaries, one per season, in the format
         'url': '<url>'
     }
 
-Key data is found using the CSS select statement
+Key data is read from the link in the `season` cell of each row of 
+`table#stats` (see FIELDS), which contains the relative hrefs in the 
+format `/leagues/NBA_2018.html`. Some seasons have multiple active 
+leagues, so a regex is used to extract the league data for 
+differentiation.
 
-    `table#stats tr th[data-stat=season] a`
-
-which contains the relative hrefs in the format `/leagues/NBA_2018.html`.
-Some seasons have multiple active leagues, so a regex is used to extract 
-the league data for differentiation.
+`iter_rows` yields the seasons one at a time as their rows are read, and 
+the page can be given as a stream (see `BasePageParser`).
 
 Note that there may be a `tbody` tag between the `table` and `tr` 
 which is something the browser adds in. It is not present in 
 the source html.
 """
 
-from bs4 import BeautifulSoup
+from bs4 import SoupStrainer
 
 from fantalytix_python_crawler.crawler.sports_reference.basketball\
     .settings import BASE_URL
 
+from .base_page_parser import BasePageParser
+from .field_schema import LINK, Field
+from .records import Season
+
 from urllib.parse import urljoin
 
 import re
 
 from datetime import date
 
-class LeaguesPageParser:
+class LeaguesPageParser(BasePageParser):
 
-    SEASON_TAG = 'table#stats tr th[data-stat=season] a'
+    ROWS_SELECTOR = 'table#stats tr'
+    STREAM_TABLE_ID = 'stats'
+    SEASON_STAT = 'season'
+    FIELDS = {
+        'league': Field(SEASON_STAT, 'get_league', LINK),
+        'years': Field(SEASON_STAT, 'get_season_years', LINK),
+        'url': Field(SEASON_STAT, 'get_season_url', LINK),
+    }
+    REGIONS = [SoupStrainer('table', id='stats')]
     RE_SEASON_URL = re.compile(r'/leagues/(NBA|ABA|BAA)_\d{4}.html')
     RE_SEASON_YEARS = re.compile(r'(\d{4})-\d{2}')
+    INSTRUMENTED_METHODS = dict(BasePageParser.INSTRUMENTED_METHODS,
+                                season_years_text_to_date='convert',
+                                get_league='convert')
 
-    def __init__(self, html, parser='html.parser'):
+    def __init__(self, html, parser='html.parser', records=False):
         self.data = []
         self.html = html
         self.parser = parser
+        self.records = records
 
     def season_years_text_to_date(self, text):
         """Converts seasons from text to date format.
@@ -53,30 +70,48 @@ class LeaguesPageParser:
         end_year = start_year + 1
         return date(start_year, 1, 1), date(end_year, 1, 1)
 
+    def get_league(self, link):
+        rel_href = link.get('href')
+        try:
+            return self.RE_SEASON_URL.match(rel_href).group(1)
+        except (AttributeError, TypeError):
+            self.count_failure()
+            print("No relative href found. Is '{}' "
+                  "in the correct format?".format(rel_href))
+            return None
+
+    def get_season_years(self, link):
+        """Returns `(start_year, end_year)`, or Nones if the link text 
+        is not a season.
+        """
+        try:
+            return self.season_years_text_to_date(link.text.lower())
+        except AttributeError:
+            self.count_failure()
+            print("Start or end year not found. Is '{}' "
+                  "in the correct format?".format(link.text.lower()))
+            return None, None
+
+    def get_season_url(self, link):
+        return urljoin(BASE_URL, link.get('href'))
+
+    def get_row_data(self, row):
+        """Rows without a season link, such as headers, are skipped."""
+        cells = self.get_cells_by_stat(row)
+        season = cells.get(self.SEASON_STAT)
+        if season is None or season.a is None:
+            return None
+        fields = self.read_fields(cells, self.get_plan())
+        start_year, end_year = fields['years']
+        return self.make_record(Season, {
+            'league': fields['league'],
+            'start_year': start_year,
+            'end_year': end_year,
+            'url': fields['url'],
+        })
+
     def handle_data(self):
-        handler = BeautifulSoup(self.html, self.parser)
-        season_links = handler.select(self.SEASON_TAG)
-        for link in season_links:
-            rel_href = link.get('href')
-            try:
-                league = self.RE_SEASON_URL.match(rel_href).group(1)
-            except AttributeError:
-                print("No relative href found. Is '{}' "
-                      "in the correct format?".format(rel_href))
-                pass
-            try:
-                start_year, end_year = self.season_years_text_to_date(
-                    link.text.lower())
-            except AttributeError:
-                print("Start or end year not found. Is '{}' "
-                      "in the correct format?".format(link.text.lower()))
-
-            self.data.append({
-                'league': league,
-                'start_year': start_year,
-                'end_year': end_year,
-                'url': urljoin(BASE_URL, rel_href),
-            })
+        self.data.extend(self.iter_rows())
 
     def get_data(self):
         if len(self.data) == 0:
@@ -0,0 +1,374 @@
+"""Parse engines behind the `parser=` argument of the page parsers.
+
+Any name BeautifulSoup understands (`html.parser`, `lxml`, `html5lib`)
+builds a BeautifulSoup tree as before. `lxml.html` skips BeautifulSoup
+and builds an lxml tree directly, wrapped in `LxmlNode` so the parsers
+can keep using the same small part of the bs4 API:
+
+    select(), text, get(), [attr], find_all(), find() and tag.<name>
+
+`tag.<name>` only works for the HTML element names in HTML_TAGS. Any
+other attribute that is not part of that API, e.g. `.parent` or
+`.string`, raises AttributeError instead of being looked up as a child.
+
+libxml2 and html.parser do not agree on every piece of broken markup.
+The one that matters on basketball-reference is an end tag arriving
+while a child element is still open, e.g. `<li><div>...</li>`.
+html.parser closes the `div` and the `li`; libxml2 ignores the `</li>`
+so every following `li` nests inside the first one, which is why
+`ul.page_index > li > a` used to find 1 link instead of 25.
+`balance_end_tags` inserts the missing end tags before lxml sees the
+page so both engines build the same tree. It works on text, so a page
+given as bytes is first decoded by `decode_markup` the way BeautifulSoup
+decodes it.
+
+More engines can be added with `register_engine`.
+
+`RowStream` parses a page fed in chunks and hands back each table row as 
+soon as its end tag is read, so rows can be used while the rest of the 
+page is still downloading. Everything else is dropped from the tree as 
+soon as it ends. A streamed page is not passed through 
+`balance_end_tags`, which needs the whole page, so on a page with 
+misnested end tags a stream can give different rows than the string.
+"""
+
+import re
+
+from bs4 import BeautifulSoup, SoupStrainer, UnicodeDammit
+
+try:
+    import lxml.html
+    from lxml import etree
+    from lxml.cssselect import CSSSelector
+except ImportError:
+    lxml = None
+
+HTML_PARSER = 'html.parser'
+LXML_HTML = 'lxml.html'
+
+ENGINES = dict()
+
+def register_engine(name, engine):
+    """Registers `engine(html, parse_only=None)` under `name`. The engine
+    returns the root node handed to the page parsers.
+    """
+    ENGINES[name] = engine
+
+def make_handler(html, parser=HTML_PARSER, parse_only=None):
+    """Builds the root node for `html` with the named engine. Names that
+    are not registered are passed to BeautifulSoup as tree builders.
+    """
+    engine = ENGINES.get(parser)
+    if engine is None:
+        return BeautifulSoup(html, parser, parse_only=parse_only)
+    return engine(html, parse_only=parse_only)
+
+def combine_regions(regions):
+    """Combines a parser's region `SoupStrainer`s into the single strainer
+    BeautifulSoup accepts as `parse_only`. Only tags matching one of the
+    regions, and everything inside them, are added to the tree.
+    """
+    if not regions:
+        return None
+    if len(regions) == 1:
+        return regions[0]
+    return AnyRegionStrainer(regions)
+
+class AnyRegionStrainer(SoupStrainer):
+    """Matches a tag that matches any of `regions`. BeautifulSoup asks its
+    `parse_only` strainer about each top level tag with `search_tag`
+    before bs4 4.13 and with `allow_tag_creation` since, so both are
+    answered by asking each region the same question. Strings outside
+    the regions are never kept.
+    """
+
+    def __init__(self, regions):
+        super().__init__()
+        self.regions = list(regions)
+
+    def search_tag(self, markup_name=None, markup_attrs={}):
+        return any(region.search_tag(markup_name, markup_attrs)
+                   for region in self.regions)
+
+    def allow_tag_creation(self, nsprefix, name, attrs):
+        return any(region.allow_tag_creation(nsprefix, name, attrs)
+                   for region in self.regions)
+
+    def allow_string_creation(self, string):
+        return False
+
+def has_class(class_name):
+    """Matches a raw `class` attribute containing `class_name`. Strainers
+    see attribute values before bs4 splits them into lists.
+    """
+    return lambda value: value is not None and class_name in value.split()
+
+VOID_TAGS = frozenset([
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'keygen',
+    'link', 'meta', 'param', 'source', 'track', 'wbr',
+])
+HTML_TAGS = frozenset([
+    'a', 'abbr', 'address', 'area', 'article', 'aside', 'audio', 'b',
+    'base', 'bdi', 'bdo', 'blockquote', 'body', 'br', 'button', 'canvas',
+    'caption', 'cite', 'code', 'col', 'colgroup', 'data', 'datalist', 'dd',
+    'del', 'details', 'dfn', 'dialog', 'div', 'dl', 'dt', 'em', 'embed',
+    'fieldset', 'figcaption', 'figure', 'footer', 'form', 'h1', 'h2', 'h3',
+    'h4', 'h5', 'h6', 'head', 'header', 'hr', 'html', 'i', 'iframe', 'img',
+    'input', 'ins', 'kbd', 'label', 'legend', 'li', 'link', 'main', 'map',
+    'mark', 'meta', 'meter', 'nav', 'noscript', 'object', 'ol', 'optgroup',
+    'option', 'output', 'p', 'param', 'picture', 'pre', 'progress', 'q',
+    'rp', 'rt', 'ruby', 's', 'samp', 'script', 'section', 'select', 'small',
+    'source', 'span', 'strong', 'style', 'sub', 'summary', 'sup', 'table',
+    'tbody', 'td', 'template', 'textarea', 'tfoot', 'th', 'thead', 'time',
+    'title', 'tr', 'track', 'u', 'ul', 'var', 'video', 'wbr',
+])
+RE_RAW_TEXT_END = {
+    name: re.compile(r'</' + name, re.I)
+    for name in ('script', 'style', 'textarea', 'title')
+}
+
+RE_MARKUP = re.compile(r'<!--.*?-->'
+                       r'|<![^>]*>'
+                       r'|<\?[^>]*>'
+                       r'|<(?P<end>/)?(?P<name>[a-zA-Z][^\s/>]*)'
+                       r'(?P<attrs>[^>]*)>', re.S)
+
+def decode_markup(html):
+    """Returns `html` as str. Bytes are decoded as BeautifulSoup decodes
+    them: with the encoding the page declares, else a detected one.
+    """
+    if isinstance(html, bytes):
+        return UnicodeDammit(html, is_html=True).unicode_markup
+    return html
+
+def balance_end_tags(html):
+    """Rewrites end tags the way html.parser reads them: an end tag closes
+    every element opened after its matching start tag. End tags without a
+    matching open element are left alone.
+    """
+    out = []
+    stack = []
+    last = 0
+    pos = 0
+    while True:
+        match = RE_MARKUP.search(html, pos)
+        if match is None:
+            break
+        pos = match.end()
+        name = match.group('name')
+        if name is None:
+            continue
+        name = name.lower()
+        if match.group('end') is None:
+            if name in RE_RAW_TEXT_END:
+                close = RE_RAW_TEXT_END[name].search(html, pos)
+                pos = len(html) if close is None else close.start()
+            elif name not in VOID_TAGS \
+                    and not match.group('attrs').endswith('/'):
+                stack.append(name)
+            continue
+        if name not in stack:
+            continue
+        depth = len(stack) - 1 - stack[::-1].index(name)
+        unclosed = stack[depth + 1:]
+        del stack[depth:]
+        if unclosed:
+            out.append(html[last:match.start()])
+            out.extend('</{}>'.format(tag) for tag in reversed(unclosed))
+            last = match.start()
+    if last == 0:
+        return html
+    out.append(html[last:])
+    return ''.join(out)
+
+class LxmlNode:
+    """Wraps an lxml element with the bs4 `Tag` methods the page parsers
+    use. Strings are returned as plain `str` so the parsed data does not
+    keep the lxml tree alive.
+    """
+
+    __slots__ = ('element',)
+
+    MULTI_VALUED_ATTRIBUTES = frozenset([
+        'class', 'rel', 'rev', 'accept-charset', 'headers', 'accesskey',
+        'dropzone',
+    ])
+
+    def __init__(self, element):
+        self.element = element
+
+    @property
+    def name(self):
+        return self.element.tag
+
+    @property
+    def text(self):
+        return _string_value(self.element)
+
+    def get_text(self):
+        return self.text
+
+    def get(self, key, default=None):
+        value = self.element.get(key)
+        if value is None:
+            return default
+        if key in self.MULTI_VALUED_ATTRIBUTES:
+            return value.split()
+        return value
+
+    def __getitem__(self, key):
+        value = self.get(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def select(self, selector):
+        return [LxmlNode(element)
+                for element in _compile_selector(selector)(self.element)]
+
+    def find_all(self, name, recursive=True):
+        names = [name] if isinstance(name, str) else name
+        if recursive:
+            elements = self.element.iterdescendants(*names)
+        else:
+            elements = self.element.iterchildren(*names)
+        return [LxmlNode(element) for element in elements]
+
+    def find(self, name):
+        for element in self.element.iterdescendants(name):
+            return LxmlNode(element)
+        return None
+
+    def __getattr__(self, name):
+        """`tag.<name>` finds the first descendant element `name`, for
+        HTML element names only.
+        """
+        if name not in HTML_TAGS:
+            raise AttributeError("'{}' object has no attribute '{}'".format(
+                type(self).__name__, name))
+        return self.find(name)
+
+    def __eq__(self, other):
+        return (isinstance(other, LxmlNode)
+                and self.element is other.element)
+
+    def __hash__(self):
+        return hash(self.element)
+
+    def __repr__(self):
+        return '<LxmlNode {}>'.format(self.element.tag)
+
+_selectors = dict()
+
+def _compile_selector(selector):
+    """CSS selectors are translated to XPath once per process."""
+    try:
+        return _selectors[selector]
+    except KeyError:
+        compiled = _selectors[selector] = CSSSelector(
+            selector, translator='html')
+        return compiled
+
+if lxml is not None:
+    _string_value = etree.XPath('string()', smart_strings=False)
+
+def parse_lxml_html(html, parse_only=None):
+    """Builds an lxml tree directly. lxml is fast enough that it always
+    builds the whole document, so `parse_only` is ignored.
+    """
+    if lxml is None:
+        raise ImportError("The '{}' engine requires lxml and cssselect."
+                          .format(LXML_HTML))
+    return LxmlNode(lxml.html.document_fromstring(
+        balance_end_tags(decode_markup(html)) or '<html></html>'))
+
+register_engine(LXML_HTML, parse_lxml_html)
+
+class RowStream:
+    """Feeds chunks of a page (bytes or str) to lxml's incremental parser 
+    and returns the `tr` elements of `table#<table_id>` completed by each 
+    chunk, wrapped in LxmlNode. With a `section` ('thead', 'tbody' or 
+    'tfoot') only the rows of that section are returned. 
+
+    Rows are cleared and dropped from the tree on the next call, so only 
+    the rows of one chunk are held at a time; read what you need from 
+    them before feeding more. Every other element is dropped as soon as 
+    it ends, apart from the table, its ancestors and the cells of rows 
+    still being read, so the tree never holds more than the open 
+    elements and one chunk's rows.
+    """
+
+    ROW_TAG = 'tr'
+    TABLE_TAG = 'table'
+    ENCODING = 'utf-8'
+
+    def __init__(self, table_id, section=None, encoding=ENCODING):
+        if lxml is None:
+            raise ImportError('RowStream requires lxml and cssselect.')
+        self.table_id = table_id
+        self.section = section
+        self.parser = etree.HTMLPullParser(events=('end',), encoding=encoding)
+        self.rows = []
+        # the table and its ancestors, once a row of it has been read
+        self.kept = set()
+
+    def is_in_table(self, element):
+        for table in element.iterancestors(self.TABLE_TAG):
+            return table.get('id') == self.table_id
+        return False
+
+    def is_table_row(self, element):
+        if element.tag != self.ROW_TAG:
+            return False
+        if self.section is not None \
+                and element.getparent().tag != self.section:
+            return False
+        return self.is_in_table(element)
+
+    def is_kept(self, element):
+        """Elements of the table other than rows are kept, as they may be 
+        cells of a row still being read.
+        """
+        if element in self.kept:
+            return True
+        return element.tag != self.ROW_TAG and self.is_in_table(element)
+
+    def drop(self, element):
+        element.clear()
+        parent = element.getparent()
+        if parent is not None:
+            parent.remove(element)
+
+    def release(self):
+        for element in self.rows:
+            self.drop(element)
+        self.rows = []
+
+    def read_rows(self):
+        self.release()
+        for _, element in self.parser.read_events():
+            if self.is_table_row(element):
+                if not self.kept:
+                    table = next(element.iterancestors(self.TABLE_TAG))
+                    self.kept.add(table)
+                    self.kept.update(table.iterancestors())
+                self.rows.append(element)
+            elif not self.is_kept(element):
+                self.drop(element)
+        return [LxmlNode(element) for element in self.rows]
+
+    def feed(self, chunk):
+        self.parser.feed(chunk)
+        return self.read_rows()
+
+    def close(self):
+        self.parser.close()
+        return self.read_rows()
+
+def iter_chunks(stream, chunk_size=64 * 1024):
+    """Reads a file-like object `chunk_size` at a time."""
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
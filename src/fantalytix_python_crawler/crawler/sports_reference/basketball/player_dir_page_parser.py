@@ -4,27 +4,33 @@ contains the players whose last name start with the same letter.
 
 Key data are located under `ul.page_index > li > a`.
 
-BeautifulSoup plus Python's html.parser are used for html parsing. 
-BeautifulSoup plus lxml was tested as well but produces unexpected 
-results. For example, the `ul.page_index > li > a` select statement 
-produces only 1 element when 25 are expected.
+BeautifulSoup plus Python's html.parser are used for html parsing by 
+default. BeautifulSoup plus lxml produces unexpected results: each `li` 
+has an unclosed `div`, so libxml2 nests the following `li` tags inside 
+it and the `ul.page_index > li > a` select statement produces only 1 
+element when 25 are expected. The `lxml.html` engine repairs the end 
+tags first and returns the same 25 urls (see `parse_engines`).
 
 Not all letters are used. Specifically no player has a last name 
 that starts with 'X'.
 """
 
-from bs4 import BeautifulSoup
+from bs4 import SoupStrainer
 
 from fantalytix_python_crawler.crawler.sports_reference.basketball\
     .settings import BASE_URL
 
+from .base_page_parser import BasePageParser
+from .parse_engines import has_class
+
 from urllib.parse import urljoin
 
 import re
 
-class PlayersDirPageParser:
+class PlayersDirPageParser(BasePageParser):
 
     LAST_NAME_LETTER_TAG = 'ul.page_index > li > a'
+    REGIONS = [SoupStrainer('ul', class_=has_class('page_index'))]
     RE_PLAYER_URL = re.compile(r'/players/[a-z]/')
 
     def __init__(self, html, parser='html.parser'):
@@ -33,11 +39,14 @@ class PlayersDirPageParser:
         self.parser = parser
 
     def handle_data(self):
-        handler = BeautifulSoup(self.html, self.parser)
+        handler = self.get_handler()
         last_name_letter_links = handler.select(self.LAST_NAME_LETTER_TAG)
         for link in last_name_letter_links:
             self.urls[link.text.lower()] = urljoin(BASE_URL, link.get('href'))
     
+    def count_rows(self, urls):
+        return len(urls)
+
     def get_urls(self):
         if len(self.urls) == 0:
             self.handle_data()
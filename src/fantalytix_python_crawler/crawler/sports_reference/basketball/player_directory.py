@@ -0,0 +1,127 @@
+"""Builds the player table from the 25 player index pages instead of one
+page per player.
+
+`PlayerDirectoryCrawler` fetches the players page, reads the urls of the
+letter pages from it with PlayersDirPageParser, then fetches all of them
+concurrently, each parse running in a thread while the remaining pages
+download. A letter page that is missing is skipped.
+
+The result is a PlayerDirectory of the rows of PlayerIndexPageParser,
+keyed by player_id. A player page is then only needed for what the index
+does not show, birthplace and nationality, or for players the index does
+not cover:
+
+    async with Fetcher(rate=0.3) as fetcher:
+        directory = await PlayerDirectoryCrawler(fetcher).crawl()
+    directory.get('simmobe01')
+    for url in directory.get_missing_urls(player_ids):
+        ...
+"""
+
+import asyncio
+
+from collections import defaultdict
+
+from urllib.parse import urljoin, urlsplit
+
+from fantalytix_python_crawler.crawler.fetcher import FetchError
+from fantalytix_python_crawler.crawler.sports_reference.basketball\
+    .settings import BASE_URL, PLAYER_URL, PLAYER_PAGE_URL
+
+from .player_dir_page_parser import PlayersDirPageParser
+from .player_index_page_parser import PlayerIndexPageParser
+
+def get_player_page_url(player_id, base_url=BASE_URL):
+    """The letter of a player's pages is the first of their player_id."""
+    return urljoin(base_url, PLAYER_PAGE_URL.format(
+        letter=player_id[0], player_id=player_id))
+
+class PlayerDirectory:
+    """Players of the index pages by player_id, and the player_ids by
+    name.
+    """
+
+    def __init__(self, players):
+        self.players = dict()
+        self.by_name = defaultdict(list)
+        for player in players:
+            if player['player_id'] not in self.players:
+                self.by_name[player['name']].append(player['player_id'])
+            self.players[player['player_id']] = player
+
+    def __len__(self):
+        return len(self.players)
+
+    def __iter__(self):
+        return iter(self.players.values())
+
+    def __contains__(self, player_id):
+        return player_id in self.players
+
+    def get(self, player_id):
+        return self.players.get(player_id)
+
+    def find(self, name):
+        """Players can share a name, so this returns all of them."""
+        return [self.players[player_id]
+                for player_id in self.by_name.get(name, [])]
+
+    def get_missing(self, player_ids):
+        """The player_ids of `player_ids` the directory does not cover,
+        in order and without duplicates.
+        """
+        return [player_id for player_id in dict.fromkeys(player_ids)
+                if player_id and player_id not in self.players]
+
+    def get_missing_urls(self, player_ids, base_url=BASE_URL):
+        """The player pages still to fetch for `player_ids`."""
+        return [get_player_page_url(player_id, base_url)
+                for player_id in self.get_missing(player_ids)]
+
+class PlayerDirectoryCrawler:
+
+    NOT_FOUND = 404
+
+    def __init__(self, fetcher, parser='html.parser', base_url=BASE_URL):
+        self.fetcher = fetcher
+        self.parser = parser
+        self.base_url = base_url
+
+    def get_url(self, url):
+        """Rebuilds a page url on `base_url`."""
+        return urljoin(self.base_url, urlsplit(url).path)
+
+    async def fetch_or_none(self, url):
+        """Returns None for a letter without a page."""
+        try:
+            return await self.fetcher.fetch(url)
+        except FetchError as err:
+            if err.status != self.NOT_FOUND:
+                raise
+            return None
+
+    async def get_letter_urls(self):
+        """Returns `{'<letter>': '<url>'}` read from the players page."""
+        html = await self.fetcher.fetch(urljoin(self.base_url, PLAYER_URL))
+        urls = PlayersDirPageParser(html, self.parser).get_urls()
+        return {letter: self.get_url(url) for letter, url in urls.items()}
+
+    def parse_letter(self, html):
+        return PlayerIndexPageParser(html, self.parser).get_data()
+
+    async def load_letter(self, url):
+        html = await self.fetch_or_none(url)
+        if html is None:
+            return []
+        return await asyncio.to_thread(self.parse_letter, html)
+
+    async def crawl(self, letters=None):
+        """Crawls the index pages of `letters`, or of every letter."""
+        urls = await self.get_letter_urls()
+        if letters is not None:
+            urls = {letter: url for letter, url in urls.items()
+                    if letter in letters}
+        pages = await asyncio.gather(*(
+            self.load_letter(url) for url in urls.values()))
+        return PlayerDirectory(
+            player for players in pages for player in players)
@@ -0,0 +1,90 @@
+"""This parser processes a basketball-reference player index page,
+`/players/<letter>/`, which lists every player whose last name starts
+with the letter. It returns a list of dictionaries, one per player, in
+the format
+
+    {
+        'player_id': '<slug>',
+        'name': '<name>',
+        'from_year': <first season end year>,
+        'to_year': <last season end year>,
+        'position': '<position>',
+        'height': '<height>',
+        'weight': <weight>,
+        'birthday': <birthdate>
+    }
+
+so most of a player's page is read from one table row, without fetching
+the page. The height is the text of the player page, e.g. '6-10'; the
+weight is in pounds. Old players may have no weight or birth date, which
+are None.
+
+The page marks active players in bold and Hall of Famers with a '*'
+after the name, which is dropped. Like the schedule, the rows can be
+read one at a time with `iter_rows`, from an html string or a stream
+(see `BasePageParser`).
+"""
+
+from bs4 import SoupStrainer
+
+from .base_page_parser import BasePageParser
+from .dates import parse_birth_date
+from .field_schema import LINK, Field
+from .records import PlayerIndexRow
+
+class PlayerIndexPageParser(BasePageParser):
+
+    TABLE_PLAYERS = "table#players"
+    REGIONS = [SoupStrainer('table', id='players')]
+    ROWS_SELECTOR = "table#players tbody tr"
+    STREAM_TABLE_ID = 'players'
+    STREAM_SECTION = 'tbody'
+    FIELDS = {
+        'player_id': Field('player', 'get_player_slug', LINK),
+        'name': Field('player', 'get_name'),
+        'from_year': Field('year_min', 'text_to_int'),
+        'to_year': Field('year_max', 'text_to_int'),
+        'position': 'pos',
+        'height': 'height',
+        'weight': Field('weight', 'text_to_int'),
+        'birthday': Field('birth_date', 'birth_date_text_to_date'),
+    }
+
+    HALL_OF_FAME_MARK = '*'
+
+    INSTRUMENTED_METHODS = dict(BasePageParser.INSTRUMENTED_METHODS,
+                                text_to_int='convert',
+                                birth_date_text_to_date='convert')
+
+    def __init__(self, html, parser='html.parser', records=False):
+        self.data = []
+        self.html = html
+        self.parser = parser
+        self.records = records
+
+    def get_name(self, text):
+        return text.rstrip(self.HALL_OF_FAME_MARK)
+
+    def text_to_int(self, text):
+        """Returns None for an empty cell."""
+        return int(text) if text else None
+
+    def birth_date_text_to_date(self, text):
+        """Converts text like 'July 20, 1996' to a python date object, or
+        an empty cell to None.
+        """
+        return parse_birth_date(text) if text else None
+
+    def get_row_data(self, row):
+        if row.get('class') is not None and 'thead' in row.get('class'):
+            return None
+        return self.make_record(PlayerIndexRow, self.read_fields(
+            self.get_cells_by_stat(row), self.get_plan()))
+
+    def handle_data(self):
+        self.data.extend(self.iter_rows())
+
+    def get_data(self):
+        if len(self.data) == 0:
+            self.handle_data()
+        return self.data
@@ -2,6 +2,7 @@
 It returns the key player information as a dictionary, in the format
 
     {
+        'player_id': '<slug>',
         'name': '<name>',
         'height': <height>,
         'weight': <weight>,
@@ -9,17 +10,25 @@ It returns the key player information as a dictionary, in the format
         'birthplace': '<birthplace>',
         'nationality': '<nationality>'
     }
+
+`player_id` is the slug of the page's canonical url, e.g. 'simmobe01'.
 """
 
-from bs4 import BeautifulSoup
+from bs4 import SoupStrainer
 
-import re
+from .base_page_parser import BasePageParser
+from .dates import parse_iso_date
+from .records import Player
 
-from datetime import datetime
+import re
 
-class PlayerPageParser:
+class PlayerPageParser(BasePageParser):
 
     DIV_PLAYER_META   = 'div#meta'
+    REGIONS           = [SoupStrainer('div', id='meta'),
+                         SoupStrainer('link', rel='canonical')]
+    LINK_TAG          = 'link'
+    CANONICAL_REL     = 'canonical'
     NAME_FIELD        = ' '.join([DIV_PLAYER_META, 'h1[itemprop=name]'])
     HEIGHT_FIELD      = ' '.join([DIV_PLAYER_META, 'span[itemprop=height]'])
     WEIGHT_FIELD      = ' '.join([DIV_PLAYER_META, 'span[itemprop=weight]'])
@@ -28,26 +37,33 @@ class PlayerPageParser:
     BIRTHPLACE_FIELD  = ' '.join([DIV_PLAYER_META, 'span[itemprop=birthPlace]'])
     NATIONALITY_FIELD = ' '.join([DIV_PLAYER_META, 'span.f-i'])
 
-    DATE_FORMAT       = '%Y-%m-%d'
-
     RE_WEIGHT         = re.compile(r'(\d+)(lb|kg)')
     LBtoKG            = 2.20462
     LB                = 'lb'
     KG                = 'kg'
 
-    def __init__(self, html, parser='html.parser'):
+    # 2: the data has the page's `player_id`
+    SCHEMA_VERSION = 2
+
+    INSTRUMENTED_METHODS = dict(BasePageParser.INSTRUMENTED_METHODS,
+                                birthday_text_to_date='convert',
+                                weight_text_to_int='convert')
+
+    def __init__(self, html, parser='html.parser', records=False):
         self.data = dict() 
         self.html = html
         self.parser = parser
+        self.records = records
 
     def birthday_text_to_date(self, text):
-        """Converts text from the DATE_FORMAT to a python date object."""
-        return datetime.strptime(text, self.DATE_FORMAT).date()
+        """Converts text like '1996-07-20' to a python date object."""
+        return parse_iso_date(text)
 
     def weight_text_to_int(self, text):
         try:
             weight, unit = self.RE_WEIGHT.match(text).groups()
         except AttributeError:
+            self.count_failure()
             print("Weight or unit of measure not found. Is '{}' "
                   "in the correct format?".format(text))
             return None
@@ -57,22 +73,32 @@ class PlayerPageParser:
             if unit in self.KG:
                 return round(int(weight) * self.LBtoKG)
 
+    def get_canonical_link(self, handler):
+        for link in handler.find_all(self.LINK_TAG):
+            if self.CANONICAL_REL in link.get('rel', []):
+                return link
+        return None
+
     def handle_data(self):
         """Each bs4 CSS select query returns a list, so data must be retrieved 
         by accessing the first entry. Birthday is a more complicated field that
         is best crawled by accessing the 'data-birth' attribute.
         """
-        handler = BeautifulSoup(self.html, self.parser)
+        handler = self.get_handler()
+        data = dict()
 
-        self.data['name'] = handler.select(self.NAME_FIELD)[0].text
-        self.data['height'] = handler.select(self.HEIGHT_FIELD)[0].text
-        self.data['weight'] = self.weight_text_to_int(
+        data['player_id'] = self.get_player_slug(
+            self.get_canonical_link(handler))
+        data['name'] = handler.select(self.NAME_FIELD)[0].text
+        data['height'] = handler.select(self.HEIGHT_FIELD)[0].text
+        data['weight'] = self.weight_text_to_int(
             handler.select(self.WEIGHT_FIELD)[0].text)
-        self.data['birthday'] = self.birthday_text_to_date(
+        data['birthday'] = self.birthday_text_to_date(
             handler.select(self.BIRTHDAY_FIELD)[0][self.BIRTHDAY_ATTR])
-        self.data['birthplace'] = handler.select(self.BIRTHPLACE_FIELD)[0].text
-        self.data['nationality'] = handler.select(
+        data['birthplace'] = handler.select(self.BIRTHPLACE_FIELD)[0].text
+        data['nationality'] = handler.select(
             self.NATIONALITY_FIELD)[0].text
+        self.data = self.make_record(Player, data)
 
     def get_data(self):
         if len(self.data) == 0:
@@ -0,0 +1,133 @@
+"""Slotted record types for parser rows, returned by the parsers when they
+are constructed with `records=True`.
+
+A record stores its fields in `__slots__`, so it has no per-row dict and
+no copy of the key strings. It still reads like the dict it replaces:
+
+    row['pts'], row.get('pts'), row.keys(), dict(row.items())
+
+and compares equal to a dict with the same items. `as_dict()` returns
+the dict the parser would have built.
+"""
+
+class Record:
+
+    __slots__ = ()
+
+    def __init__(self, *args, **kwargs):
+        if len(args) > len(self.__slots__):
+            raise TypeError("{} takes {} fields but {} were given".format(
+                type(self).__name__, len(self.__slots__), len(args)))
+        for field, value in zip(self.__slots__, args):
+            setattr(self, field, value)
+        for field, value in kwargs.items():
+            setattr(self, field, value)
+        for field in self.__slots__[len(args):]:
+            if field not in kwargs:
+                raise TypeError("{} is missing field '{}'".format(
+                    type(self).__name__, field))
+
+    def keys(self):
+        return self.__slots__
+
+    def values(self):
+        return [getattr(self, field) for field in self.__slots__]
+
+    def items(self):
+        return [(field, getattr(self, field)) for field in self.__slots__]
+
+    def as_dict(self):
+        return dict(self.items())
+
+    def __getitem__(self, key):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key, value):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def get(self, key, default=None):
+        if key not in self.__slots__:
+            return default
+        return getattr(self, key)
+
+    def __contains__(self, key):
+        return key in self.__slots__
+
+    def __iter__(self):
+        return iter(self.__slots__)
+
+    def __len__(self):
+        return len(self.__slots__)
+
+    def __eq__(self, other):
+        if isinstance(other, Record):
+            return type(self) is type(other) and self.items() == other.items()
+        if isinstance(other, dict):
+            return self.as_dict() == other
+        return NotImplemented
+
+    __hash__ = None
+
+    def __getstate__(self):
+        return self.values()
+
+    def __setstate__(self, state):
+        for field, value in zip(self.__slots__, state):
+            setattr(self, field, value)
+
+    def __repr__(self):
+        return '{}({})'.format(type(self).__name__, ', '.join(
+            '{}={!r}'.format(field, value) for field, value in self.items()))
+
+class Season(Record):
+
+    __slots__ = ('league', 'start_year', 'end_year', 'url')
+
+class Team(Record):
+
+    __slots__ = ('name', 'abbreviation', 'status', 'url')
+
+class Player(Record):
+
+    __slots__ = ('player_id', 'name', 'height', 'weight', 'birthday',
+                 'birthplace', 'nationality')
+
+class PlayerIndexRow(Record):
+
+    __slots__ = ('player_id', 'name', 'from_year', 'to_year', 'position',
+                 'height', 'weight', 'birthday')
+
+class Game(Record):
+
+    __slots__ = ('game_date', 'game_start_time', 'visitor_team_name',
+                 'visitor_team_id', 'visitor_pts', 'home_team_name',
+                 'home_team_id', 'home_pts', 'box_score_text', 'overtimes',
+                 'attendance', 'type')
+
+BASIC_BOX_SCORE_STATS = (
+    'mp', 'fg', 'fga', 'fg_pct', 'fg3', 'fg3a', 'fg3_pct', 'ft', 'fta',
+    'ft_pct', 'orb', 'drb', 'trb', 'ast', 'stl', 'blk', 'tov', 'pf',
+    'pts', 'plus_minus',
+)
+
+ADVANCED_BOX_SCORE_STATS = (
+    'mp', 'ts_pct', 'efg_pct', 'fg3a_per_fga_pct', 'fta_per_fga_pct',
+    'orb_pct', 'drb_pct', 'trb_pct', 'ast_pct', 'stl_pct', 'blk_pct',
+    'tov_pct', 'usg_pct', 'off_rtg', 'def_rtg',
+)
+
+class BasicBoxScoreRow(Record):
+
+    __slots__ = ('player', 'player_id', 'is_starter') + BASIC_BOX_SCORE_STATS
+
+class AdvancedBoxScoreRow(Record):
+
+    __slots__ = ('player', 'player_id') + ADVANCED_BOX_SCORE_STATS
+
+class DidNotPlayRow(Record):
+
+    __slots__ = ('player', 'player_id', 'did_not_play')
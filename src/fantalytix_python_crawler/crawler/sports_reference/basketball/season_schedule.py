@@ -0,0 +1,162 @@
+"""Assembles a whole season's schedule from its monthly schedule pages.
+
+basketball-reference splits a season's schedule into one page per month.
+`SeasonScheduleAssembler` fetches the first month that exists, reads the
+urls of every month from its filter links, then fetches and parses the
+other months concurrently, each parse running in a thread while the
+remaining pages download.
+
+The months are merged in date order into one SeasonSchedule. A game
+listed on more than one page is kept once, as first listed. The header
+row that separates the playoffs only appears on the month the playoffs
+start, so every game of the months after it is tagged as a playoff game
+as well. `tag_month` does the same for one month at a time, as the
+crawl pipeline reads them.
+
+    async with Fetcher(rate=0.3) as fetcher:
+        schedule = await SeasonScheduleAssembler(fetcher).assemble(
+            'NBA', 2019)
+    schedule.get_games_on(date(2018, 10, 16))
+    schedule.get_team_games('boston celtics')
+"""
+
+import asyncio
+
+from collections import defaultdict
+
+from operator import itemgetter
+
+from urllib.parse import urljoin, urlsplit
+
+from fantalytix_python_crawler.crawler.fetcher import FetchError
+from fantalytix_python_crawler.crawler.sports_reference.basketball\
+    .settings import BASE_URL, SEASON_SCHEDULE_URL, SEASON_MONTHS
+
+from .season_schedule_page_parser import SeasonSchedulePageParser
+
+PLAYOFFS_GAME = SeasonSchedulePageParser.PLAYOFFS_GAME
+
+def get_game_key(game):
+    """A team plays at most one home game a day."""
+    return game['game_date'], game['home_team_name']
+
+def ends_in_playoffs(games):
+    """Whether a month page's games end in the playoffs."""
+    return bool(games) and games[-1]['type'] == PLAYOFFS_GAME
+
+def tag_month(games, playoffs):
+    """Returns copies of a month's games, every one tagged as a playoff
+    game if the playoffs started in an earlier month.
+    """
+    games = [dict(game) for game in games]
+    if playoffs:
+        for game in games:
+            game['type'] = PLAYOFFS_GAME
+    return games
+
+def merge_months(months):
+    """Merges `(games, game_type)` pairs, one per month page in season
+    order with the game type the page ended on, into one list of games
+    in date order. The games are copies; the pairs are not changed.
+    """
+    games = dict()
+    playoffs = False
+    for month_games, game_type in months:
+        for game in tag_month(month_games, playoffs):
+            games.setdefault(get_game_key(game), game)
+        playoffs = playoffs or game_type == PLAYOFFS_GAME
+    return sorted(games.values(), key=itemgetter('game_date'))
+
+class SeasonSchedule:
+    """A season's games in date order, indexed by date and by team."""
+
+    def __init__(self, games):
+        self.games = games
+        self.by_date = defaultdict(list)
+        self.by_team = defaultdict(list)
+        for game in games:
+            self.by_date[game['game_date']].append(game)
+            self.by_team[game['visitor_team_name']].append(game)
+            self.by_team[game['home_team_name']].append(game)
+
+    def __len__(self):
+        return len(self.games)
+
+    def __iter__(self):
+        return iter(self.games)
+
+    def get_dates(self):
+        return list(self.by_date)
+
+    def get_teams(self):
+        return sorted(self.by_team)
+
+    def get_games_on(self, day):
+        return self.by_date.get(day, [])
+
+    def get_team_games(self, team):
+        """`team` is the name as the parser returns it, in lower case."""
+        return self.by_team.get(team.lower(), [])
+
+class SeasonScheduleAssembler:
+
+    NOT_FOUND = 404
+
+    def __init__(self, fetcher, parser='html.parser', base_url=BASE_URL,
+                 months=SEASON_MONTHS):
+        self.fetcher = fetcher
+        self.parser = parser
+        self.base_url = base_url
+        self.months = months
+
+    def get_url(self, url):
+        """Rebuilds a page url on `base_url`."""
+        return urljoin(self.base_url, urlsplit(url).path)
+
+    async def fetch_or_none(self, url):
+        """Returns None for a month without a page."""
+        try:
+            return await self.fetcher.fetch(url)
+        except FetchError as err:
+            if err.status != self.NOT_FOUND:
+                raise
+            return None
+
+    async def fetch_first_month(self, league, end_year):
+        """Returns the url and html of the first of `months` that has a
+        page, or `(None, None)` if none has.
+        """
+        for month in self.months:
+            url = urljoin(self.base_url, SEASON_SCHEDULE_URL.format(
+                league=league, end_year=end_year, month=month))
+            html = await self.fetch_or_none(url)
+            if html is not None:
+                return url, html
+        return None, None
+
+    def parse_month(self, html):
+        parser = SeasonSchedulePageParser(html, self.parser)
+        return parser.get_data(), parser.game_type
+
+    def get_month_urls(self, url, html):
+        urls = [self.get_url(month_url) for month_url in
+                SeasonSchedulePageParser(html, self.parser).get_month_urls()]
+        if url not in urls:
+            urls.insert(0, url)
+        return list(dict.fromkeys(urls))
+
+    async def load_month(self, url, first_url, first_html):
+        html = first_html if url == first_url else \
+            await self.fetch_or_none(url)
+        if html is None:
+            return [], None
+        return await asyncio.to_thread(self.parse_month, html)
+
+    async def assemble(self, league, end_year):
+        first_url, first_html = await self.fetch_first_month(league, end_year)
+        if first_url is None:
+            return SeasonSchedule([])
+        months = await asyncio.gather(*(
+            self.load_month(url, first_url, first_html)
+            for url in self.get_month_urls(first_url, first_html)))
+        return SeasonSchedule(merge_months(months))
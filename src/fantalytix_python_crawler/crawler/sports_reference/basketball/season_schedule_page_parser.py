@@ -1,47 +1,83 @@
 """This parser processes the basketball-reference season schedules page. 
-It returns an array of dictionaries, one per game day.
+It returns an array of dictionaries, one per game day. `iter_rows` 
+yields the games one at a time as their rows are read, and the page can 
+be given as a stream (see `BasePageParser`).
+
+The fields of a game are declared in FIELDS, keyed by output name, with 
+the `data-stat` of their cell and their converters (see `field_schema`). 
+Dates and start times are converted by `dates`, which memoizes them, as 
+a season repeats the same few.
+The teams' abbreviations, e.g. 'BOS', are read from their links as 
+`visitor_team_id` and `home_team_id`.
+
+A season's schedule is split into one page per month. `get_month_urls` 
+returns the urls of all of them from the month filter links at the top 
+of the page, and `get_current_month_url` the url of the month shown; 
+`SeasonScheduleAssembler` puts the months back together.
 """
 
-from bs4 import BeautifulSoup
+from bs4 import SoupStrainer
 
 from fantalytix_python_crawler.crawler.sports_reference.basketball\
     .settings import BASE_URL
 
-from urllib.parse import urljoin
+from .base_page_parser import BasePageParser
+from .dates import parse_game_date, parse_game_time
+from .field_schema import LINK, Field
+from .parse_engines import has_class, make_handler
+from .records import Game
 
-from datetime import datetime, date, time
+from urllib.parse import urljoin
 
-class SeasonSchedulePageParser:
+class SeasonSchedulePageParser(BasePageParser):
 
     TABLE_SCHEDULE = "table#schedule"
+    REGIONS = [SoupStrainer('table', id='schedule')]
     SEASON_SCHEDULE_TR = "table#schedule tbody tr"
-    DATE_FIELD = "th[data-stat=date_game]"
-    TIME_FIELD = "td[data-stat=game_start_time]"
-    VISITOR_TEAM_FIELD = "td[data-stat=visitor_team_name]"
-    VISITOR_PTS_FIELD = "td[data-stat=visitor_pts]"
-    HOME_TEAM_FIELD = "td[data-stat=home_team_name]"
-    HOME_PTS_FIELD = "td[data-stat=home_pts]"
-    BOX_SCORE_FIELD = "td[data-stat=box_score_text]"
-    OVERTIMES_FIELD = "td[data-stat=overtimes]"
-    ATTENDANCE_FIELD = "td[data-stat=attendance]"
+    ROWS_SELECTOR = SEASON_SCHEDULE_TR
+    STREAM_TABLE_ID = 'schedule'
+    STREAM_SECTION = 'tbody'
+    MONTH_LINKS = "div.filter a"
+    CURRENT_MONTH_LINK = "div.filter div.current a"
+    MONTH_REGION = SoupStrainer('div', class_=has_class('filter'))
+    FIELDS = {
+        'game_date': Field('date_game', 'game_date_text_to_date'),
+        'game_start_time': Field('game_start_time',
+                                 (str.lower, 'game_time_text_to_date')),
+        'visitor_team_name': Field('visitor_team_name', str.lower),
+        'visitor_team_id': Field('visitor_team_name', 'get_team_slug', LINK),
+        'visitor_pts': Field('visitor_pts', 'text_to_int'),
+        'home_team_name': Field('home_team_name', str.lower),
+        'home_team_id': Field('home_team_name', 'get_team_slug', LINK),
+        'home_pts': Field('home_pts', 'text_to_int'),
+        'box_score_text': Field('box_score_text',
+                                'get_abs_href_or_empty_str', LINK),
+        'overtimes': Field('overtimes', str.lower),
+        'attendance': Field('attendance', 'text_to_int'),
+    }
 
     COMMA            = ','
-    GAME_DATE_FORMAT = '%a, %b %d, %Y'    #Tue, Oct 16, 2018
-    GAME_TIME_FORMAT = '%I:%M%p'          #8:00p
-    GAME_TIME_AM     = 'a'
-    GAME_TIME_PM     = 'p'
-    DATETIME_AM      = 'AM'
-    DATETIME_PM      = 'PM'
 
     EMPTY_STR_AS_INT = -1
     REGULAR_GAME     = 'regular'
     SCHEDULED_GAME   = 'scheduled'
     PLAYOFFS_GAME    = 'playoffs'
 
-    def __init__(self, html, parser='html.parser'):
+    # 2: games have the teams' abbreviations as `visitor_team_id` and 
+    # `home_team_id`
+    SCHEMA_VERSION = 2
+
+    INSTRUMENTED_METHODS = dict(BasePageParser.INSTRUMENTED_METHODS,
+                                text_to_int='convert',
+                                get_abs_href_or_empty_str='convert',
+                                game_date_text_to_date='convert',
+                                game_time_text_to_date='convert')
+
+    def __init__(self, html, parser='html.parser', records=False):
         self.data = []
         self.html = html
         self.parser = parser
+        self.records = records
 
     def text_to_int(self, text):
         """Games not yet played have an empty string for points, so 
@@ -61,46 +97,54 @@ class SeasonSchedulePageParser:
             return ""
 
     def game_date_text_to_date(self, text):
-        """Converts text from the GAME_DATE_FORMAT to a python date object."""
-        return datetime.strptime(text, self.GAME_DATE_FORMAT).date()
+        """Converts text like 'Tue, Oct 16, 2018' to a python date object."""
+        return parse_game_date(text)
 
     def game_time_text_to_date(self, text):
-        """Converts text from the GAME_TIME to a python time object."""
-        if text[-1] is self.GAME_TIME_AM:
-            text = text.replace(self.GAME_TIME_AM, self.DATETIME_AM)
-        elif text[-1] is self.GAME_TIME_PM:
-            text = text.replace(self.GAME_TIME_PM, self.DATETIME_PM)
-        return datetime.strptime(text, self.GAME_TIME_FORMAT).time()
+        """Converts text like '8:00p' to a python time object."""
+        return parse_game_time(text)
+
+    def get_month_handler(self):
+        """The month filter links, parsed the first time they are read."""
+        try:
+            return self._month_handler
+        except AttributeError:
+            self._month_handler = make_handler(self.html, self.parser, 
+                                               self.MONTH_REGION)
+            return self._month_handler
+
+    def get_month_urls(self):
+        """Returns the absolute urls of every month of the season, in the 
+        order the page lists them, this page's month included.
+        """
+        return [urljoin(BASE_URL, link.get('href'))
+                for link in self.get_month_handler().select(self.MONTH_LINKS)]
+
+    def get_current_month_url(self):
+        """Returns the absolute url of the month this page shows, or None 
+        if the filter does not mark one.
+        """
+        for link in self.get_month_handler().select(self.CURRENT_MONTH_LINK):
+            return urljoin(BASE_URL, link.get('href'))
+        return None
+
+    def start_rows(self):
+        self.game_type = self.REGULAR_GAME
+
+    def get_row_data(self, row):
+        """The header row repeated above the playoff games switches the 
+        game type of the rows after it.
+        """
+        if row.get('class') is not None and 'thead' in row.get('class'):
+            self.game_type = self.PLAYOFFS_GAME
+            return None
+        game = self.read_fields(self.get_cells_by_stat(row), 
+                                self.get_plan())
+        game['type'] = self.game_type
+        return self.make_record(Game, game)
 
     def handle_data(self):
-        handler = BeautifulSoup(self.html, self.parser)
-        season_schedule_rows = handler.select(self.SEASON_SCHEDULE_TR)
-        game_type = self.REGULAR_GAME
-        for row in season_schedule_rows:
-            if row.get('class') is not None and 'thead' in row.get('class'):
-                game_type = self.PLAYOFFS_GAME
-                continue
-            self.data.append({
-                'game_date': self.game_date_text_to_date(
-                    row.select(self.DATE_FIELD)[0].text),
-                'game_start_time': self.game_time_text_to_date(
-                    row.select(self.TIME_FIELD)[0].text.lower()),
-                'visitor_team_name': row.select(self.VISITOR_TEAM_FIELD)[0]\
-                    .text.lower(),
-                'visitor_pts': self.text_to_int(
-                    row.select(self.VISITOR_PTS_FIELD)[0].text),
-                'home_team_name': row.select(self.HOME_TEAM_FIELD)[0]\
-                    .text.lower(),
-                'home_pts': self.text_to_int(
-                    row.select(self.HOME_PTS_FIELD)[0].text),
-                'box_score_text': self.get_abs_href_or_empty_str(row.select(
-                    self.BOX_SCORE_FIELD)[0].a),
-                'overtimes': row.select(self.OVERTIMES_FIELD)[0]\
-                    .text.lower(),
-                'attendance': self.text_to_int(
-                    row.select(self.ATTENDANCE_FIELD)[0].text),
-                'type': game_type
-            })
+        self.data.extend(self.iter_rows())
 
     def get_data(self):
         if len(self.data) == 0:
@@ -6,14 +6,23 @@ Getting team names and abbreviations from the each year's season summary
 page is the most accurate source. Other pages such as 
 basketball-reference.com/teams/ list the name of all teams past and present, 
 but only has the abbreviation for current teams.
+
+The per game team and opponent stats tables are commented out in the 
+page source. `get_team_stats` and `get_opponent_stats` parse only those 
+comments, on demand, and return one dictionary per team keyed by the 
+`data-stat` attribute of each column plus the team `abbreviation`.
+
+`iter_rows` yields the teams one at a time as their rows are read; 
+`get_data` collects them.
 """
 
-from bs4 import BeautifulSoup
+from bs4 import SoupStrainer
 
 from fantalytix_python_crawler.crawler.sports_reference.basketball\
     .settings import BASE_URL
 
 from .base_page_parser import BasePageParser
+from .field_schema import LINK, Field
 
 from urllib.parse import urljoin
 
@@ -25,32 +34,83 @@ class SeasonSummaryPageParser(BasePageParser):
 
     EAST_CONF_TABLE_ROWS = "#all_confs_standings_E table tbody tr"
     WEST_CONF_TABLE_ROWS = "#all_confs_standings_W table tbody tr"
+    REGIONS = [
+        SoupStrainer(id='all_confs_standings_E'),
+        SoupStrainer(id='all_confs_standings_W'),
+    ]
+
+    TEAM_NAME_STAT = 'team_name'
+    FIELDS = {
+        'team_name': Field(TEAM_NAME_STAT, 'get_team_name', LINK),
+        'rel_href': Field(TEAM_NAME_STAT, 'get_href', LINK),
+    }
 
-    TEAM_NAME_URL_FIELD = "th[data-stat=team_name] a"
+    TABLE_TEAM_STATS = "team-stats-per_game"
+    TABLE_OPPONENT_STATS = "opponent-stats-per_game"
+
+    INSTRUMENTED_METHODS = dict(BasePageParser.INSTRUMENTED_METHODS,
+                                process_stats_table='rows')
 
     def __init__(self, html, parser='html.parser'):
         self.data = []
         self.html = html
         self.parser = parser
 
-    def process_table_rows(self, team_rows):
+    def get_team_name(self, link):
+        return link.text.lower()
+
+    def get_href(self, link):
+        return link.get('href')
+
+    def iter_table_rows(self, team_rows):
+        plan = self.get_plan()
         for row in team_rows:
-            team_name_field = row.select(self.TEAM_NAME_URL_FIELD)[0]
-            rel_href = team_name_field.get('href')
+            fields = self.read_fields(self.get_cells_by_stat(row), plan)
+            rel_href = fields['rel_href']
             data = self.get_abbreviation_and_year_from_url(rel_href)
 
-            self.data.append({
-                'team_name': team_name_field.text.lower(),
+            yield {
+                'team_name': fields['team_name'],
                 'team_season_url': urljoin(BASE_URL, rel_href), 
                 'abbreviation': data['abbreviation'],
                 'end_year': data['end_year']
-            })
+            }
 
-    def handle_data(self):
+    def iter_rows(self):
         """The season summary table splits the team names into two tables."""
-        handler = BeautifulSoup(self.html, self.parser)
-        self.process_table_rows(handler.select(self.EAST_CONF_TABLE_ROWS))
-        self.process_table_rows(handler.select(self.WEST_CONF_TABLE_ROWS))
+        handler = self.get_handler()
+        yield from self.iter_table_rows(
+            handler.select(self.EAST_CONF_TABLE_ROWS))
+        yield from self.iter_table_rows(
+            handler.select(self.WEST_CONF_TABLE_ROWS))
+
+    def handle_data(self):
+        self.data.extend(self.iter_rows())
+
+    def process_stats_table(self, table_id):
+        """Rows without a team link, such as the league average, are 
+        left out.
+        """
+        table = self.get_commented_table(table_id)
+        if table is None:
+            return []
+        data = []
+        for row in table.tbody.find_all('tr'):
+            cells = self.get_cells_by_stat(row)
+            team_name = cells.get(self.TEAM_NAME_STAT)
+            if team_name is None or team_name.a is None:
+                continue
+            team = {stat: cell.text for stat, cell in cells.items()}
+            team['abbreviation'] = self.get_abbreviation_from_url(
+                team_name.a.get('href'))
+            data.append(team)
+        return data
+
+    def get_team_stats(self):
+        return self.process_stats_table(self.TABLE_TEAM_STATS)
+
+    def get_opponent_stats(self):
+        return self.process_stats_table(self.TABLE_OPPONENT_STATS)
 
     def get_data(self):
         if len(self.data) == 0:
@@ -1,12 +1,23 @@
 BASE_URL = 'https://www.basketball-reference.com'
 
 PLAYER_URL = '/players'
+PLAYER_PAGE_URL = '/players/{letter}/{player_id}.html'
 LEAGUES_URL = '/leagues'
 TEAMS_URL = '/teams'
 SEASON_SUMMARY_URL = '/leagues/{league}_{end_year}.html'
+SEASON_GAMES_URL = '/leagues/{league}_{end_year}_games.html'
 SEASON_SCHEDULE_URL = '/leagues/{league}_{end_year}_games-{month}.html'
 BOXSCORE_URL = ('/boxscores'
                 '/{YYYYMMDD}'
                 '0'
                 '{abbreviation}'
                 '.html')
+
+SEASON_MONTHS = ['october', 'november', 'december', 'january', 'february',
+                 'march', 'april', 'may', 'june']
+# the month names of schedule urls, January first
+MONTH_NAMES = ['january', 'february', 'march', 'april', 'may', 'june', 'july',
+               'august', 'september', 'october', 'november', 'december']
+
+# sports-reference blocks clients that go faster than this
+REQUESTS_PER_MINUTE = 20
@@ -15,43 +15,49 @@ Key data is found using the CSS select statement
 which contains the relative hrefs in the format `/teams/ATL/`.
 """
 
-from bs4 import BeautifulSoup
+from bs4 import SoupStrainer
 
 from fantalytix_python_crawler.crawler.sports_reference.basketball\
     .settings import BASE_URL
 
+from .base_page_parser import BasePageParser
+from .records import Team
+
 from urllib.parse import urljoin
 
 import re
 
-class TeamsPageParser:
+class TeamsPageParser(BasePageParser):
 
     TEAM_TAG = '#all_teams_active tr.full_table th[data-stat=franch_name] a'
+    REGIONS = [SoupStrainer(id='all_teams_active')]
     RE_TEAM_URL = re.compile(r'/teams/([A-Z]{3})/')
 
-    def __init__(self, html, parser='html.parser'):
+    def __init__(self, html, parser='html.parser', records=False):
         self.data = []
         self.html = html
         self.parser = parser
+        self.records = records
 
     def handle_data(self):
-        handler = BeautifulSoup(self.html, self.parser)
+        handler = self.get_handler()
         team_links = handler.select(self.TEAM_TAG)
         for link in team_links:
             rel_href = link.get('href')
             try:
                 abbreviation = self.RE_TEAM_URL.match(rel_href).group(1)
             except AttributeError:
+                self.count_failure()
                 print("No relative href found. Is '{}'"
                       "in the correct format?".format(rel_href))
                 pass
             else:
-                self.data.append({
+                self.data.append(self.make_record(Team, {
                     'name': link.text.lower(),
                     'abbreviation': abbreviation,
                     'status': 'active',
                     'url': urljoin(BASE_URL, rel_href)
-                })
+                }))
 
     def get_data(self):
         if len(self.data) == 0:
@@ -0,0 +1,142 @@
+"""Converts boxscore stat text to numbers a whole column at a time.
+
+    counts       '12', '+5'   int
+    percentages  '.571', '9.8' float, as shown on the page
+    ratings      '131'        float
+    mp           '40:09'      int seconds
+
+Each column is converted with `map` over builtins into an `array`, so
+there is no Python-level call per cell. The mapped values are listed
+before building the array, which is faster than extending an array from
+an iterator.
+
+`convert_column` marks a blank cell with NaN in float columns and
+NULL_INT in int columns; in typed rows it is None. Players who did not
+play have no stats and are left out of the columns.
+
+The columns of `get_stat_columns` are meant to be aggregated directly,
+so a blank in an int column is 0 there instead of NULL_INT, and
+`columns[NULLS][stat]` is a mask with 1 for each blank. `sum()` of an
+int column is then the total of the cells that have a value; anything
+that counts values, such as a mean, has to leave out the masked ones:
+
+    values = len(column) - sum(columns[NULLS][stat])
+    mean = sum(column) / values
+
+Blanks stay NaN in float columns, so skip them, e.g. with
+`[value for value in column if not math.isnan(value)]`.
+"""
+
+import math
+
+from array import array
+
+from itertools import repeat
+
+from operator import add, mul
+
+INT = 'q'
+FLOAT = 'd'
+SECONDS = 'seconds'
+
+NULL_INT = -2 ** 63
+NULL_FLOAT = math.nan
+
+DID_NOT_PLAY = 'did_not_play'
+PLAYER = 'player'
+NULLS = 'nulls'
+TIME_SEPARATOR = ':'
+
+STAT_TYPES = {
+    'mp': SECONDS,
+    'fg': INT, 'fga': INT, 'fg3': INT, 'fg3a': INT, 'ft': INT, 'fta': INT,
+    'orb': INT, 'drb': INT, 'trb': INT, 'ast': INT, 'stl': INT, 'blk': INT,
+    'tov': INT, 'pf': INT, 'pts': INT, 'plus_minus': INT,
+    'fg_pct': FLOAT, 'fg3_pct': FLOAT, 'ft_pct': FLOAT, 'ts_pct': FLOAT,
+    'efg_pct': FLOAT, 'fg3a_per_fga_pct': FLOAT, 'fta_per_fga_pct': FLOAT,
+    'orb_pct': FLOAT, 'drb_pct': FLOAT, 'trb_pct': FLOAT, 'ast_pct': FLOAT,
+    'stl_pct': FLOAT, 'blk_pct': FLOAT, 'tov_pct': FLOAT, 'usg_pct': FLOAT,
+    'off_rtg': FLOAT, 'def_rtg': FLOAT,
+}
+
+# `BLANK_AS[type].get(text, text)` swaps a blank cell for text that
+# parses to the null value
+BLANK_AS = {
+    INT: {'': str(NULL_INT)},
+    FLOAT: {'': 'nan'},
+}
+# Blank minutes keep the place of their cell in the joined text
+BLANK_TIME = '0:0'
+
+def convert_seconds(texts):
+    """Converts 'mm:ss' texts to int seconds. Blank cells are found
+    before converting and set to NULL_INT.
+    """
+    texts = list(texts)
+    blanks = [index for index, text in enumerate(texts) if not text]
+    if blanks:
+        texts = [text or BLANK_TIME for text in texts]
+    parts = list(map(int, TIME_SEPARATOR.join(texts).split(TIME_SEPARATOR)))
+    seconds = array(INT, list(map(add, map(mul, parts[0::2], repeat(60)),
+                                  parts[1::2])))
+    for index in blanks:
+        seconds[index] = NULL_INT
+    return seconds
+
+def convert_column(stat, texts):
+    """Returns the `texts` of one stat column as an array."""
+    stat_type = STAT_TYPES[stat]
+    if stat_type == SECONDS:
+        return convert_seconds(texts)
+    texts = map(BLANK_AS[stat_type].get, texts, texts)
+    if stat_type == INT:
+        return array(INT, list(map(int, texts)))
+    return array(FLOAT, list(map(float, texts)))
+
+def split_nulls(values):
+    """Sets the NULL_INT values of an int column to 0 and returns a mask
+    with 1 where they were.
+    """
+    mask = bytearray(len(values))
+    if NULL_INT in values:
+        for index, value in enumerate(values):
+            if value == NULL_INT:
+                mask[index] = 1
+                values[index] = 0
+    return mask
+
+def get_stat_columns(rows, stats):
+    """Returns the columns of the rows of players who played,
+
+        {'player': [...], '<stat>': array, ..., NULLS: {'<stat>': mask}}
+
+    with a null mask for each int stat.
+    """
+    played = [row for row in rows if DID_NOT_PLAY not in row]
+    columns = {PLAYER: [row[PLAYER] for row in played]}
+    nulls = dict()
+    for stat in stats:
+        columns[stat] = convert_column(stat, [row[stat] for row in played])
+        if columns[stat].typecode == INT:
+            nulls[stat] = split_nulls(columns[stat])
+    columns[NULLS] = nulls
+    return columns
+
+def to_python(value, stat_type):
+    if stat_type == FLOAT:
+        return None if math.isnan(value) else value
+    return None if value == NULL_INT else value
+
+def set_typed_values(rows, columns, stats):
+    """Replaces the stat text in `rows` with the values in `columns`, as
+    returned by `get_stat_columns`.
+    """
+    played = [row for row in rows if DID_NOT_PLAY not in row]
+    nulls = columns[NULLS]
+    for stat in stats:
+        if stat in nulls:
+            for row, value, null in zip(played, columns[stat], nulls[stat]):
+                row[stat] = None if null else value
+        else:
+            for row, value in zip(played, columns[stat]):
+                row[stat] = to_python(value, FLOAT)
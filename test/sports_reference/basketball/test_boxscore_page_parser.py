@@ -1,8 +1,10 @@
 import unittest
 
-from datetime import date
+import io
+
+from bs4 import BeautifulSoup
 
-from urllib.request import urlopen
+from datetime import date
 
 from urllib.parse import urljoin
 
@@ -11,6 +13,8 @@ from fantalytix_python_crawler.crawler.sports_reference.basketball\
 from fantalytix_python_crawler.crawler.sports_reference.basketball\
     .settings import (BASE_URL, BOXSCORE_URL)
 
+from .fixtures import load_fixture, load_page
+
 class TestBoxscorePageParser(unittest.TestCase):
 
     def setUp(self):
@@ -26,16 +30,12 @@ class TestBoxscorePageParser(unittest.TestCase):
              '/201810310GSW.html')
         )
 
-    def test_parser(self):
-        abs_url = urljoin(BASE_URL, BOXSCORE_URL.format(**self.url_params))
-        with urlopen(abs_url) as resp:
-            page = resp.read().decode('utf-8')
-        parser = BoxscorePageParser(page)
-
+    def assert_boxscore_data(self, parser):
         self.assertEqual(
             parser.get_data()['home_team']['basic'][0], 
             {
                 'player': 'Kevin Durant',
+                'player_id': 'duranke01',
                 'is_starter': True,
                 'mp': '40:09',
                 'fg': '10',
@@ -64,6 +64,7 @@ class TestBoxscorePageParser(unittest.TestCase):
             parser.get_data()['home_team']['advanced'][0], 
             {
                 'player': 'Kevin Durant',
+                'player_id': 'duranke01',
                 'mp': '40:09',
                 'ts_pct': '.655',
                 'efg_pct': '.647',
@@ -86,6 +87,7 @@ class TestBoxscorePageParser(unittest.TestCase):
             parser.get_data()['away_team']['basic'][1], 
             {
                 'player': 'Anthony Davis',
+                'player_id': 'davisan01',
                 'is_starter': True,
                 'mp': '41:17',
                 'fg': '6',
@@ -114,6 +116,7 @@ class TestBoxscorePageParser(unittest.TestCase):
             parser.get_data()['away_team']['advanced'][1], 
             {
                 'player': 'Anthony Davis',
+                'player_id': 'davisan01',
                 'mp': '41:17',
                 'ts_pct': '.467',
                 'efg_pct': '.406',
@@ -136,6 +139,7 @@ class TestBoxscorePageParser(unittest.TestCase):
             parser.get_data()['home_team']['basic'][11], 
             {
                 'player': 'Quinn Cook',
+                'player_id': 'cookqu01',
                 'did_not_play': 'Did Not Play'
             }
         )
@@ -144,6 +148,7 @@ class TestBoxscorePageParser(unittest.TestCase):
             parser.get_data()['home_team']['advanced'][11], 
             {
                 'player': 'Quinn Cook',
+                'player_id': 'cookqu01',
                 'did_not_play': 'Did Not Play'
             }
         )
@@ -152,6 +157,7 @@ class TestBoxscorePageParser(unittest.TestCase):
             parser.get_data()['away_team']['basic'][5], 
             {
                 'player': 'Julius Randle',
+                'player_id': 'randlju01',
                 'is_starter': False,
                 'mp': '22:52',
                 'fg': '3',
@@ -179,5 +185,138 @@ class TestBoxscorePageParser(unittest.TestCase):
         self.assertEqual(len(parser.get_data()['home_team']['basic']), 12)
         self.assertEqual(len(parser.get_data()['away_team']['basic']), 13)
 
+    def test_parser(self):
+        abs_url = urljoin(BASE_URL, BOXSCORE_URL.format(**self.url_params))
+        page = load_page(abs_url)
+        self.assert_boxscore_data(BoxscorePageParser(page))
+
+    def test_parser_saved_page(self):
+        page = load_fixture('boxscore_201810310GSW.html')
+        self.assert_boxscore_data(BoxscorePageParser(page))
+
+    def test_commented_tables(self):
+        parser = BoxscorePageParser(load_fixture('boxscore_201810310GSW.html'))
+
+        self.assertEqual(
+            parser.get_line_score(),
+            [
+                {'team': 'NOP', '1': '31', '2': '33', '3': '28', '4': '29',
+                 'T': '121'},
+                {'team': 'GSW', '1': '35', '2': '36', '3': '32', '4': '28',
+                 'T': '131'},
+            ]
+        )
+        self.assertEqual(
+            [team['team_id'] for team in parser.get_four_factors()],
+            ['NOP', 'GSW']
+        )
+        self.assertEqual(
+            set(parser.get_four_factors()[0]),
+            {'team_id', 'pace', 'efg_pct', 'tov_pct', 'orb_pct', 'ft_rate',
+             'off_rtg'}
+        )
+        self.assertEqual(set(parser.commented_tables),
+                         {'line_score', 'four_factors'})
+        # uncommented tables are left to the main document tree
+        self.assertIsNone(parser.get_commented_table('box_gsw_basic'))
+        self.assertIsNone(parser.get_commented_table('no_such_table'))
+
+    def test_commented_tables_from_bytes(self):
+        page = load_fixture('boxscore_201810310GSW.html')
+        parser = BoxscorePageParser(page.encode('utf-8'))
+        self.assertEqual(parser.get_line_score(),
+                         BoxscorePageParser(page).get_line_score())
+        self.assertEqual(parser.get_four_factors(),
+                         BoxscorePageParser(page).get_four_factors())
+
+    def test_commented_tables_from_stream(self):
+        page = load_fixture('boxscore_201810310GSW.html')
+        parser = BoxscorePageParser(io.BytesIO(page.encode('utf-8')))
+        with self.assertRaisesRegex(TypeError, 'stream'):
+            parser.get_line_score()
+        parser = BoxscorePageParser(iter([page[:1000], page[1000:]]))
+        with self.assertRaisesRegex(TypeError, 'stream'):
+            parser.get_four_factors()
+
+    def test_overtime(self):
+        parser = BoxscorePageParser(
+            load_fixture('synthetic_boxscore_overtime.html'), typed=True)
+        self.assertEqual(
+            [(team['OT'], team['T']) for team in parser.get_line_score()],
+            [('12', '133'), ('9', '140')])
+        durant = parser.get_data()['home_team']['basic'][0]
+        self.assertEqual((durant['player'], durant['mp']),
+                         ('Kevin Durant', 44 * 60 + 20))
+
+    def test_dnp_heavy(self):
+        parser = BoxscorePageParser(
+            load_fixture('synthetic_boxscore_dnp_heavy.html'))
+        for team, played in [('home_team', 7), ('away_team', 7)]:
+            for table in ('basic', 'advanced'):
+                rows = parser.get_data()[team][table]
+                self.assertEqual(
+                    len([row for row in rows if 'did_not_play' not in row]),
+                    played)
+        self.assertEqual(
+            {row['did_not_play'] for row in
+             parser.get_data()['away_team']['advanced'][7:]},
+            {'Did Not Play', 'Did Not Dress'})
+
+    def test_get_row_text_by_stat(self):
+        parser = BoxscorePageParser("")
+        handler = BeautifulSoup(
+            '<table><tr><th data-stat="player"><a>Kevin Durant</a></th>'
+            '<td data-stat="mp">40:09</td><td data-stat="mp">0:00</td>'
+            '<td>ignored</td></tr></table>', 'html.parser')
+        self.assertEqual(
+            parser.get_row_text_by_stat(handler.tr),
+            {'player': 'Kevin Durant', 'mp': '40:09'}
+        )
+
+    def test_get_slug(self):
+        parser = BoxscorePageParser("")
+        instrumentation = BoxscorePageParser.enable_instrumentation()
+        try:
+            self.assertEqual(parser.get_slug(
+                'https://www.basketball-reference.com/players/d/'
+                'duranke01.html', parser.PLAYER_SLUG), 'duranke01')
+            self.assertEqual(parser.get_slug(
+                '/teams/GSW/2019.html', parser.TEAM_SLUG), 'GSW')
+            self.assertEqual(parser.get_slug('', parser.PLAYER_SLUG), '')
+            self.assertEqual(parser.get_player_slug(None), '')
+            self.assertEqual(parser.get_slug(
+                '/teams/GSW/2019.html', parser.PLAYER_SLUG), '')
+        finally:
+            BoxscorePageParser.disable_instrumentation()
+        self.assertEqual(instrumentation.get_stats()
+                         ['BoxscorePageParser']['failures'], 1)
+
+    def test_player_ids(self):
+        page = load_fixture('boxscore_201810310GSW.html')
+        for engine in ('html.parser', 'lxml.html'):
+            data = BoxscorePageParser(page, engine).get_data()
+            for team in ('home_team', 'away_team'):
+                basic, advanced = data[team]['basic'], data[team]['advanced']
+                self.assertTrue(all(row['player_id'] for row in basic))
+                self.assertEqual([row['player_id'] for row in basic],
+                                 [row['player_id'] for row in advanced])
+
+    def test_iter_rows(self):
+        page = load_fixture('boxscore_201810310GSW.html')
+        rows = BoxscorePageParser(page).iter_rows()
+        team, table, row = next(rows)
+        self.assertEqual((team, table, row['player']),
+                         ('home_team', 'basic', 'Kevin Durant'))
+        data = {'home_team': {'basic': [], 'advanced': []},
+                'away_team': {'basic': [], 'advanced': []}}
+        parser = BoxscorePageParser(page)
+        for team, table, row in parser.iter_rows():
+            data[team][table].append(row)
+        self.assertEqual(parser.abbreviations,
+                         {'home_team': 'GSW', 'away_team': 'NOP'})
+        for team, abbreviation in parser.abbreviations.items():
+            data[team]['abbreviation'] = abbreviation
+        self.assertEqual(data, BoxscorePageParser(page).get_data())
+
 if __name__ == "__main__":
     unittest.main()
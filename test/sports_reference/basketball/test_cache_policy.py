@@ -0,0 +1,50 @@
+import unittest
+
+from datetime import date
+
+from urllib.parse import urljoin
+
+from fantalytix_python_crawler.crawler.sports_reference.basketball\
+    .cache_policy import CachePolicy, get_end_year
+from fantalytix_python_crawler.crawler.sports_reference.basketball\
+    .settings import BASE_URL
+
+class TestCachePolicy(unittest.TestCase):
+
+    def setUp(self):
+        self.policy = CachePolicy(today=lambda: date(2018, 11, 2))
+
+    def get_max_age(self, path):
+        return self.policy(urljoin(BASE_URL, path))
+
+    def test_current_end_year(self):
+        self.assertEqual(self.policy.get_current_end_year(), 2019)
+        policy = CachePolicy(today=lambda: date(2019, 6, 1))
+        self.assertEqual(policy.get_current_end_year(), 2019)
+
+    def test_get_end_year(self):
+        self.assertEqual(get_end_year(date(2018, 9, 1)), 2019)
+        self.assertEqual(get_end_year(date(2018, 8, 31)), 2018)
+
+    def test_boxscores(self):
+        self.assertIsNone(self.get_max_age('/boxscores/201810310GSW.html'))
+        self.assertEqual(self.get_max_age('/boxscores/201811010GSW.html'),
+                         CachePolicy.SCHEDULE_MAX_AGE)
+
+    def test_seasons(self):
+        self.assertIsNone(self.get_max_age('/leagues/NBA_2018.html'))
+        self.assertIsNone(
+            self.get_max_age('/leagues/NBA_2018_games-october.html'))
+        self.assertEqual(
+            self.get_max_age('/leagues/NBA_2019_games-november.html'),
+            CachePolicy.SCHEDULE_MAX_AGE)
+        self.assertEqual(self.get_max_age('/leagues/NBA_2019.html'),
+                         CachePolicy.DEFAULT_MAX_AGE)
+
+    def test_other_pages(self):
+        for path in ['/leagues', '/teams', '/players/s/simmobe01.html']:
+            self.assertEqual(self.get_max_age(path),
+                             CachePolicy.DEFAULT_MAX_AGE)
+
+if __name__ == "__main__":
+    unittest.main()
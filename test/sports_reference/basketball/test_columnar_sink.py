@@ -0,0 +1,144 @@
+import unittest
+
+import os
+
+import tempfile
+
+from datetime import date
+
+from fantalytix_python_crawler.crawler.sports_reference.basketball\
+    .boxscore_page_parser import BoxscorePageParser
+from fantalytix_python_crawler.crawler.sports_reference.basketball\
+    .season_schedule_page_parser import SeasonSchedulePageParser
+from fantalytix_python_crawler.crawler.sports_reference.basketball\
+    .columnar_sink import (ColumnarSink, SCHEMAS, GAMES, BOXSCORE_BASIC,
+                           BOXSCORE_ADVANCED, SCHEMA_VERSION,
+                           SCHEMA_VERSION_KEY)
+from fantalytix_python_crawler.crawler.sports_reference.basketball\
+    .db_loader import DatabaseLoader
+
+from .fixtures import load_fixture
+
+try:
+    import pyarrow.dataset as ds
+except ImportError:
+    ds = None
+
+BOXSCORE_URL = 'https://www.basketball-reference.com/boxscores/{}.html'
+
+@unittest.skipIf(ds is None, 'requires pyarrow')
+class TestColumnarSink(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.context = {'league': 'NBA', 'end_year': 2019}
+        self.games = SeasonSchedulePageParser(
+            load_fixture('NBA_2019_games-october.html')).get_data()
+        self.boxscore = load_fixture('boxscore_201810310GSW.html')
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def read(self, dataset):
+        table = ds.dataset(os.path.join(self.temp_dir.name, dataset),
+                           partitioning='hive').to_table()
+        return table.to_pylist()
+
+    def test_round_trip(self):
+        with ColumnarSink(self.temp_dir.name, batch_rows=100) as sink:
+            sink('leagues', 'url', {'league': 'NBA'}, [])
+            sink('schedules', 'url', dict(self.context, month='october'),
+                 self.games)
+            for game_id, game_date in [('201810310GSW', date(2018, 10, 31)),
+                                       ('201811010GSW', date(2018, 11, 1))]:
+                sink('boxscores', BOXSCORE_URL.format(game_id),
+                     dict(self.context, game_date=game_date),
+                     BoxscorePageParser(self.boxscore).get_data())
+
+        games = self.read(GAMES)
+        self.assertEqual(len(games), len(self.games))
+        first = [game for game in games
+                 if game['box_score_text'] == self.games[0]['box_score_text']]
+        self.assertEqual(first[0]['season'], 2019)
+        self.assertEqual(first[0]['league'], 'NBA')
+        del first[0]['season'], first[0]['league'], first[0]['date']
+        self.assertEqual(first[0], self.games[0])
+
+        expected = BoxscorePageParser(self.boxscore, typed=True).get_data()
+        basic = self.read(BOXSCORE_BASIC)
+        rows = len(expected['home_team']['basic']) \
+            + len(expected['away_team']['basic'])
+        self.assertEqual(len(basic), 2 * rows)
+        durant = [row for row in basic if row['player'] == 'Kevin Durant'
+                  and row['game_id'] == '201810310GSW'][0]
+        self.assertEqual(durant['team'], 'GSW')
+        self.assertEqual(durant['date'], '2018-10-31')
+        for stat, value in expected['home_team']['basic'][0].items():
+            self.assertEqual(durant[stat], value)
+        cook = [row for row in basic if row['player'] == 'Quinn Cook'][0]
+        self.assertEqual(cook['did_not_play'], 'Did Not Play')
+        self.assertIsNone(cook['pts'])
+        looney = [row for row in basic if row['player'] == 'Kevon Looney'][0]
+        self.assertIsNone(looney['fg_pct'])
+
+        advanced = self.read(BOXSCORE_ADVANCED)
+        self.assertEqual(len(advanced), 2 * (
+            len(expected['home_team']['advanced'])
+            + len(expected['away_team']['advanced'])))
+
+    def test_matches_database_loader(self):
+        """Both sinks write the same boxscore rows."""
+        url = BOXSCORE_URL.format('201810310GSW')
+        data = BoxscorePageParser(self.boxscore).get_data()
+        # a player without a link is keyed by name in both
+        for table in ['basic', 'advanced']:
+            data['away_team'][table][0]['player_id'] = ''
+        context = dict(self.context, game_date=date(2018, 10, 31))
+        with ColumnarSink(self.temp_dir.name) as sink:
+            sink('boxscores', url, context, data)
+        with DatabaseLoader(':memory:') as loader:
+            loader('boxscores', url, context, data)
+            loader.flush_all()
+            for dataset in [BOXSCORE_BASIC, BOXSCORE_ADVANCED]:
+                cursor = loader.connection.execute(
+                    'SELECT * FROM {}'.format(dataset))
+                names = [column[0] for column in cursor.description]
+                expected = [dict(zip(names, row)) for row in cursor]
+                rows = self.read(dataset)
+                for row in rows:
+                    del row['league'], row['season'], row['date']
+                    if row.get('is_starter') is not None:
+                        row['is_starter'] = int(row['is_starter'])
+                key = lambda row: row['player_id']
+                self.assertEqual(sorted(rows, key=key),
+                                 sorted(expected, key=key))
+                self.assertIn(data['away_team']['basic'][0]['player'],
+                              [row['player_id'] for row in rows])
+
+    def test_streaming(self):
+        sink = ColumnarSink(self.temp_dir.name, batch_rows=10 ** 6,
+                            max_buffered_rows=30)
+        sink('schedules', 'url', dict(self.context, month='october'),
+             self.games)
+        self.assertTrue(sink.total_rows < 30)
+        self.assertTrue(len(sink.files) > 0)
+        sink.close()
+        self.assertEqual(sink.total_rows, 0)
+        self.assertEqual(len(self.read(GAMES)), len(self.games))
+        schema = ds.dataset(sink.files[0]).schema
+        self.assertEqual(schema, SCHEMAS[GAMES])
+        self.assertEqual(schema.metadata[SCHEMA_VERSION_KEY],
+                         str(SCHEMA_VERSION).encode())
+
+    def test_partition_dates(self):
+        with ColumnarSink(self.temp_dir.name,
+                          partition_dates=False) as sink:
+            sink('schedules', 'url', dict(self.context, month='october'),
+                 self.games)
+        self.assertEqual(len(sink.files), 1)
+        self.assertEqual(os.path.dirname(sink.files[0]), os.path.join(
+            self.temp_dir.name, GAMES, 'league=NBA', 'season=2019'))
+        self.assertEqual(len(self.read(GAMES)), len(self.games))
+
+if __name__ == "__main__":
+    unittest.main()
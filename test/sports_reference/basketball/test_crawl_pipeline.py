@@ -0,0 +1,411 @@
+import unittest
+
+import asyncio
+
+import io
+
+import json
+
+import os
+
+import tempfile
+
+from datetime import date
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from fantalytix_python_crawler.crawler.fetcher import Fetcher
+from fantalytix_python_crawler.crawler.frontier import Frontier
+from fantalytix_python_crawler.crawler.sports_reference.basketball\
+    .cache_policy import CachePolicy
+from fantalytix_python_crawler.crawler.sports_reference.basketball\
+    .crawl_pipeline import CrawlPipeline, json_lines_sink, parse_seasons
+from fantalytix_python_crawler.crawler.sports_reference.basketball\
+    .game_state import GameStateStore
+
+from .fixtures import load_fixture
+from .test_season_schedule import make_month
+
+class TestCrawlPipeline(unittest.IsolatedAsyncioTestCase):
+    """Crawls a local stand-in for the site that serves the saved pages.
+    Every boxscore url returns the same saved boxscore.
+    """
+
+    PAGES = {
+        '/leagues': 'leagues.html',
+        '/leagues/NBA_2019.html': 'NBA_2019.html',
+        '/leagues/NBA_2019_games.html': 'NBA_2019_games-october.html',
+        '/leagues/NBA_2019_games-october.html':
+            'NBA_2019_games-october.html',
+    }
+
+    async def asyncSetUp(self):
+        self.requests = []
+        self.edits = []
+        # path -> text of pages served besides PAGES
+        self.pages = dict()
+        self.stop_after = None
+        self.stopped = asyncio.Event()
+        app = web.Application()
+        app.router.add_get('/{path:.*}', self.handle)
+        self.server = TestServer(app)
+        await self.server.start_server()
+
+    async def asyncTearDown(self):
+        await self.server.close()
+
+    async def handle(self, request):
+        self.requests.append(request.path)
+        if len(self.requests) == self.stop_after:
+            self.stopped.set()
+        if request.path in self.pages:
+            return web.Response(text=self.pages[request.path],
+                                content_type='text/html')
+        if request.path.startswith('/boxscores/'):
+            fixture = 'boxscore_201810310GSW.html'
+        elif request.path in self.PAGES:
+            fixture = self.PAGES[request.path]
+        else:
+            return web.Response(status=404)
+        text = load_fixture(fixture)
+        for old, new in self.edits:
+            text = text.replace(old, new, 1)
+        return web.Response(text=text, content_type='text/html')
+
+    async def test_run(self):
+        pages = []
+        reports = []
+        base_url = str(self.server.make_url('/'))
+        async with Fetcher(rate=1000, concurrency=8) as fetcher:
+            pipeline = CrawlPipeline(
+                'NBA', [2019], fetcher, parser='lxml.html', base_url=base_url,
+                sink=lambda *page: pages.append(page), workers=4,
+                queue_size=10, report=reports.append)
+            stats = await pipeline.run()
+
+        stages = stats['stages']
+        self.assertEqual(stages['leagues']['done'], 1)
+        self.assertEqual(stages['seasons']['done'], 1)
+        self.assertEqual(stages['schedules']['done'], 1)
+        self.assertEqual(stages['schedules']['missing'], 1)
+        self.assertEqual(stages['boxscores']['done'], 110)
+        self.assertEqual(
+            sum(stage['failed'] for stage in stages.values()), 0)
+        self.assertEqual(
+            sum(stage['queued'] for stage in stages.values()), 0)
+        self.assertTrue(stats['pages_per_sec'] > 0)
+        self.assertEqual(reports[-1], stats)
+
+        self.assertEqual(len(pages), 113)
+        stage, url, context, data = pages[-1]
+        self.assertEqual(stage, 'boxscores')
+        self.assertTrue(url.startswith(base_url + 'boxscores/201810'))
+        self.assertEqual(context['end_year'], 2019)
+        self.assertEqual(context['month'], 'october')
+        self.assertEqual(data['home_team']['basic'][0]['player'],
+                         'Kevin Durant')
+        self.assertEqual(len(self.requests), len(set(self.requests)))
+        # the season's schedule page is October, and links to November
+        self.assertIn('/leagues/NBA_2019_games.html', self.requests)
+        self.assertNotIn('/leagues/NBA_2019_games-october.html',
+                         self.requests)
+        self.assertIn('/leagues/NBA_2019_games-november.html', self.requests)
+
+    async def test_playoffs(self):
+        """Serves pages derived from October, with December and January
+        dates, as November and December, the playoffs starting after 10
+        games of November. The games of December reach the sink as
+        playoff games although their page has no playoffs header.
+        """
+        self.pages = {
+            '/leagues/NBA_2019_games-november.html':
+                make_month('Dec', 2018, playoffs_after=10),
+            '/leagues/NBA_2019_games-december.html': make_month('Jan', 2019),
+        }
+        schedules = dict()
+
+        def sink(stage, url, context, data):
+            if stage == 'schedules':
+                schedules[context['month']] = [game['type'] for game in data]
+
+        base_url = str(self.server.make_url('/'))
+        async with Fetcher(rate=1000, concurrency=8) as fetcher:
+            stats = await CrawlPipeline(
+                'NBA', [2019], fetcher, base_url=base_url, sink=sink,
+                workers=4, report=lambda stats: None).run()
+        self.assertEqual(stats['stages']['schedules']['done'], 3)
+        self.assertEqual(stats['stages']['schedules']['missing'], 1)
+        self.assertEqual(set(schedules['october']), {'regular'})
+        self.assertEqual(schedules['november'][:10], ['regular'] * 10)
+        self.assertEqual(set(schedules['november'][10:]), {'playoffs'})
+        self.assertEqual(set(schedules['december']), {'playoffs'})
+        self.assertEqual(len(schedules['december']),
+                         len(schedules['october']))
+
+    async def test_playoffs_state(self):
+        """Records the months reached in the game state, then starts a
+        crawl from the December page with the recorded playoff state.
+        """
+        self.pages = {
+            '/leagues/NBA_2019_games-november.html':
+                make_month('Dec', 2018, playoffs_after=10),
+            '/leagues/NBA_2019_games-december.html': make_month('Jan', 2019),
+        }
+        schedules = dict()
+
+        def sink(stage, url, context, data):
+            if stage == 'schedules':
+                schedules[context['month']] = [game['type'] for game in data]
+
+        base_url = str(self.server.make_url('/'))
+        with GameStateStore(':memory:') as state:
+            async with Fetcher(rate=1000, concurrency=8) as fetcher:
+                await CrawlPipeline(
+                    'NBA', [2019], fetcher, base_url=base_url, sink=sink,
+                    report=lambda stats: None, game_state=state).run()
+                self.assertEqual(state.get_month('NBA', 2019),
+                                 ('december', True))
+                self.assertEqual(state.get_month('NBA', 2019, 'november'),
+                                 ('november', False))
+
+                schedules.clear()
+                self.requests.clear()
+                month = state.get_month('NBA', 2019)
+                stats = await CrawlPipeline(
+                    'NBA', [], fetcher, base_url=base_url, sink=sink,
+                    report=lambda stats: None, game_state=state).run([(
+                        'schedules',
+                        base_url + 'leagues/NBA_2019_games-december.html',
+                        {'league': 'NBA', 'end_year': 2019,
+                         'month': month.month, 'playoffs': month.playoffs})])
+        self.assertEqual(stats['stages']['schedules']['done'], 1)
+        self.assertEqual(set(schedules), {'december'})
+        self.assertEqual(set(schedules['december']), {'playoffs'})
+
+    async def test_small_queues(self):
+        """Crawls three seasons of three months each with room for one
+        item per queue. The worker that crawls a month crawls the next
+        one too, instead of waiting on room in its own stage's queue.
+        """
+        october = load_fixture('NBA_2019_games-october.html')
+        for end_year in (2017, 2018, 2019):
+            season = 'NBA_{}_games'.format(end_year)
+            self.pages.update({
+                '/leagues/NBA_{}.html'.format(end_year):
+                    load_fixture('NBA_2019.html'),
+                '/leagues/{}.html'.format(season):
+                    october.replace('NBA_2019_games', season),
+                '/leagues/{}-november.html'.format(season):
+                    make_month('Dec', 2018).replace('NBA_2019_games', season),
+                '/leagues/{}-december.html'.format(season):
+                    make_month('Jan', 2019).replace('NBA_2019_games', season),
+            })
+        base_url = str(self.server.make_url('/'))
+        async with Fetcher(rate=1000, concurrency=8) as fetcher:
+            stats = await asyncio.wait_for(CrawlPipeline(
+                'NBA', [2017, 2018, 2019], fetcher, base_url=base_url,
+                workers=1, queue_size=1, report=lambda stats: None).run(), 30)
+        stages = stats['stages']
+        self.assertEqual(stages['seasons']['done'], 3)
+        self.assertEqual(stages['schedules']['done'], 9)
+        self.assertEqual(stages['schedules']['missing'], 3)
+        self.assertEqual(stages['boxscores']['done'], 110)
+
+    async def test_daily(self):
+        base_url = str(self.server.make_url('/'))
+        with GameStateStore(':memory:') as state:
+            async with Fetcher(rate=1000, concurrency=8) as fetcher:
+                pipeline = CrawlPipeline(
+                    'NBA', [], fetcher, parser='lxml.html', base_url=base_url,
+                    workers=4, report=lambda stats: None, game_state=state)
+                start = pipeline.get_daily_start(date(2018, 11, 1))
+                self.assertEqual([url for _, url, _ in start], [
+                    base_url + 'leagues/NBA_2019_games.html'])
+                stats = await pipeline.run(start)
+                self.assertEqual(stats['changes'], {'added': 110})
+                self.assertEqual(stats['stages']['boxscores']['done'], 110)
+                self.assertEqual(stats['stages']['seasons']['done'], 0)
+
+                # later runs start from the month the state has reached
+                start = pipeline.get_daily_start(date(2018, 11, 1))
+                self.assertEqual(start, [(
+                    'schedules',
+                    base_url + 'leagues/NBA_2019_games-october.html',
+                    {'league': 'NBA', 'end_year': 2019, 'month': 'october',
+                     'playoffs': False, 'through': date(2018, 11, 1)})])
+                self.requests.clear()
+                pipeline = CrawlPipeline(
+                    'NBA', [], fetcher, parser='lxml.html', base_url=base_url,
+                    workers=4, report=lambda stats: None, game_state=state)
+                stats = await pipeline.run(start)
+                self.assertEqual(stats['changes'], {})
+                self.assertEqual(stats['stages']['boxscores']['done'], 0)
+                self.assertNotIn('/leagues/NBA_2019_games.html', self.requests)
+
+                self.edits.append(('data-stat="home_pts" >105<',
+                                   'data-stat="home_pts" >106<'))
+                pipeline = CrawlPipeline(
+                    'NBA', [], fetcher, parser='lxml.html', base_url=base_url,
+                    workers=4, report=lambda stats: None, game_state=state)
+                stats = await pipeline.run(start)
+                self.assertEqual(stats['changes'], {'score_changed': 1})
+                self.assertEqual(stats['stages']['boxscores']['done'], 1)
+                self.assertEqual(pipeline.changes[0].previous, (87, 105))
+                self.assertEqual([path for path in self.requests[-3:]
+                                  if path.startswith('/boxscores/')],
+                                 ['/boxscores/201810160BOS.html'])
+
+    def test_daily_start(self):
+        base_url = 'http://localhost/'
+        with GameStateStore(':memory:') as state:
+            pipeline = CrawlPipeline('NBA', [], None, base_url=base_url,
+                                     game_state=state)
+            state.reach_month('NBA', 2019, 'october', False)
+            state.reach_month('NBA', 2019, 'april', False)
+            state.reach_month('NBA', 2019, 'may', True)
+            state.reach_month('NBA', 2018, 'june', True)
+            today = date(2019, 5, 2)
+            self.assertEqual(pipeline.get_daily_start(today, days=1), [(
+                'schedules', base_url + 'leagues/NBA_2019_games-may.html',
+                {'league': 'NBA', 'end_year': 2019, 'month': 'may',
+                 'playoffs': True, 'through': today})])
+            # no month reached in March, so the crawl starts in October
+            self.assertEqual(
+                [(url, context['playoffs']) for _, url, context in
+                 pipeline.get_daily_start(today, days=40)],
+                [(base_url + 'leagues/NBA_2019_games-october.html', False)])
+            # across seasons, from the season's first month without state
+            today = date(2019, 10, 1)
+            self.assertEqual(
+                [url for _, url, _ in
+                 pipeline.get_daily_start(today, days=130)],
+                [base_url + 'leagues/NBA_2019_games-may.html',
+                 base_url + 'leagues/NBA_2020_games.html'])
+
+    async def test_resume(self):
+        """Stops a crawl after 40 pages and resumes it from the frontier."""
+        base_url = str(self.server.make_url('/'))
+        boxscores = lambda: [path for path in self.requests
+                             if path.startswith('/boxscores/')]
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, 'frontier.sqlite')
+            self.stop_after = 40
+            with Frontier(path) as frontier:
+                async with Fetcher(rate=1000, concurrency=8) as fetcher:
+                    run = asyncio.create_task(CrawlPipeline(
+                        'NBA', [2019], fetcher, base_url=base_url,
+                        workers=4, report=lambda stats: None,
+                        frontier=frontier).run())
+                    await self.stopped.wait()
+                    run.cancel()
+                    with self.assertRaises(asyncio.CancelledError):
+                        await run
+                counts = frontier.get_counts()
+            first_run = set(boxscores())
+            self.assertEqual(sum(counts.values()), 114)
+            self.assertTrue(counts['done'] >= 11)
+            self.assertTrue(counts['pending'] > 0)
+
+            self.requests.clear()
+            with Frontier(path) as frontier:
+                async with Fetcher(rate=1000, concurrency=8) as fetcher:
+                    stats = await CrawlPipeline(
+                        'NBA', [2019], fetcher, base_url=base_url,
+                        workers=4, report=lambda stats: None,
+                        frontier=frontier).run()
+                self.assertEqual(frontier.get_counts(), {
+                    'pending': 0, 'in_flight': 0, 'done': 114, 'failed': 0})
+            # the start page is crawled again, the past season's pages are
+            # final
+            self.assertEqual(stats['stages']['leagues']['done'], 1)
+            self.assertEqual(stats['stages']['seasons']['done'], 0)
+            self.assertEqual(len(first_run | set(boxscores())), 110)
+            self.assertTrue(len(first_run & set(boxscores())) <= 4 * 4)
+
+            self.requests.clear()
+            with Frontier(path) as frontier:
+                async with Fetcher(rate=1000, concurrency=8) as fetcher:
+                    await CrawlPipeline(
+                        'NBA', [2019], fetcher, base_url=base_url,
+                        report=lambda stats: None, frontier=frontier).run()
+            self.assertEqual(self.requests, ['/leagues'])
+
+    async def test_frontier_rerun(self):
+        """Crawls twice with one frontier while the 2019 season is on. The
+        second run crawls the current season's pages and the boxscores of
+        the last day again, not the older boxscores.
+        """
+        base_url = str(self.server.make_url('/'))
+        policy = CachePolicy(today=lambda: date(2018, 11, 1))
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, 'frontier.sqlite')
+            for run in range(2):
+                self.requests.clear()
+                with Frontier(path) as frontier:
+                    async with Fetcher(rate=1000, concurrency=8) as fetcher:
+                        stats = await CrawlPipeline(
+                            'NBA', [2019], fetcher, base_url=base_url,
+                            workers=4, report=lambda stats: None,
+                            frontier=frontier, cache_policy=policy).run()
+                    counts = frontier.get_counts()
+                self.assertEqual(counts['pending'], 0)
+                self.assertEqual(counts['done'], 114)
+            stages = stats['stages']
+            self.assertEqual(stages['leagues']['done'], 1)
+            self.assertEqual(stages['seasons']['done'], 1)
+            self.assertEqual(stages['schedules']['done'], 1)
+            boxscores = [path for path in self.requests
+                         if path.startswith('/boxscores/')]
+            self.assertTrue(boxscores)
+            self.assertEqual(stages['boxscores']['done'], len(boxscores))
+            self.assertTrue(all(path.startswith('/boxscores/20181031')
+                                for path in boxscores))
+
+    async def test_daily_frontier(self):
+        """`--daily --state --frontier`: every run crawls the daily
+        schedules again and fetches the boxscores of changed games.
+        """
+        base_url = str(self.server.make_url('/'))
+        with tempfile.TemporaryDirectory() as temp_dir, \
+                GameStateStore(':memory:') as state:
+            path = os.path.join(temp_dir, 'frontier.sqlite')
+
+            async def run():
+                with Frontier(path) as frontier:
+                    async with Fetcher(rate=1000, concurrency=8) as fetcher:
+                        pipeline = CrawlPipeline(
+                            'NBA', [], fetcher, base_url=base_url, workers=4,
+                            report=lambda stats: None, game_state=state,
+                            frontier=frontier)
+                        return await pipeline.run(pipeline.get_daily_start(
+                            date(2018, 11, 1)))
+
+            stats = await run()
+            self.assertEqual(stats['stages']['boxscores']['done'], 110)
+            stats = await run()
+            self.assertEqual(stats['stages']['schedules']['done'], 1)
+            self.assertEqual(stats['stages']['boxscores']['done'], 0)
+            self.edits.append(('data-stat="home_pts" >105<',
+                               'data-stat="home_pts" >106<'))
+            stats = await run()
+            self.assertEqual(stats['changes'], {'score_changed': 1})
+            self.assertEqual(stats['stages']['boxscores']['done'], 1)
+            self.assertEqual(self.requests[-1],
+                             '/boxscores/201810160BOS.html')
+
+    def test_parse_seasons(self):
+        self.assertEqual(parse_seasons('2019'), [2019])
+        self.assertEqual(parse_seasons('2015-2019'),
+                         [2015, 2016, 2017, 2018, 2019])
+
+    def test_json_lines_sink(self):
+        stream = io.StringIO()
+        sink = json_lines_sink(stream)
+        sink('seasons', 'url', {'end_year': 2019}, [{'team_name': 'x'}])
+        self.assertEqual(json.loads(stream.getvalue()), {
+            'stage': 'seasons', 'url': 'url', 'context': {'end_year': 2019},
+            'data': [{'team_name': 'x'}]})
+
+if __name__ == "__main__":
+    unittest.main()
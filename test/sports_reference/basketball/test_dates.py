@@ -0,0 +1,94 @@
+import unittest
+
+from datetime import date, time, timedelta
+
+from fantalytix_python_crawler.crawler.sports_reference.basketball.dates\
+    import (parse_birth_date, parse_game_date, parse_game_time,
+            parse_iso_date, strptime_birth_date, strptime_game_date,
+            strptime_game_time, strptime_iso_date)
+
+class TestDates(unittest.TestCase):
+
+    def test_parse_game_date(self):
+        self.assertEqual(parse_game_date('Tue, Oct 16, 2018'),
+                         date(2018, 10, 16))
+        day = date(2018, 1, 1)
+        while day.year == 2018:
+            text = '{:%a, %b} {}, {}'.format(day, day.day, day.year)
+            self.assertEqual(parse_game_date(text), strptime_game_date(text))
+            day += timedelta(days=1)
+
+    def test_parse_game_time(self):
+        self.assertEqual(parse_game_time('8:00p'), time(20, 0))
+        self.assertEqual(parse_game_time('12:30a'), time(0, 30))
+        self.assertEqual(parse_game_time('12:00p'), time(12, 0))
+        for hour in range(1, 13):
+            for minute in (0, 5, 30, 59):
+                for suffix in ('a', 'p'):
+                    text = '{}:{:02d}{}'.format(hour, minute, suffix)
+                    self.assertEqual(parse_game_time(text),
+                                     strptime_game_time(text))
+
+    def test_parse_iso_date(self):
+        self.assertEqual(parse_iso_date('1996-07-20'), date(1996, 7, 20))
+        self.assertEqual(parse_iso_date('1999-7-2'),
+                         strptime_iso_date('1999-7-2'))
+
+    def test_parse_birth_date(self):
+        self.assertEqual(parse_birth_date('July 20, 1996'), date(1996, 7, 20))
+        day = date(2000, 1, 1)
+        while day.year == 2000:
+            text = '{:%B} {}, {}'.format(day, day.day, day.year)
+            self.assertEqual(parse_birth_date(text), strptime_birth_date(text))
+            day += timedelta(days=1)
+
+    def test_fallback(self):
+        """Other formats strptime accepts still convert."""
+        self.assertEqual(parse_game_time('8:00pm'), time(20, 0))
+        self.assertEqual(parse_game_time('8:0p'), time(20, 0))
+        self.assertEqual(parse_game_date('Tue,  Oct 16, 2018'),
+                         date(2018, 10, 16))
+        self.assertEqual(parse_birth_date('JULY 20,  1996'),
+                         date(1996, 7, 20))
+
+    def test_malformed(self):
+        """Text strptime rejects is rejected, however close it is to a
+        shape the fast paths read.
+        """
+        for parse, text in [(parse_game_date, 'Xyz, Oct 16, 2018'),
+                            (parse_game_date, 'Tue, Oct 16, 18'),
+                            (parse_game_date, 'Tue, Oct +16, 2018'),
+                            (parse_game_date, 'Tue, Oct 16, 2018 '),
+                            (parse_game_date, 'Tue, Oct 1_6, 2018'),
+                            (parse_game_time, ' 8:00p'),
+                            (parse_game_time, '8:00 p'),
+                            (parse_game_time, '8:+0p'),
+                            (parse_game_time, '00:30a'),
+                            (parse_iso_date, ' 1996-07-20'),
+                            (parse_iso_date, '1996-07-20 '),
+                            (parse_iso_date, '+1996-07-20'),
+                            (parse_iso_date, '96-07-20'),
+                            (parse_birth_date, 'Jul 20, 1996'),
+                            (parse_birth_date, 'Julyish 20, 1996'),
+                            (parse_birth_date, 'July 20, 96')]:
+            with self.subTest(text=text):
+                with self.assertRaises(ValueError):
+                    parse(text)
+
+    def test_invalid(self):
+        for parse, text in [(parse_game_date, 'Tue, Oct 32, 2018'),
+                            (parse_game_date, ''),
+                            (parse_game_time, '13:00p'),
+                            (parse_game_time, '8:60p'),
+                            (parse_game_time, ''),
+                            (parse_iso_date, '1996-13-01'),
+                            (parse_iso_date, 'unknown'),
+                            (parse_birth_date, 'June 31, 1968'),
+                            (parse_birth_date, '')]:
+            with self.subTest(text=text):
+                with self.assertRaises(ValueError):
+                    parse(text)
+
+    def test_memoized(self):
+        self.assertIs(parse_game_date('Wed, Oct 17, 2018'),
+                      parse_game_date('Wed, Oct 17, 2018'))
@@ -0,0 +1,238 @@
+import unittest
+
+import os
+
+import sqlite3
+
+import tempfile
+
+from fantalytix_python_crawler.crawler.sports_reference.basketball\
+    .boxscore_page_parser import BoxscorePageParser
+from fantalytix_python_crawler.crawler.sports_reference.basketball\
+    .db_loader import (BOXSCORE_ADVANCED, BOXSCORE_BASIC, GAMES, PLAYERS,
+                       SCHEMA_VERSION, TEAMS, DatabaseLoader, get_id_from_url,
+                       get_upsert)
+from fantalytix_python_crawler.crawler.sports_reference.basketball\
+    .player_page_parser import PlayerPageParser
+from fantalytix_python_crawler.crawler.sports_reference.basketball\
+    .season_schedule_page_parser import SeasonSchedulePageParser
+from fantalytix_python_crawler.crawler.sports_reference.basketball\
+    .teams_page_parser import TeamsPageParser
+
+from .fixtures import load_fixture
+
+BOXSCORE_URL = 'https://www.basketball-reference.com/boxscores/201810310GSW.html'
+PLAYER_URL = 'https://www.basketball-reference.com/players/s/simmobe01.html'
+
+class FailingCursor:
+    """Raises from statements containing `fail_on`."""
+
+    def __init__(self, cursor, fail_on):
+        self.cursor = cursor
+        self.fail_on = fail_on
+
+    def check(self, statement):
+        if self.fail_on in statement:
+            raise sqlite3.OperationalError('failed: ' + statement)
+
+    def execute(self, statement, *args):
+        self.check(statement)
+        return self.cursor.execute(statement, *args)
+
+    def executemany(self, statement, rows):
+        self.check(statement)
+        return self.cursor.executemany(statement, rows)
+
+    def __getattr__(self, name):
+        return getattr(self.cursor, name)
+
+class FailingConnection:
+
+    def __init__(self, connection, fail_on):
+        self.connection = connection
+        self.fail_on = fail_on
+
+    def cursor(self):
+        return FailingCursor(self.connection.cursor(), self.fail_on)
+
+    def __getattr__(self, name):
+        return getattr(self.connection, name)
+
+class TestDatabaseLoader(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.teams = TeamsPageParser(load_fixture('teams.html')).get_data()
+        cls.player = PlayerPageParser(
+            load_fixture('player_simmobe01.html')).get_data()
+        cls.games = SeasonSchedulePageParser(
+            load_fixture('NBA_2019_games-october.html')).get_data()
+        cls.boxscore = BoxscorePageParser(
+            load_fixture('boxscore_201810310GSW.html')).get_data()
+
+    def setUp(self):
+        self.connection = sqlite3.connect(':memory:')
+        self.loader = DatabaseLoader(self.connection, batch_rows=50)
+
+    def tearDown(self):
+        self.connection.close()
+
+    def count(self, table):
+        return self.connection.execute(
+            'SELECT COUNT(*) FROM {}'.format(table)).fetchone()[0]
+
+    def test_get_id_from_url(self):
+        self.assertEqual(get_id_from_url(BOXSCORE_URL), '201810310GSW')
+        self.assertEqual(get_id_from_url(PLAYER_URL), 'simmobe01')
+
+    def test_get_upsert(self):
+        self.assertEqual(
+            get_upsert(TEAMS, '%s'),
+            'INSERT INTO teams (abbreviation, name, status, url) '
+            'VALUES (%s, %s, %s, %s) ON CONFLICT (abbreviation) '
+            'DO UPDATE SET name = excluded.name, status = excluded.status, '
+            'url = excluded.url')
+
+    def test_load_teams(self):
+        self.loader.load_teams(self.teams)
+        self.assertEqual(self.count(TEAMS), 0)
+        self.loader.flush_all()
+        self.assertEqual(self.count(TEAMS), 30)
+        self.assertEqual(self.connection.execute(
+            "SELECT name FROM teams WHERE abbreviation = 'BOS'").fetchone(),
+            ('boston celtics',))
+
+    def test_load_player(self):
+        self.loader.load_player(PLAYER_URL, self.player)
+        self.loader.flush_all()
+        self.assertEqual(self.connection.execute(
+            'SELECT player_id, name, weight, birthday FROM players')
+            .fetchall(), [('simmobe01', 'Ben Simmons', 230, '1996-07-20')])
+
+    def test_load_games(self):
+        self.loader('schedules', 'url', {'league': 'NBA'}, self.games[:40])
+        self.assertEqual(self.count(GAMES), 0)
+        self.loader('schedules', 'url', {'league': 'NBA'}, self.games[40:])
+        self.assertEqual(self.count(GAMES), 110)
+        self.assertEqual(self.connection.execute(
+            'SELECT game_date, game_start_time, home_team_name, home_team_id, '
+            'home_pts FROM games ORDER BY game_date, home_team_name')
+            .fetchone(),
+            ('2018-10-16', '20:00:00', 'boston celtics', 'BOS', 105))
+
+    def test_load_boxscore(self):
+        self.loader('boxscores', BOXSCORE_URL, {}, self.boxscore)
+        self.loader.flush_all()
+        self.assertEqual(self.loader.loaded[BOXSCORE_BASIC],
+                         self.count(BOXSCORE_BASIC))
+        durant = self.connection.execute(
+            "SELECT game_id, is_starter, mp, pts, fg_pct, plus_minus "
+            "FROM boxscore_basic WHERE player = 'Kevin Durant'").fetchone()
+        self.assertEqual(durant, ('201810310GSW', 1, 2409, 24, .588, 12))
+        cook = self.connection.execute(
+            "SELECT team, did_not_play, is_starter, pts FROM boxscore_basic "
+            "WHERE player = 'Quinn Cook'").fetchone()
+        self.assertEqual(cook, ('GSW', 'Did Not Play', None, None))
+        self.assertEqual(self.connection.execute(
+            "SELECT fg_pct FROM boxscore_basic "
+            "WHERE player = 'Kevon Looney'").fetchone(), (None,))
+        self.assertEqual(self.connection.execute(
+            "SELECT off_rtg FROM boxscore_advanced "
+            "WHERE player = 'Kevin Durant'").fetchone(), (131.0,))
+        self.assertEqual(self.connection.execute(
+            "SELECT player FROM boxscore_advanced "
+            "WHERE player_id = 'cookqu01'").fetchone(), ('Quinn Cook',))
+
+    def test_upsert(self):
+        self.loader.load_boxscore(BOXSCORE_URL, self.boxscore)
+        self.loader.flush_all()
+        rows = self.count(BOXSCORE_BASIC)
+        self.loader.load_boxscore(BOXSCORE_URL, self.boxscore)
+        self.loader.load_teams(self.teams + self.teams)
+        self.loader.flush_all()
+        self.assertEqual(self.count(BOXSCORE_BASIC), rows)
+        self.assertEqual(self.count(TEAMS), 30)
+        self.assertEqual(self.loader.loaded[TEAMS], 60)
+
+    def test_failed_flush(self):
+        """Rows of a batch that failed stay buffered for the next flush."""
+        connection = FailingConnection(self.connection, 'INSERT INTO teams')
+        loader = DatabaseLoader(connection, batch_rows=50)
+        loader.load_teams(self.teams)
+        with self.assertRaises(sqlite3.OperationalError):
+            loader.flush(TEAMS)
+        self.assertEqual(len(loader.buffers[TEAMS]), 30)
+        self.assertEqual(loader.loaded[TEAMS], 0)
+        self.assertEqual(self.count(TEAMS), 0)
+        connection.fail_on = 'never'
+        loader.flush(TEAMS)
+        self.assertEqual(loader.buffers[TEAMS], [])
+        self.assertEqual(self.count(TEAMS), 30)
+
+    def test_player_keys(self):
+        """Players who share a name are kept apart, and a row without a
+        player link is keyed by the name.
+        """
+        boxscore = BoxscorePageParser(
+            load_fixture('boxscore_201810310GSW.html')).get_data()
+        away = boxscore['away_team']['basic']
+        away[0]['player'] = 'Kevin Durant'
+        away[1]['player_id'] = ''
+        self.loader.load_boxscore(BOXSCORE_URL, boxscore)
+        self.loader.flush_all()
+        self.assertEqual(self.count(BOXSCORE_BASIC), 25)
+        self.assertEqual(self.connection.execute(
+            "SELECT team, player_id FROM boxscore_basic "
+            "WHERE player = 'Kevin Durant' ORDER BY team").fetchall(),
+            [('GSW', 'duranke01'), ('NOP', 'holidjr01')])
+        self.assertEqual(self.connection.execute(
+            "SELECT COUNT(*) FROM boxscore_basic "
+            "WHERE player_id = ?", (away[1]['player'],)).fetchone(), (1,))
+
+    def test_schema_version(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, 'fantalytix.sqlite')
+            for _ in range(2):
+                with DatabaseLoader(path) as loader:
+                    self.assertEqual(loader.get_schema_version(),
+                                     SCHEMA_VERSION)
+            connection = sqlite3.connect(path)
+            self.assertEqual(connection.execute(
+                'SELECT COUNT(*) FROM schema_version').fetchone(), (1,))
+            connection.close()
+
+    def test_old_schema(self):
+        """Tables created before the version was recorded are refused."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, 'fantalytix.sqlite')
+            connection = sqlite3.connect(path)
+            connection.execute(
+                'CREATE TABLE teams (abbreviation TEXT, name TEXT, '
+                'status TEXT, url TEXT, PRIMARY KEY (abbreviation))')
+            connection.commit()
+            connection.close()
+            with self.assertRaises(ValueError):
+                DatabaseLoader(path)
+
+    def test_create_tables_atomic(self):
+        """Tables are not left behind without their version."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, 'fantalytix.sqlite')
+            connection = sqlite3.connect(path)
+            with self.assertRaises(sqlite3.OperationalError):
+                DatabaseLoader(FailingConnection(
+                    connection, 'INSERT INTO schema_version'))
+            connection.close()
+            with DatabaseLoader(path) as loader:
+                self.assertEqual(loader.get_schema_version(),
+                                 SCHEMA_VERSION)
+
+    def test_path(self):
+        with DatabaseLoader(':memory:') as loader:
+            loader.load_teams(self.teams)
+            loader.flush_all()
+            self.assertEqual(loader.connection.execute(
+                'SELECT COUNT(*) FROM teams').fetchone(), (30,))
+
+if __name__ == "__main__":
+    unittest.main()
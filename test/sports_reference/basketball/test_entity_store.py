@@ -0,0 +1,180 @@
+import unittest
+
+import os
+
+import sys
+
+import tempfile
+
+from datetime import date
+
+from fantalytix_python_crawler.crawler.sports_reference.basketball\
+    .boxscore_page_parser import BoxscorePageParser
+from fantalytix_python_crawler.crawler.sports_reference.basketball\
+    .entity_store import BoxscoreLine, EntityStore
+from fantalytix_python_crawler.crawler.sports_reference.basketball\
+    .player_index_page_parser import PlayerIndexPageParser
+from fantalytix_python_crawler.crawler.sports_reference.basketball\
+    .player_page_parser import PlayerPageParser
+from fantalytix_python_crawler.crawler.sports_reference.basketball\
+    .season_schedule_page_parser import SeasonSchedulePageParser
+from fantalytix_python_crawler.crawler.sports_reference.basketball\
+    .season_summary_page_parser import SeasonSummaryPageParser
+from fantalytix_python_crawler.crawler.sports_reference.basketball\
+    .teams_page_parser import TeamsPageParser
+
+from .fixtures import load_fixture
+
+BOXSCORE_URL = 'https://www.basketball-reference.com/boxscores/{}.html'
+PLAYER_URL = 'https://www.basketball-reference.com/players/s/simmobe01.html'
+
+class TestEntityStore(unittest.TestCase):
+    """The saved boxscore is loaded as the boxscore of Boston's opening
+    game, which is in the saved October schedule.
+    """
+
+    def setUp(self):
+        self.store = EntityStore()
+        self.games = SeasonSchedulePageParser(
+            load_fixture('NBA_2019_games-october.html')).get_data()
+        self.store.add_teams(
+            TeamsPageParser(load_fixture('teams.html')).get_data())
+        self.store.add_team_seasons(
+            SeasonSummaryPageParser(load_fixture('NBA_2019.html')).get_data())
+        self.store.add_games(2019, self.games)
+        self.store.add_player(PLAYER_URL, PlayerPageParser(
+            load_fixture('player_simmobe01.html')).get_data())
+        self.store.add_boxscore(
+            BOXSCORE_URL.format('201810160BOS'),
+            BoxscorePageParser(
+                load_fixture('boxscore_201810310GSW.html')).get_data())
+
+    def test_teams(self):
+        self.assertEqual(self.store.get_team('BOS')['name'], 'boston celtics')
+        self.assertIsNone(self.store.get_team('XXX'))
+        self.assertEqual(self.store.get_abbreviation('Boston Celtics', 2019),
+                         'BOS')
+        self.assertEqual(self.store.get_team_name('BOS', 2019),
+                         'boston celtics')
+        self.assertIsNone(self.store.get_team_name('BOS', 2018))
+        self.assertEqual(len(self.store.get_season_teams(2019)), 30)
+
+    def test_players(self):
+        player = self.store.get_player('simmobe01')
+        self.assertEqual(player['name'], 'Ben Simmons')
+        self.assertEqual(self.store.find_players('Ben Simmons'), [player])
+        self.assertEqual(self.store.find_players('Nobody'), [])
+
+    def test_index_players(self):
+        players = PlayerIndexPageParser(
+            load_fixture('players_s.html')).get_data()
+        self.store.add_players(players)
+        self.assertEqual(len(self.store.players), len(players))
+        # the player page is kept over the index row
+        self.assertEqual(self.store.get_player('simmobe01')['nationality'],
+                         'au')
+        self.assertEqual(len(self.store.find_players('Ben Simmons')), 1)
+        self.assertEqual(self.store.get_player('schaydo01')['name'],
+                         'Dolph Schayes')
+
+    def test_games(self):
+        game = self.store.get_game('201810160BOS')
+        self.assertEqual(game['visitor_team_name'], 'philadelphia 76ers')
+        self.assertEqual(self.store.get_games_on(date(2018, 10, 16)),
+                         self.games[:2])
+        self.assertEqual(self.store.get_season_games(2019), self.games)
+        celtics = [game for game in self.games if 'boston celtics' in
+                   (game['home_team_name'], game['visitor_team_name'])]
+        self.assertEqual(self.store.get_team_games('Boston Celtics'), celtics)
+        self.assertEqual(self.store.get_team_games('BOS', 2019), celtics)
+        self.assertEqual(self.store.get_team_games('BOS', 2018), [])
+
+    def test_player_lines(self):
+        lines = self.store.get_player_lines('Kevin Durant')
+        self.assertEqual([(line.game_id, line.team, line.table)
+                          for line in lines],
+                         [('201810160BOS', 'home_team', 'basic'),
+                          ('201810160BOS', 'home_team', 'advanced')])
+        self.assertEqual(self.store.get_player_lines('Kevin Durant', 2019),
+                         lines)
+        self.assertEqual(self.store.get_player_lines(
+            'Kevin Durant', table='advanced'), lines[1:])
+        self.assertEqual(self.store.get_player_lines('Kevin Durant', 2018),
+                         [])
+
+    def test_player_lines_by_id(self):
+        self.assertEqual(self.store.get_player_lines('duranke01'),
+                         self.store.get_player_lines('Kevin Durant'))
+        self.assertEqual(
+            len(self.store.get_player_lines('cookqu01', 2019)), 2)
+        self.assertEqual(self.store.get_player_lines(''), [])
+
+    def test_boxscore_added_again(self):
+        boxscore = BoxscorePageParser(
+            load_fixture('boxscore_201810310GSW.html')).get_data()
+        self.store.add_boxscore(BOXSCORE_URL.format('201810160BOS'), boxscore)
+        self.assertEqual(len(self.store.get_player_lines('Kevin Durant')), 2)
+        self.assertEqual(len(self.store.get_player_lines('duranke01')), 2)
+        self.assertEqual(
+            len(self.store.get_player_lines('Kevin Durant', 2019)), 2)
+
+    def test_boxscore_without_game(self):
+        self.store.add_boxscore(
+            BOXSCORE_URL.format('201810310GSW'), BoxscorePageParser(
+                load_fixture('boxscore_201810310GSW.html')).get_data(), 2019)
+        self.assertEqual(
+            [line.game_id for line in
+             self.store.get_player_lines('Kevin Durant', 2019)],
+            ['201810160BOS', '201810160BOS', '201810310GSW', '201810310GSW'])
+
+    def test_game_played(self):
+        """A game stored before it was played is replaced once it has a
+        boxscore.
+        """
+        store = EntityStore()
+        game = dict(self.games[0], box_score_text='', visitor_pts=-1,
+                    home_pts=-1)
+        store.add_games(2019, [game])
+        self.assertEqual(store.get_game((date(2018, 10, 16),
+                                         'boston celtics')), game)
+        store.add_games(2019, [self.games[0]])
+        self.assertIsNone(store.get_game((date(2018, 10, 16),
+                                          'boston celtics')))
+        self.assertEqual(store.get_team_games('boston celtics'),
+                         [self.games[0]])
+        self.assertEqual(store.get_games_on(date(2018, 10, 16)),
+                         [self.games[0]])
+
+    def test_interned(self):
+        names = [game['home_team_name'] for game in
+                 self.store.get_team_games('boston celtics')
+                 if game['home_team_name'] == 'boston celtics']
+        self.assertTrue(len(names) > 1)
+        self.assertTrue(all(name is sys.intern('boston celtics')
+                            for name in names))
+
+    def test_sink(self):
+        store = EntityStore()
+        store('seasons', '', {}, SeasonSummaryPageParser(
+            load_fixture('NBA_2019.html')).get_data())
+        store('schedules', '', {'league': 'NBA', 'end_year': 2019},
+              self.games)
+        store('boxscores', BOXSCORE_URL.format('201810160BOS'),
+              {'end_year': 2019}, BoxscorePageParser(
+                  load_fixture('boxscore_201810310GSW.html')).get_data())
+        self.assertEqual(store.get_abbreviation('boston celtics', 2019),
+                         'BOS')
+        self.assertEqual(len(store.get_season_games(2019)), len(self.games))
+        self.assertEqual(len(store.get_player_lines('Kevin Durant', 2019)), 2)
+
+    def test_snapshot(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, 'store.pickle')
+            self.store.save(path)
+            store = EntityStore.load(path)
+        self.assertEqual(store.get_team_games('BOS', 2019),
+                         self.store.get_team_games('BOS', 2019))
+        self.assertEqual(store.get_player_lines('Kevin Durant'),
+                         self.store.get_player_lines('Kevin Durant'))
+        self.assertIsInstance(store.get_player_lines('Kevin Durant')[0],
+                              BoxscoreLine)
@@ -0,0 +1,63 @@
+import unittest
+
+from fantalytix_python_crawler.crawler.sports_reference.basketball\
+    .boxscore_page_parser import BoxscorePageParser
+from fantalytix_python_crawler.crawler.sports_reference.basketball\
+    .field_schema import LINK, TEXT, Field, compile_fields, get_stat_fields
+from fantalytix_python_crawler.crawler.sports_reference.basketball\
+    .season_schedule_page_parser import SeasonSchedulePageParser
+
+from .fixtures import load_fixture
+
+class TestFieldSchema(unittest.TestCase):
+
+    def test_compile_fields(self):
+        self.assertEqual(compile_fields({
+            'pts': 'pts',
+            'team': Field('team_name', str.lower),
+            'url': Field('box_score_text', ('a', 'b'), LINK),
+        }), (
+            ('pts', 'pts', TEXT, ()),
+            ('team', 'team_name', TEXT, (str.lower,)),
+            ('url', 'box_score_text', LINK, ('a', 'b')),
+        ))
+        self.assertEqual(get_stat_fields(('fg', 'fga')),
+                         {'fg': 'fg', 'fga': 'fga'})
+        with self.assertRaises(ValueError):
+            compile_fields({'pts': Field('pts', source='title')})
+
+    def test_plan_is_compiled_once_per_class(self):
+        html = load_fixture('NBA_2019_games-october.html')
+        first = SeasonSchedulePageParser(html).get_plan()
+        self.assertIs(SeasonSchedulePageParser(html).get_plan(), first)
+        self.assertEqual([key for key, _, _, _ in first],
+                         list(SeasonSchedulePageParser.FIELDS))
+
+    def test_read_fields(self):
+        parser = SeasonSchedulePageParser(
+            load_fixture('NBA_2019_games-october.html'))
+        row = parser.get_handler().select(parser.ROWS_SELECTOR)[0]
+        cells = parser.get_cells_by_stat(row)
+        self.assertEqual(parser.read_fields(cells, compile_fields({
+            'home': Field('home_team_name', str.upper),
+            'pts': Field('home_pts', ('text_to_int', str)),
+            'link': Field('box_score_text', source=LINK),
+        })), {
+            'home': 'BOSTON CELTICS',
+            'pts': '105',
+            'link': row.select('td[data-stat=box_score_text] a')[0],
+        })
+        with self.assertRaises(KeyError):
+            parser.read_fields(cells, compile_fields({'x': 'not_a_stat'}))
+
+    def test_added_column(self):
+        """A subclass adds a stat by extending the declared fields."""
+        class BoxscoreWithGameScore(BoxscorePageParser):
+            BASIC_FIELDS = dict(BoxscorePageParser.BASIC_FIELDS,
+                                game_score=Field('pts', int))
+
+        html = load_fixture('boxscore_201810310GSW.html')
+        row = BoxscoreWithGameScore(html).get_data()['home_team']['basic'][0]
+        self.assertEqual(row['game_score'], int(row['pts']))
+        self.assertNotIn('game_score', BoxscorePageParser(html).get_data()
+                         ['home_team']['basic'][0])
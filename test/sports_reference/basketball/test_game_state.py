@@ -0,0 +1,98 @@
+import unittest
+
+from fantalytix_python_crawler.crawler.sports_reference.basketball\
+    .game_state import (ADDED, PLAYED, SCORE_CHANGED, GameStateStore,
+                        SeasonMonth, format_change)
+from fantalytix_python_crawler.crawler.sports_reference.basketball\
+    .season_schedule_page_parser import SeasonSchedulePageParser
+
+from .fixtures import load_fixture
+
+BOXSCORE_URL = 'https://www.basketball-reference.com/boxscores/201810160BOS.html'
+
+class TestGameStateStore(unittest.TestCase):
+
+    def setUp(self):
+        self.state = GameStateStore(':memory:', clock=lambda: 1000.0)
+        self.games = SeasonSchedulePageParser(
+            load_fixture('NBA_2019_games-october.html')).get_data()
+
+    def tearDown(self):
+        self.state.close()
+
+    def get_game(self, **fields):
+        return dict(self.games[0], **fields)
+
+    def test_added(self):
+        changes = self.state.update('NBA', self.games)
+        self.assertEqual(len(changes), 110)
+        self.assertEqual({change.kind for change in changes}, {ADDED})
+        self.assertEqual(len(self.state), 110)
+        self.assertEqual(self.state.update('NBA', self.games), [])
+        self.assertEqual(len(self.state.update('ABA', self.games)), 110)
+
+    def test_played(self):
+        upcoming = self.get_game(visitor_pts=None, home_pts=None,
+                                 box_score_text='')
+        self.state.update('NBA', [upcoming])
+        self.assertEqual(self.state.pending_boxscores('NBA', [upcoming]), [])
+        self.assertEqual(self.state.update('NBA', [upcoming]), [])
+
+        changes = self.state.update('NBA', [self.games[0]])
+        self.assertEqual([change.kind for change in changes], [PLAYED])
+        self.assertEqual(
+            self.state.pending_boxscores('NBA', [self.games[0]]),
+            [self.games[0]])
+
+    def test_score_changed(self):
+        self.state.update('NBA', [self.games[0]])
+        self.state.mark_fetched(BOXSCORE_URL)
+        self.assertEqual(
+            self.state.pending_boxscores('NBA', [self.games[0]]), [])
+
+        rescored = self.get_game(home_pts=106)
+        changes = self.state.update('NBA', [rescored])
+        self.assertEqual([change.kind for change in changes], [SCORE_CHANGED])
+        self.assertEqual(changes[0].previous, (87, 105))
+        self.assertEqual(self.state.pending_boxscores('NBA', [rescored]),
+                         [rescored])
+
+    def test_pending_until_fetched(self):
+        self.state.update('NBA', self.games)
+        self.assertEqual(
+            len(self.state.pending_boxscores('NBA', self.games)), 110)
+        self.state.mark_fetched('http://localhost/boxscores/201810160BOS.html')
+        pending = self.state.pending_boxscores('NBA', self.games)
+        self.assertEqual(len(pending), 109)
+        self.assertNotIn(self.games[0], pending)
+
+    def test_months(self):
+        self.assertIsNone(self.state.get_month('NBA', 2019))
+        self.state.reach_month('NBA', 2019, 'december', False)
+        self.state.reach_month('NBA', 2019, 'april', False)
+        self.state.reach_month('NBA', 2019, 'may', True)
+        self.state.reach_month('NBA', 2019, 'october-2019', False)
+        self.state.reach_month('NBA', 2018, 'june', True)
+        self.assertEqual(self.state.get_month('NBA', 2019),
+                         SeasonMonth('may', True))
+        self.assertEqual(self.state.get_month('NBA', 2019, 'april'),
+                         SeasonMonth('april', False))
+        self.assertEqual(self.state.get_month('NBA', 2019, 'march'),
+                         SeasonMonth('december', False))
+        self.assertIsNone(self.state.get_month('NBA', 2019, 'november'))
+        self.state.reach_month('NBA', 2019, 'april', True)
+        self.assertEqual(self.state.get_month('NBA', 2019, 'april'),
+                         SeasonMonth('april', True))
+
+    def test_format_change(self):
+        changes = self.state.update('NBA', [self.games[0]])
+        self.assertEqual(format_change(changes[0]),
+                         'added 2018-10-16 philadelphia 76ers 87 @ '
+                         'boston celtics 105')
+        changes = self.state.update('NBA', [self.get_game(home_pts=106)])
+        self.assertEqual(format_change(changes[0]),
+                         'score_changed 2018-10-16 philadelphia 76ers 87 @ '
+                         'boston celtics 106 (was 87-105)')
+
+if __name__ == "__main__":
+    unittest.main()
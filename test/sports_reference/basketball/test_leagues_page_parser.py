@@ -2,8 +2,6 @@ import unittest
 
 from datetime import date
 
-from urllib.request import urlopen
-
 from urllib.parse import urljoin
 
 from fantalytix_python_crawler.crawler.sports_reference.basketball\
@@ -11,6 +9,8 @@ from fantalytix_python_crawler.crawler.sports_reference.basketball\
 from fantalytix_python_crawler.crawler.sports_reference.basketball\
     .settings import (BASE_URL, LEAGUES_URL)
 
+from .fixtures import load_fixture, load_page
+
 class TestLeaguesPageParser(unittest.TestCase):
 
     def test_leagues_page_url(self):
@@ -27,8 +27,7 @@ class TestLeaguesPageParser(unittest.TestCase):
             (date(1999, 1, 1), date(2000, 1, 1)))
 
     def test_parser(self):
-        with urlopen(urljoin(BASE_URL, LEAGUES_URL)) as resp:
-            page = resp.read().decode('utf-8')
+        page = load_page(urljoin(BASE_URL, LEAGUES_URL))
         parser = LeaguesPageParser(page)
 
         seasons = [
@@ -63,5 +62,13 @@ class TestLeaguesPageParser(unittest.TestCase):
 
         self.assertEqual(len(parser.get_data()), 82)
 
+    def test_iter_rows(self):
+        page = load_fixture('leagues.html')
+        rows = LeaguesPageParser(page).iter_rows()
+        self.assertEqual(next(rows)['url'],
+            'https://www.basketball-reference.com/leagues/NBA_2019.html')
+        self.assertEqual(list(LeaguesPageParser(page).iter_rows()),
+            LeaguesPageParser(page).get_data())
+
 if __name__ == "__main__":
     unittest.main()
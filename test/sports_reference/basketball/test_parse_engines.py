@@ -0,0 +1,203 @@
+import unittest
+
+import io
+
+from fantalytix_python_crawler.crawler.sports_reference.basketball\
+    .base_page_parser import BasePageParser
+from fantalytix_python_crawler.crawler.sports_reference.basketball\
+    .boxscore_page_parser import BoxscorePageParser
+from fantalytix_python_crawler.crawler.sports_reference.basketball\
+    .leagues_page_parser import LeaguesPageParser
+from fantalytix_python_crawler.crawler.sports_reference.basketball\
+    .player_dir_page_parser import PlayersDirPageParser
+from fantalytix_python_crawler.crawler.sports_reference.basketball\
+    .player_page_parser import PlayerPageParser
+from fantalytix_python_crawler.crawler.sports_reference.basketball\
+    .season_schedule_page_parser import SeasonSchedulePageParser
+from fantalytix_python_crawler.crawler.sports_reference.basketball\
+    .season_summary_page_parser import SeasonSummaryPageParser
+from fantalytix_python_crawler.crawler.sports_reference.basketball\
+    .teams_page_parser import TeamsPageParser
+from fantalytix_python_crawler.crawler.sports_reference.basketball\
+    .parse_engines import (HTML_PARSER, LXML_HTML, RowStream,
+                           balance_end_tags, decode_markup, make_handler)
+
+from .fixtures import load_fixture
+
+class TestParseEngines(unittest.TestCase):
+    """Every parser must return identical data under html.parser and the
+    lxml.html engine.
+    """
+
+    PAGES = [
+        (LeaguesPageParser, 'leagues.html', 'get_data'),
+        (TeamsPageParser, 'teams.html', 'get_data'),
+        (PlayersDirPageParser, 'players.html', 'get_urls'),
+        (PlayerPageParser, 'player_simmobe01.html', 'get_data'),
+        (SeasonSchedulePageParser, 'NBA_2019_games-october.html', 'get_data'),
+        (SeasonSummaryPageParser, 'NBA_2019.html', 'get_data'),
+        (BoxscorePageParser, 'boxscore_201810310GSW.html', 'get_data'),
+    ]
+
+    def test_conformance(self):
+        for parser_class, fixture, getter in self.PAGES:
+            with self.subTest(parser=parser_class.__name__):
+                page = load_fixture(fixture)
+                expected = getattr(parser_class(page, HTML_PARSER), getter)()
+                actual = getattr(parser_class(page, LXML_HTML), getter)()
+                self.assertTrue(len(expected) > 0)
+                self.assertEqual(expected, actual)
+                self.assertEqual(repr(expected), repr(actual))
+                for parser in [HTML_PARSER, LXML_HTML]:
+                    self.assertEqual(expected, getattr(parser_class(
+                        page.encode('utf-8'), parser), getter)())
+
+    def test_regions(self):
+        """Building only the declared regions must not change the data."""
+        for parser_class, fixture, getter in self.PAGES:
+            with self.subTest(parser=parser_class.__name__):
+                page = load_fixture(fixture)
+                full_parser_class = type(
+                    parser_class.__name__, (parser_class,), {'REGIONS': None})
+                self.assertIsNotNone(parser_class(page).get_parse_only())
+                self.assertIsNone(full_parser_class(page).get_parse_only())
+                self.assertEqual(
+                    getattr(parser_class(page), getter)(),
+                    getattr(full_parser_class(page), getter)())
+
+    def test_commented_tables(self):
+        page = load_fixture('boxscore_201810310GSW.html')
+        for getter in ['get_line_score', 'get_four_factors']:
+            self.assertEqual(
+                getattr(BoxscorePageParser(page, HTML_PARSER), getter)(),
+                getattr(BoxscorePageParser(page, LXML_HTML), getter)())
+        page = load_fixture('NBA_2019.html')
+        for getter in ['get_team_stats', 'get_opponent_stats']:
+            self.assertEqual(
+                getattr(SeasonSummaryPageParser(page, HTML_PARSER), getter)(),
+                getattr(SeasonSummaryPageParser(page, LXML_HTML), getter)())
+
+    def test_player_dir_page_index(self):
+        parser = PlayersDirPageParser(load_fixture('players.html'), LXML_HTML)
+        self.assertEqual(len(parser.get_urls()), 25)
+
+    def test_decode_markup(self):
+        page = ('<html><head><meta charset="{}"></head>'
+                '<body><p>Nikola Joki\u0107</p></body></html>')
+        for encoding in ['utf-8', 'windows-1250']:
+            markup = page.format(encoding).encode(encoding)
+            self.assertEqual(decode_markup(markup), page.format(encoding))
+            self.assertEqual(make_handler(markup, LXML_HTML).find('p').text,
+                             make_handler(markup, HTML_PARSER).find('p').text)
+        self.assertEqual(decode_markup(page), page)
+
+    def test_balance_end_tags(self):
+        self.assertEqual(
+            balance_end_tags('<ul><li><a>A</a><div><p>x</p></li></ul>'),
+            '<ul><li><a>A</a><div><p>x</p></div></li></ul>'
+        )
+        self.assertEqual(
+            balance_end_tags('<p>a<br>b<img src="x"/></p></span>'),
+            '<p>a<br>b<img src="x"/></p></span>'
+        )
+        self.assertEqual(
+            balance_end_tags('<div><script>"<b></div>"</script>'
+                             '<!-- <i></div> --></div>'),
+            '<div><script>"<b></div>"</script><!-- <i></div> --></div>'
+        )
+
+    def test_lxml_node(self):
+        handler = make_handler(
+            '<table><tbody><tr class="thead full"><th data-stat="player">'
+            '<a href="/players/d/duranke01.html">Kevin Durant</a></th>'
+            '</tr></tbody></table>', LXML_HTML)
+        row = handler.table.tbody.find_all('tr')[0]
+        self.assertEqual(row.get('class'), ['thead', 'full'])
+        self.assertEqual(row.get('id'), None)
+        self.assertEqual(row.select('th[data-stat=player] a')[0]['href'],
+                         '/players/d/duranke01.html')
+        self.assertIs(type(row.text), str)
+        self.assertEqual(row.text, 'Kevin Durant')
+        self.assertEqual(len(row.find_all(['th', 'td'], recursive=False)), 1)
+        self.assertIsNone(row.td)
+        for name in ['parent', 'string', 'next_sibling', 'tbdoy']:
+            with self.assertRaises(AttributeError):
+                getattr(row, name)
+
+class TestStreamingParsers(unittest.IsolatedAsyncioTestCase):
+    """Pages given as streams must parse to the same rows as strings."""
+
+    PAGES = [
+        (LeaguesPageParser, 'leagues.html'),
+        (SeasonSchedulePageParser, 'NBA_2019_games-october.html'),
+    ]
+
+    def test_file_like(self):
+        for parser_class, fixture in self.PAGES:
+            with self.subTest(parser=parser_class.__name__):
+                page = load_fixture(fixture)
+                parser = parser_class(io.BytesIO(page.encode('utf-8')))
+                parser.CHUNK_SIZE = 4096
+                self.assertEqual(parser.get_data(),
+                                 parser_class(page).get_data())
+
+    def test_chunks(self):
+        page = load_fixture('NBA_2019_games-october.html')
+        chunks = [page[i:i + 1000] for i in range(0, len(page), 1000)]
+        self.assertEqual(list(SeasonSchedulePageParser(chunks).iter_rows()),
+                         SeasonSchedulePageParser(page).get_data())
+
+    async def test_async_chunks(self):
+        page = load_fixture('NBA_2019_games-october.html').encode('utf-8')
+
+        async def chunks():
+            for i in range(0, len(page), 1000):
+                yield page[i:i + 1000]
+
+        games = [game async for game in
+                 SeasonSchedulePageParser(chunks()).aiter_rows()]
+        self.assertEqual(games, SeasonSchedulePageParser(
+            page.decode('utf-8')).get_data())
+
+    def test_row_stream(self):
+        stream = RowStream('stats')
+        self.assertEqual(stream.feed('<table id="stats"><tr><td>1</td>'), [])
+        rows = stream.feed('</tr><tr><td>2</td></tr><tr>')
+        self.assertEqual([row.text for row in rows], ['1', '2'])
+        table = rows[0].element.getparent()
+        rows = stream.feed('<td>3</td></tr></table><table><tr><td>4</td>'
+                           '</tr></table>')
+        self.assertEqual([row.text for row in rows], ['3'])
+        self.assertEqual(len(table.findall('tr')), 1)
+        stream = RowStream('stats', 'tbody')
+        rows = stream.feed('<table id="stats"><thead><tr><th>a</th></tr>'
+                           '</thead><tbody><tr><td>1</td></tr></tbody>')
+        self.assertEqual([row.text for row in rows], ['1'])
+        self.assertEqual(
+            len(rows[0].element.getparent().getparent().findall('.//tr')), 1)
+
+    def test_default_row_data(self):
+        class StatsParser(BasePageParser):
+            ROWS_SELECTOR = 'table#stats tr'
+            STREAM_TABLE_ID = 'stats'
+            def __init__(self, html):
+                self.html = html
+                self.parser = 'html.parser'
+        html = ('<table id="stats"><tr><th data-stat="a">1</th>'
+                '<td data-stat="b">2</td></tr></table>')
+        self.assertEqual(list(StatsParser(html).iter_rows()),
+                         [{'a': '1', 'b': '2'}])
+        self.assertEqual(list(StatsParser([html]).iter_rows()),
+                         [{'a': '1', 'b': '2'}])
+
+    def test_row_stream_drops_page(self):
+        stream = RowStream('stats', 'tbody')
+        stream.feed('<html><body>' + '<div><p>text</p></div>' * 100)
+        rows = stream.feed('<table id="stats"><tbody><tr><td>1</td></tr>')
+        root = rows[0].element.getroottree().getroot()
+        self.assertLess(len(list(root.iter())), 10)
+        stream.feed('</tbody></table>' + '<div><p>text</p></div>' * 100)
+        self.assertLess(len(list(root.iter())), 10)
+
+if __name__ == "__main__":
+    unittest.main()
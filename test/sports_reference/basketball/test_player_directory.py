@@ -0,0 +1,94 @@
+import unittest
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from fantalytix_python_crawler.crawler.fetcher import Fetcher
+from fantalytix_python_crawler.crawler.sports_reference.basketball\
+    .player_directory import (PlayerDirectory, PlayerDirectoryCrawler,
+                              get_player_page_url)
+from fantalytix_python_crawler.crawler.sports_reference.basketball\
+    .player_index_page_parser import PlayerIndexPageParser
+
+from .fixtures import load_fixture
+
+def make_letter(letter):
+    """The S page with its generated players moved to `letter`. Ben
+    Simmons and Dolph Schayes stay, so they are listed twice.
+    """
+    return load_fixture('players_s.html').replace(
+        '/players/s/splay', '/players/{0}/{0}play'.format(letter))
+
+class TestPlayerDirectoryCrawler(unittest.IsolatedAsyncioTestCase):
+    """Serves the players page, the S page and a page derived from it for
+    A. The other 23 letters have no page.
+    """
+
+    async def asyncSetUp(self):
+        self.players_per_letter = len(PlayerIndexPageParser(
+            load_fixture('players_s.html')).get_data())
+        self.pages = {
+            '/players': load_fixture('players.html'),
+            '/players/a/': make_letter('a'),
+            '/players/s/': load_fixture('players_s.html'),
+        }
+        self.requests = []
+        app = web.Application()
+        app.router.add_get('/{path:.*}', self.handle)
+        self.server = TestServer(app)
+        await self.server.start_server()
+
+    async def asyncTearDown(self):
+        await self.server.close()
+
+    async def handle(self, request):
+        self.requests.append(request.path)
+        if request.path not in self.pages:
+            return web.Response(status=404)
+        return web.Response(text=self.pages[request.path],
+                            content_type='text/html')
+
+    async def crawl(self, **kwargs):
+        async with Fetcher(rate=1000, concurrency=8) as fetcher:
+            return await PlayerDirectoryCrawler(
+                fetcher, base_url=str(self.server.make_url('/'))).crawl(
+                    **kwargs)
+
+    async def test_crawl(self):
+        directory = await self.crawl()
+
+        self.assertEqual(len(self.requests), 26)
+        self.assertEqual(len(directory), 2 * self.players_per_letter - 2)
+        self.assertEqual(directory.get('simmobe01')['name'], 'Ben Simmons')
+        self.assertEqual(directory.get('aplay0001')['name'], 'Player S0')
+        self.assertEqual([player['player_id'] for player in
+                          directory.find('Player S0')],
+                         ['aplay0001', 'splay0001'])
+
+    async def test_letters(self):
+        directory = await self.crawl(letters='s')
+        self.assertEqual(self.requests, ['/players', '/players/s/'])
+        self.assertEqual(len(directory), self.players_per_letter)
+
+    async def test_missing_urls(self):
+        directory = await self.crawl(letters='s')
+        self.assertEqual(directory.get_missing(
+            ['simmobe01', 'duranke01', 'duranke01', '']), ['duranke01'])
+        self.assertEqual(
+            directory.get_missing_urls(['simmobe01', 'duranke01']),
+            ['https://www.basketball-reference.com/players/d/duranke01.html'])
+
+    def test_player_page_url(self):
+        self.assertEqual(
+            get_player_page_url('simmobe01'),
+            'https://www.basketball-reference.com/players/s/simmobe01.html')
+
+    def test_directory(self):
+        directory = PlayerDirectory([])
+        self.assertEqual(len(directory), 0)
+        self.assertIsNone(directory.get('simmobe01'))
+        self.assertNotIn('simmobe01', directory)
+        self.assertEqual(directory.find('Ben Simmons'), [])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+import unittest
+
+import os
+
+from datetime import date
+
+from urllib.parse import urljoin
+
+from fantalytix_python_crawler.crawler.sports_reference.basketball\
+    .player_index_page_parser import PlayerIndexPageParser
+from fantalytix_python_crawler.crawler.sports_reference.basketball\
+    .player_page_parser import PlayerPageParser
+from fantalytix_python_crawler.crawler.sports_reference.basketball\
+    .records import PlayerIndexRow
+from fantalytix_python_crawler.crawler.sports_reference.basketball\
+    .settings import BASE_URL
+
+from .fixtures import FIXTURES_DIR, load_fixture, load_page
+
+class TestPlayerIndexPageParser(unittest.TestCase):
+
+    def test_parser(self):
+        page = load_page(urljoin(BASE_URL, '/players/s/'))
+        players = PlayerIndexPageParser(page).get_data()
+
+        self.assertEqual(len(players), 162)
+        simmons = [player for player in players
+                   if player['player_id'] == 'simmobe01']
+        self.assertEqual(simmons, [{
+            'player_id': 'simmobe01',
+            'name': 'Ben Simmons',
+            'from_year': 2018,
+            'to_year': 2019,
+            'position': 'G-F',
+            'height': '6-10',
+            'weight': 230,
+            'birthday': date(1996, 7, 20),
+        }])
+        self.assertTrue(all(player['player_id'] for player in players))
+
+    def test_matches_player_page(self):
+        """The fields both pages show are read the same way."""
+        players = PlayerIndexPageParser(
+            load_fixture('players_s.html')).get_data()
+        simmons = [player for player in players
+                   if player['player_id'] == 'simmobe01'][0]
+        page = PlayerPageParser(load_fixture('player_simmobe01.html'))\
+            .get_data()
+        for key in ('player_id', 'name', 'height', 'weight', 'birthday'):
+            self.assertEqual(simmons[key], page[key])
+
+    def test_hall_of_fame(self):
+        players = PlayerIndexPageParser(
+            load_fixture('players_s.html')).get_data()
+        schayes = [player for player in players
+                   if player['player_id'] == 'schaydo01'][0]
+        self.assertEqual(schayes['name'], 'Dolph Schayes')
+        self.assertEqual(schayes['birthday'], date(1928, 5, 19))
+
+    def test_empty_cells(self):
+        players = PlayerIndexPageParser(
+            load_fixture('players_s.html')).get_data()
+        self.assertTrue(any(player['weight'] is None for player in players))
+        self.assertTrue(any(player['birthday'] is None for player in players))
+
+    def test_engines_and_records(self):
+        page = load_fixture('players_s.html')
+        players = PlayerIndexPageParser(page).get_data()
+        self.assertEqual(
+            PlayerIndexPageParser(page, parser='lxml.html').get_data(),
+            players)
+        records = PlayerIndexPageParser(page, records=True).get_data()
+        self.assertIsInstance(records[0], PlayerIndexRow)
+        self.assertEqual(records, players)
+
+    def test_stream(self):
+        page = load_fixture('players_s.html')
+        with open(os.path.join(FIXTURES_DIR, 'players_s.html'), 'rb') as f:
+            self.assertEqual(list(PlayerIndexPageParser(f).iter_rows()),
+                             PlayerIndexPageParser(page).get_data())
+
+if __name__ == "__main__":
+    unittest.main()
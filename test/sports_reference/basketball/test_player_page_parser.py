@@ -2,8 +2,6 @@ import unittest
 
 from datetime import date
 
-from urllib.request import urlopen
-
 from urllib.parse import urljoin
 
 from fantalytix_python_crawler.crawler.sports_reference.basketball\
@@ -11,6 +9,8 @@ from fantalytix_python_crawler.crawler.sports_reference.basketball\
 from fantalytix_python_crawler.crawler.sports_reference.basketball\
     .settings import (BASE_URL, PLAYER_URL)
 
+from .fixtures import load_page
+
 class TestPlayerPageParser(unittest.TestCase):
 
     def test_player_page_url(self):
@@ -35,6 +35,7 @@ class TestPlayerPageParser(unittest.TestCase):
         player_url = ('https://www.basketball-reference.com/players/'
                       's/simmobe01.html')
         player = {
+            'player_id': 'simmobe01',
             'name': 'Ben Simmons',
             'height': '6-10',
             'weight': 230,
@@ -43,8 +44,7 @@ class TestPlayerPageParser(unittest.TestCase):
             'nationality': 'au'
         }
 
-        with urlopen(player_url) as resp:
-            page = resp.read().decode('utf-8')
+        page = load_page(player_url)
         parser = PlayerPageParser(page)
 
         self.assertEqual(player, parser.get_data())
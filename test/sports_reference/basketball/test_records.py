@@ -0,0 +1,80 @@
+import unittest
+
+import pickle
+
+from fantalytix_python_crawler.crawler.sports_reference.basketball\
+    .boxscore_page_parser import BoxscorePageParser
+from fantalytix_python_crawler.crawler.sports_reference.basketball\
+    .leagues_page_parser import LeaguesPageParser
+from fantalytix_python_crawler.crawler.sports_reference.basketball\
+    .player_page_parser import PlayerPageParser
+from fantalytix_python_crawler.crawler.sports_reference.basketball\
+    .season_schedule_page_parser import SeasonSchedulePageParser
+from fantalytix_python_crawler.crawler.sports_reference.basketball\
+    .teams_page_parser import TeamsPageParser
+from fantalytix_python_crawler.crawler.sports_reference.basketball\
+    .records import (AdvancedBoxScoreRow, BasicBoxScoreRow, DidNotPlayRow,
+                     Game, Player, Season, Team)
+
+from .fixtures import load_fixture
+
+class TestRecords(unittest.TestCase):
+
+    PAGES = [
+        (LeaguesPageParser, 'leagues.html', Season),
+        (TeamsPageParser, 'teams.html', Team),
+        (SeasonSchedulePageParser, 'NBA_2019_games-october.html', Game),
+    ]
+
+    def test_rows(self):
+        for parser_class, fixture, record_class in self.PAGES:
+            with self.subTest(parser=parser_class.__name__):
+                page = load_fixture(fixture)
+                expected = parser_class(page).get_data()
+                records = parser_class(page, records=True).get_data()
+                self.assertEqual(records, expected)
+                self.assertEqual([record.as_dict() for record in records],
+                                 expected)
+                self.assertTrue(all(type(record) is record_class
+                                    for record in records))
+
+    def test_player(self):
+        page = load_fixture('player_simmobe01.html')
+        player = PlayerPageParser(page, records=True).get_data()
+        self.assertIsInstance(player, Player)
+        self.assertEqual(player, PlayerPageParser(page).get_data())
+        self.assertEqual(player.name, 'Ben Simmons')
+
+    def test_boxscore(self):
+        page = load_fixture('boxscore_201810310GSW.html')
+        expected = BoxscorePageParser(page).get_data()
+        data = BoxscorePageParser(page, records=True).get_data()
+        self.assertEqual(data, expected)
+        home = data['home_team']
+        self.assertIsInstance(home['basic'][0], BasicBoxScoreRow)
+        self.assertIsInstance(home['advanced'][0], AdvancedBoxScoreRow)
+        self.assertIsInstance(home['basic'][11], DidNotPlayRow)
+        self.assertEqual(list(home['basic'][0].keys()),
+                         list(expected['home_team']['basic'][0].keys()))
+
+    def test_record(self):
+        game = SeasonSchedulePageParser(
+            load_fixture('NBA_2019_games-october.html'),
+            records=True).get_data()[0]
+        self.assertFalse(hasattr(game, '__dict__'))
+        self.assertEqual(game['home_pts'], game.home_pts)
+        self.assertEqual(game.get('missing', 0), 0)
+        self.assertIn('attendance', game)
+        with self.assertRaises(KeyError):
+            game['missing']
+        self.assertEqual(pickle.loads(pickle.dumps(game, protocol=5)), game)
+        self.assertEqual(Season('NBA', 1, 2, 'url'),
+                         Season(league='NBA', start_year=1, end_year=2,
+                                url='url'))
+        self.assertNotEqual(Season('NBA', 1, 2, 'url'),
+                            Team('NBA', 1, 2, 'url'))
+        with self.assertRaises(TypeError):
+            Season('NBA')
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,145 @@
+import unittest
+
+from datetime import date
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from fantalytix_python_crawler.crawler.fetcher import Fetcher
+from fantalytix_python_crawler.crawler.sports_reference.basketball\
+    .season_schedule import (SeasonSchedule, SeasonScheduleAssembler,
+                             merge_months)
+from fantalytix_python_crawler.crawler.sports_reference.basketball\
+    .season_schedule_page_parser import SeasonSchedulePageParser
+
+from .fixtures import load_fixture
+
+PLAYOFFS_ROW = ('<tr class="thead"><th colspan="10" data-stat="date_game">'
+                'Playoffs</th></tr>')
+
+def make_month(month, year, playoffs_after=None):
+    """The October page with its games moved to `month` of `year`, and the
+    playoffs header row after the first `playoffs_after` games.
+    """
+    page = load_fixture('NBA_2019_games-october.html')
+    page = page.replace(', Oct ', ', {} '.format(month)).replace(
+        ', 2018</a>', ', {}</a>'.format(year))
+    if playoffs_after is not None:
+        start = page.index('<tbody>')
+        position = start
+        for _ in range(playoffs_after + 1):
+            position = page.index('<tr ', position + 1)
+        page = page[:position] + PLAYOFFS_ROW + page[position:]
+    return page
+
+class TestSeasonScheduleAssembler(unittest.IsolatedAsyncioTestCase):
+    """Serves the October page and pages derived from it for December,
+    January (December's games again), March (the playoffs start after 10
+    games) and May. The other months have no page. The derived months
+    have 31 days, so every October date exists in them.
+    """
+
+    async def asyncSetUp(self):
+        self.games_per_month = len(SeasonSchedulePageParser(
+            load_fixture('NBA_2019_games-october.html')).get_data())
+        december = make_month('Dec', 2018)
+        self.pages = {
+            '/leagues/NBA_2019_games-october.html':
+                load_fixture('NBA_2019_games-october.html'),
+            '/leagues/NBA_2019_games-december.html': december,
+            '/leagues/NBA_2019_games-january.html': december,
+            '/leagues/NBA_2019_games-march.html':
+                make_month('Mar', 2019, playoffs_after=10),
+            '/leagues/NBA_2019_games-may.html': make_month('May', 2019),
+        }
+        self.requests = []
+        app = web.Application()
+        app.router.add_get('/{path:.*}', self.handle)
+        self.server = TestServer(app)
+        await self.server.start_server()
+
+    async def asyncTearDown(self):
+        await self.server.close()
+
+    async def handle(self, request):
+        self.requests.append(request.path)
+        if request.path not in self.pages:
+            return web.Response(status=404)
+        return web.Response(text=self.pages[request.path],
+                            content_type='text/html')
+
+    async def assemble(self, **kwargs):
+        async with Fetcher(rate=1000, concurrency=8) as fetcher:
+            return await SeasonScheduleAssembler(
+                fetcher, base_url=str(self.server.make_url('/')),
+                **kwargs).assemble('NBA', 2019)
+
+    async def test_assemble(self):
+        schedule = await self.assemble(parser='lxml.html')
+
+        self.assertEqual(len(schedule), 4 * self.games_per_month)
+        self.assertEqual(self.requests.count(
+            '/leagues/NBA_2019_games-october.html'), 1)
+        self.assertEqual(len(self.requests), 9)
+        dates = [game['game_date'] for game in schedule]
+        self.assertEqual(dates, sorted(dates))
+        self.assertEqual(dates[0], date(2018, 10, 16))
+
+        types = [(game['game_date'].month, game['type']) for game in schedule]
+        self.assertEqual(types.count((10, 'regular')), self.games_per_month)
+        self.assertEqual(types.count((12, 'regular')), self.games_per_month)
+        self.assertEqual(types.count((3, 'regular')), 10)
+        self.assertEqual(types.count((3, 'playoffs')),
+                         self.games_per_month - 10)
+        self.assertEqual(types.count((5, 'playoffs')), self.games_per_month)
+
+    async def test_indexes(self):
+        schedule = await self.assemble()
+
+        opening = schedule.get_games_on(date(2018, 10, 16))
+        self.assertEqual([game['home_team_name'] for game in opening],
+                         ['boston celtics', 'brooklyn nets'])
+        self.assertEqual(schedule.get_games_on(date(2018, 7, 1)), [])
+        self.assertEqual(sum(len(schedule.get_games_on(day))
+                             for day in schedule.get_dates()), len(schedule))
+
+        celtics = schedule.get_team_games('Boston Celtics')
+        self.assertTrue(celtics)
+        self.assertEqual(celtics, [
+            game for game in schedule if 'boston celtics' in
+            (game['home_team_name'], game['visitor_team_name'])])
+        self.assertEqual(sum(len(schedule.get_team_games(team))
+                             for team in schedule.get_teams()),
+                         2 * len(schedule))
+
+    async def test_first_month_missing(self):
+        del self.pages['/leagues/NBA_2019_games-october.html']
+        schedule = await self.assemble()
+        self.assertEqual(self.requests[:3], [
+            '/leagues/NBA_2019_games-october.html',
+            '/leagues/NBA_2019_games-november.html',
+            '/leagues/NBA_2019_games-december.html'])
+        self.assertEqual(len(schedule), 3 * self.games_per_month)
+
+    async def test_no_schedule(self):
+        self.pages.clear()
+        schedule = await self.assemble()
+        self.assertEqual(len(schedule), 0)
+        self.assertEqual(len(self.requests), 9)
+
+    def test_merge_copies(self):
+        """The caller's games keep the type their page gave them."""
+        march = SeasonSchedulePageParser(
+            make_month('Mar', 2019, playoffs_after=10)).get_data()
+        may = SeasonSchedulePageParser(make_month('May', 2019)).get_data()
+        games = merge_months([(march, 'playoffs'), (may, 'regular')])
+        self.assertEqual(set(game['type'] for game in may), {'regular'})
+        self.assertEqual(set(game['type'] for game in games
+                             if game['game_date'].month == 5), {'playoffs'})
+        self.assertTrue(all(game is not merged for game in march + may
+                            for merged in games))
+
+    def test_schedule(self):
+        schedule = SeasonSchedule([])
+        self.assertEqual(schedule.get_team_games('boston celtics'), [])
+        self.assertEqual(list(schedule), [])
@@ -2,8 +2,6 @@ import unittest
 
 from datetime import date, time
 
-from urllib.request import urlopen
-
 from urllib.parse import urljoin
 
 from fantalytix_python_crawler.crawler.sports_reference.basketball\
@@ -11,6 +9,8 @@ from fantalytix_python_crawler.crawler.sports_reference.basketball\
 from fantalytix_python_crawler.crawler.sports_reference.basketball\
     .settings import (BASE_URL, SEASON_SCHEDULE_URL)
 
+from .fixtures import load_fixture, load_page
+
 class TestSeasonSchedulePageParser(unittest.TestCase):
 
     def setUp(self):
@@ -40,8 +40,7 @@ class TestSeasonSchedulePageParser(unittest.TestCase):
 
     def test_parser(self):
         abs_url=urljoin(BASE_URL, SEASON_SCHEDULE_URL.format(**self.url_params))
-        with urlopen(abs_url) as resp:
-            page = resp.read().decode('utf-8')
+        page = load_page(abs_url)
         parser = SeasonSchedulePageParser(page)
 
         season_schedules = [
@@ -49,8 +48,10 @@ class TestSeasonSchedulePageParser(unittest.TestCase):
                 'game_date': date(2018, 10, 16),
                 'game_start_time': time(20, 0),
                 'visitor_team_name': 'philadelphia 76ers',
+                'visitor_team_id': 'PHI',
                 'visitor_pts': 87,
                 'home_team_name': 'boston celtics',
+                'home_team_id': 'BOS',
                 'home_pts': 105,
                 'box_score_text': ('https://www.basketball-reference.com/'
                                    'boxscores/201810160BOS.html'),
@@ -65,5 +66,24 @@ class TestSeasonSchedulePageParser(unittest.TestCase):
 
         self.assertEqual(len(parser.get_data()), 110)
 
+    def test_iter_rows(self):
+        page = load_fixture('NBA_2019_games-october.html')
+        rows = SeasonSchedulePageParser(page).iter_rows()
+        self.assertEqual(next(rows)['home_team_name'], 'boston celtics')
+        self.assertEqual(list(SeasonSchedulePageParser(page).iter_rows()),
+            SeasonSchedulePageParser(page).get_data())
+
+    def test_month_urls(self):
+        parser = SeasonSchedulePageParser(
+            load_fixture('NBA_2019_games-october.html'))
+        october = urljoin(BASE_URL, SEASON_SCHEDULE_URL.format(
+            **self.url_params))
+        urls = parser.get_month_urls()
+        self.assertEqual(len(urls), 9)
+        self.assertEqual(urls[0], october)
+        self.assertEqual(parser.get_current_month_url(), october)
+        self.assertIsNone(SeasonSchedulePageParser(
+            '<html></html>').get_current_month_url())
+
 if __name__ == "__main__":
     unittest.main()
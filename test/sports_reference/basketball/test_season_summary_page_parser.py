@@ -2,8 +2,6 @@ import unittest
 
 from datetime import date, time
 
-from urllib.request import urlopen
-
 from urllib.parse import urljoin
 
 from fantalytix_python_crawler.crawler.sports_reference.basketball\
@@ -11,6 +9,8 @@ from fantalytix_python_crawler.crawler.sports_reference.basketball\
 from fantalytix_python_crawler.crawler.sports_reference.basketball\
     .settings import (BASE_URL, SEASON_SUMMARY_URL)
 
+from .fixtures import load_fixture, load_page
+
 class TestSeasonSummaryPageParser(unittest.TestCase):
 
     def setUp(self):
@@ -24,8 +24,7 @@ class TestSeasonSummaryPageParser(unittest.TestCase):
 
     def test_parser(self):
         abs_url=urljoin(BASE_URL, SEASON_SUMMARY_URL.format(**self.url_params))
-        with urlopen(abs_url) as resp:
-            page = resp.read().decode('utf-8')
+        page = load_page(abs_url)
         parser = SeasonSummaryPageParser(page)
 
         teams = [
@@ -50,6 +49,34 @@ class TestSeasonSummaryPageParser(unittest.TestCase):
 
         self.assertEqual(len(parser.get_data()), 30)
 
+    def test_team_and_opponent_stats(self):
+        parser = SeasonSummaryPageParser(load_fixture('NBA_2019.html'))
+        team_stats = parser.get_team_stats()
+        opponent_stats = parser.get_opponent_stats()
+
+        self.assertEqual(len(team_stats), 30)
+        self.assertEqual(len(opponent_stats), 30)
+        self.assertEqual(team_stats[0]['ranker'], '1')
+        self.assertEqual(team_stats[0]['g'], '82')
+        self.assertEqual(
+            {team['abbreviation'] for team in team_stats},
+            {team['abbreviation'] for team in opponent_stats}
+        )
+        self.assertIs(parser.get_commented_table('team-stats-per_game'),
+                      parser.get_commented_table('team-stats-per_game'))
+
+    def test_find_commented_markup(self):
+        parser = SeasonSummaryPageParser(
+            '<div id="all_a"><table id="a"></table></div>'
+            '<div id="all_b"><!--<table id="b"><tr></tr></table>--></div>'
+            '<!-- --><div id="all_c"><table id="c"></table></div>')
+
+        self.assertEqual(parser.find_commented_markup('b'),
+                         '<table id="b"><tr></tr></table>')
+        self.assertIsNone(parser.find_commented_markup('a'))
+        self.assertIsNone(parser.find_commented_markup('c'))
+        self.assertIsNone(parser.find_commented_markup('d'))
+
     def test_get_abbreviation_and_year_from_url(self):
         parser = SeasonSummaryPageParser("")
 
@@ -66,5 +93,10 @@ class TestSeasonSummaryPageParser(unittest.TestCase):
             parser.get_abbreviation_and_year_from_url(
                 '/teams/BADABBR/2019.html'))
 
+    def test_iter_rows(self):
+        page = load_fixture('NBA_2019.html')
+        self.assertEqual(list(SeasonSummaryPageParser(page).iter_rows()),
+            SeasonSummaryPageParser(page).get_data())
+
 if __name__ == "__main__":
     unittest.main()
@@ -1,5 +1,4 @@
 import unittest
-from urllib.request import urlopen
 
 from urllib.parse import urljoin
 
@@ -8,6 +7,7 @@ from fantalytix_python_crawler.crawler.sports_reference.basketball\
 from fantalytix_python_crawler.crawler.sports_reference.basketball\
     .settings import (BASE_URL, TEAMS_URL)
 
+from .fixtures import load_page
 
 class TestTeamsPageParser(unittest.TestCase):
 
@@ -18,8 +18,7 @@ class TestTeamsPageParser(unittest.TestCase):
         )
 
     def test_parser(self):
-        with urlopen(urljoin(BASE_URL, TEAMS_URL)) as resp:
-            page = resp.read().decode('utf-8')
+        page = load_page(urljoin(BASE_URL, TEAMS_URL))
         parser = TeamsPageParser(page)
 
         teams = [
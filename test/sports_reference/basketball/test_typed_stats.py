@@ -0,0 +1,89 @@
+import unittest
+
+import math
+
+from array import array
+
+from fantalytix_python_crawler.crawler.sports_reference.basketball\
+    .boxscore_page_parser import BoxscorePageParser
+from fantalytix_python_crawler.crawler.sports_reference.basketball\
+    .typed_stats import NULLS, NULL_INT, convert_column, get_stat_columns
+
+from .fixtures import load_fixture
+
+class TestTypedStats(unittest.TestCase):
+
+    def test_convert_column(self):
+        self.assertEqual(convert_column('pts', ['24', '0', '']),
+                         array('q', [24, 0, NULL_INT]))
+        self.assertEqual(convert_column('plus_minus', ['+12', '-1', '0']),
+                         array('q', [12, -1, 0]))
+        self.assertEqual(convert_column('mp', ['40:09', '0:00', '', '5:30']),
+                         array('q', [2409, 0, NULL_INT, 330]))
+        self.assertEqual(convert_column('mp', ['0:0', '']),
+                         array('q', [0, NULL_INT]))
+        fg_pct = convert_column('fg_pct', ['.588', '1.000', ''])
+        self.assertEqual(fg_pct[:2], array('d', [0.588, 1.0]))
+        self.assertTrue(math.isnan(fg_pct[2]))
+        self.assertEqual(convert_column('usg_pct', ['20.4']),
+                         array('d', [20.4]))
+        self.assertEqual(convert_column('ast', []), array('q'))
+
+    def test_get_stat_columns(self):
+        rows = [
+            {'player': 'A', 'mp': '1:01', 'pts': '3', 'fg_pct': '.5'},
+            {'player': 'B', 'did_not_play': 'Did Not Play'},
+            {'player': 'C', 'mp': '0:59', 'pts': '', 'fg_pct': '1.0'},
+        ]
+        self.assertEqual(get_stat_columns(rows, ('mp', 'pts', 'fg_pct')), {
+            'player': ['A', 'C'],
+            'mp': array('q', [61, 59]),
+            'pts': array('q', [3, 0]),
+            'fg_pct': array('d', [0.5, 1.0]),
+            NULLS: {'mp': bytearray([0, 0]), 'pts': bytearray([0, 1])},
+        })
+        columns = get_stat_columns(rows, ('pts',))
+        self.assertEqual(sum(columns['pts']), 3)
+        self.assertEqual(len(columns['pts']) - sum(columns[NULLS]['pts']), 1)
+
+    def test_typed_boxscore(self):
+        page = load_fixture('boxscore_201810310GSW.html')
+        data = BoxscorePageParser(page, typed=True).get_data()
+        durant = data['home_team']['basic'][0]
+        self.assertEqual(durant['mp'], 2409)
+        self.assertEqual(durant['pts'], 24)
+        self.assertEqual(durant['fg_pct'], 0.588)
+        self.assertEqual(durant['plus_minus'], 12)
+        self.assertIs(durant['is_starter'], True)
+        self.assertEqual(data['home_team']['advanced'][0]['off_rtg'], 131.0)
+        self.assertEqual(data['home_team']['basic'][11],
+                         {'player': 'Quinn Cook',
+                          'player_id': 'cookqu01',
+                          'did_not_play': 'Did Not Play'})
+        looney = [row for row in data['home_team']['basic']
+                  if row['player'] == 'Kevon Looney'][0]
+        self.assertIsNone(looney['fg_pct'])
+
+        records = BoxscorePageParser(page, records=True,
+                                     typed=True).get_data()
+        self.assertEqual(records, data)
+
+    def test_get_columns(self):
+        page = load_fixture('boxscore_201810310GSW.html')
+        parser = BoxscorePageParser(page)
+        columns = parser.get_columns()['home_team']['basic']
+        text = parser.get_data()['home_team']['basic']
+        self.assertEqual(len(columns['player']), len(columns['pts']))
+        self.assertEqual(len(columns['pts']), 11)
+        self.assertEqual(columns[NULLS]['pts'], bytearray(11))
+        self.assertNotIn('fg_pct', columns[NULLS])
+        looney = columns['player'].index('Kevon Looney')
+        self.assertTrue(math.isnan(columns['fg_pct'][looney]))
+        self.assertEqual(sum(columns['pts']), sum(
+            int(row['pts']) for row in text if 'pts' in row))
+        self.assertEqual(text[0]['pts'], '24')
+        typed = BoxscorePageParser(page, typed=True).get_columns()
+        self.assertEqual(repr(typed), repr(parser.get_columns()))
+
+if __name__ == "__main__":
+    unittest.main()
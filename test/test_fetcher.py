@@ -0,0 +1,212 @@
+import unittest
+
+import asyncio
+
+import gzip
+
+import time
+
+import brotli
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from fantalytix_python_crawler.crawler.fetcher import (Fetcher, FetchError,
+                                                       TokenBucket)
+from fantalytix_python_crawler.crawler.sports_reference.basketball\
+    .boxscore_page_parser import BoxscorePageParser
+
+from .sports_reference.basketball.fixtures import load_fixture
+
+class TestFetcher(unittest.IsolatedAsyncioTestCase):
+    """Runs the fetcher against a local stand-in for the site."""
+
+    BOXSCORE_PATH = '/boxscores/201810310GSW.html'
+
+    async def asyncSetUp(self):
+        self.page = load_fixture('boxscore_201810310GSW.html')
+        self.hits = dict()
+        self.peers = set()
+        app = web.Application()
+        app.router.add_get(self.BOXSCORE_PATH, self.boxscore)
+        app.router.add_get('/gzip', self.gzip)
+        app.router.add_get('/brotli', self.brotli)
+        app.router.add_get('/flaky', self.flaky)
+        app.router.add_get('/limited', self.limited)
+        app.router.add_get('/missing', self.missing)
+        app.router.add_get('/dropped', self.dropped)
+        app.router.add_get('/slow', self.slow)
+        app.router.add_get('/hung', self.hung)
+        self.server = TestServer(app)
+        await self.server.start_server()
+
+    async def asyncTearDown(self):
+        await self.server.close()
+
+    def hit(self, request):
+        self.peers.add(request.transport.get_extra_info('peername'))
+        self.hits[request.path] = self.hits.get(request.path, 0) + 1
+        return self.hits[request.path]
+
+    async def boxscore(self, request):
+        self.hit(request)
+        return web.Response(text=self.page, content_type='text/html')
+
+    async def gzip(self, request):
+        self.hit(request)
+        return web.Response(
+            body=gzip.compress(self.page.encode('utf-8')),
+            headers={'Content-Encoding': 'gzip',
+                     'Content-Type': 'text/html; charset=utf-8'})
+
+    async def brotli(self, request):
+        self.hit(request)
+        return web.Response(
+            body=brotli.compress(self.page.encode('utf-8')),
+            headers={'Content-Encoding': 'br',
+                     'Content-Type': 'text/html; charset=utf-8'})
+
+    async def flaky(self, request):
+        if self.hit(request) < 3:
+            return web.Response(status=503)
+        return web.Response(text='ok')
+
+    async def limited(self, request):
+        if self.hit(request) < 2:
+            return web.Response(status=429, headers={'Retry-After': '0'})
+        return web.Response(text='ok')
+
+    async def missing(self, request):
+        self.hit(request)
+        return web.Response(status=404)
+
+    async def dropped(self, request):
+        if self.hit(request) % 2:
+            request.transport.close()
+            return web.Response(text='lost')
+        return web.Response(text='ok')
+
+    async def slow(self, request):
+        if self.hit(request) < 2:
+            await asyncio.sleep(1)
+        return web.Response(text='ok')
+
+    async def hung(self, request):
+        self.hit(request)
+        await asyncio.sleep(1)
+        return web.Response(text='ok')
+
+    def url(self, path):
+        return str(self.server.make_url(path))
+
+    def fetcher(self, **kwargs):
+        kwargs.setdefault('rate', 1000)
+        kwargs.setdefault('backoff', 0.01)
+        return Fetcher(**kwargs)
+
+    async def test_fetch_page(self):
+        async with self.fetcher() as fetcher:
+            parser = await fetcher.fetch_page(
+                self.url(self.BOXSCORE_PATH), BoxscorePageParser)
+        self.assertEqual(parser.get_data(),
+                         BoxscorePageParser(self.page).get_data())
+
+    async def test_compressed_bodies(self):
+        async with self.fetcher() as fetcher:
+            self.assertEqual(await fetcher.fetch(self.url('/gzip')),
+                             self.page)
+            self.assertEqual(await fetcher.fetch(self.url('/brotli')),
+                             self.page)
+
+    async def test_keep_alive(self):
+        async with self.fetcher(concurrency=1) as fetcher:
+            for _ in range(5):
+                await fetcher.fetch(self.url(self.BOXSCORE_PATH))
+        self.assertEqual(self.hits[self.BOXSCORE_PATH], 5)
+        self.assertEqual(len(self.peers), 1)
+
+    async def test_fetch_all_keeps_order(self):
+        urls = [self.url(path) for path in
+                ['/gzip', self.BOXSCORE_PATH, '/flaky', '/brotli']]
+        async with self.fetcher(concurrency=2) as fetcher:
+            pages = await fetcher.fetch_all(urls)
+        self.assertEqual(pages, [self.page, self.page, 'ok', self.page])
+
+    async def test_retries(self):
+        async with self.fetcher() as fetcher:
+            self.assertEqual(await fetcher.fetch(self.url('/flaky')), 'ok')
+            self.assertEqual(await fetcher.fetch(self.url('/limited')), 'ok')
+        self.assertEqual(self.hits['/flaky'], 3)
+        self.assertEqual(self.hits['/limited'], 2)
+
+    async def test_errors(self):
+        async with self.fetcher(retries=1) as fetcher:
+            with self.assertRaises(FetchError) as context:
+                await fetcher.fetch(self.url('/missing'))
+            self.assertEqual(context.exception.status, 404)
+            with self.assertRaises(FetchError) as context:
+                await fetcher.fetch(self.url('/flaky'))
+            self.assertEqual(context.exception.status, 503)
+        self.assertEqual(self.hits['/missing'], 1)
+        self.assertEqual(self.hits['/flaky'], 2)
+
+    async def test_retries_connection_errors(self):
+        async with self.fetcher() as fetcher:
+            self.assertEqual(await fetcher.fetch(self.url('/dropped')), 'ok')
+            chunks = [chunk async for chunk in fetcher.iter_chunks(
+                self.url('/dropped'))]
+            self.assertEqual(chunks, [b'ok'])
+        self.assertEqual(self.hits['/dropped'], 4)
+        async with self.fetcher(timeout=0.2) as fetcher:
+            self.assertEqual(await fetcher.fetch(self.url('/slow')), 'ok')
+        self.assertEqual(self.hits['/slow'], 2)
+
+    async def test_connection_errors_run_out(self):
+        async with self.fetcher(retries=1, timeout=0.2) as fetcher:
+            with self.assertRaises(asyncio.TimeoutError):
+                await fetcher.fetch(self.url('/hung'))
+        self.assertEqual(self.hits['/hung'], 2)
+
+    async def test_iter_chunks(self):
+        async with self.fetcher() as fetcher:
+            chunks = [chunk async for chunk in fetcher.iter_chunks(
+                self.url('/gzip'), chunk_size=1024)]
+            self.assertTrue(len(chunks) > 1)
+            self.assertEqual(b''.join(chunks).decode('utf-8'), self.page)
+            chunks = [chunk async for chunk in fetcher.iter_chunks(
+                self.url('/flaky'))]
+            self.assertEqual(chunks, [b'ok'])
+            with self.assertRaises(FetchError):
+                async for chunk in fetcher.iter_chunks(self.url('/missing')):
+                    pass
+
+    async def test_rate_limit(self):
+        async with self.fetcher(rate=20, burst=1, concurrency=4) as fetcher:
+            start = time.monotonic()
+            await fetcher.fetch_all([self.url('/gzip')] * 5)
+            elapsed = time.monotonic() - start
+        # the first request uses the initial token, the next four wait 50ms
+        self.assertGreaterEqual(elapsed, 0.19)
+
+class TestTokenBucket(unittest.IsolatedAsyncioTestCase):
+
+    async def test_burst_then_rate(self):
+        now = [0.0]
+        bucket = TokenBucket(rate=2, capacity=3, clock=lambda: now[0])
+        for _ in range(3):
+            await bucket.acquire()
+        self.assertLess(bucket.tokens, 1)
+        now[0] += 0.5
+        await bucket.acquire()
+        self.assertAlmostEqual(bucket.tokens, 0)
+
+    def test_retry_delay(self):
+        fetcher = Fetcher(backoff=1.0, max_backoff=4.0)
+        self.assertEqual(fetcher.get_retry_delay(0, '2'), 2.0)
+        self.assertEqual(fetcher.get_retry_delay(0, '120'), 4.0)
+        for attempt in range(6):
+            self.assertTrue(
+                0 <= fetcher.get_retry_delay(attempt) <= min(4.0, 2 ** attempt))
+
+if __name__ == "__main__":
+    unittest.main()
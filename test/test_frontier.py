@@ -0,0 +1,121 @@
+import unittest
+
+import os
+
+import tempfile
+
+from datetime import date
+
+from fantalytix_python_crawler.crawler.frontier import (Frontier,
+                                                        FrontierItem,
+                                                        normalize_url)
+
+BASE_URL = 'https://www.basketball-reference.com'
+
+class TestFrontier(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, 'frontier.sqlite')
+        self.frontier = Frontier(self.path, clock=lambda: 1000.0)
+
+    def tearDown(self):
+        self.frontier.close()
+        self.temp_dir.cleanup()
+
+    def get_items(self, paths, stage='boxscores', priority=0):
+        return [(BASE_URL + path, stage, {'path': path}, priority)
+                for path in paths]
+
+    def test_normalize_url(self):
+        self.assertEqual(
+            normalize_url('HTTPS://Example.com:443/a?b=2&a=1#x'),
+            'https://example.com/a?a=1&b=2')
+        self.assertEqual(normalize_url('http://example.com:8080'),
+                         'http://example.com:8080/')
+        self.assertEqual(normalize_url('http://example.com/A/b.html'),
+                         'http://example.com/A/b.html')
+
+    def test_add(self):
+        new = self.frontier.add(self.get_items(['/a', '/b', '/a']))
+        self.assertEqual([item.url for item in new],
+                         [BASE_URL + '/a', BASE_URL + '/b'])
+        self.assertEqual(new[0], FrontierItem(BASE_URL + '/a', 'boxscores',
+                                              {'path': '/a'}, 0))
+        new = self.frontier.add(self.get_items(['/b', '/c']) + [
+            ('HTTPS://WWW.basketball-reference.com/a#top', 'boxscores',
+             {}, 0)])
+        self.assertEqual([item.url for item in new], [BASE_URL + '/c'])
+        self.assertEqual(len(self.frontier), 3)
+        self.assertIn(BASE_URL + '/a#x', self.frontier)
+
+    def test_pop(self):
+        self.frontier.add(self.get_items(['/old'], priority=-2018))
+        self.frontier.add(self.get_items(['/new1', '/new2'], priority=-2019))
+        self.frontier.add(self.get_items(['/season'], 'seasons', -2019))
+        self.assertEqual([item.url for item in self.frontier.pop(2)],
+                         [BASE_URL + '/new1', BASE_URL + '/new2'])
+        self.assertEqual([item.url for item in self.frontier.pop(
+            10, 'boxscores')], [BASE_URL + '/old'])
+        self.assertEqual([item.url for item in self.frontier.pop(10)],
+                         [BASE_URL + '/season'])
+        self.assertEqual(self.frontier.pop(10), [])
+        self.assertEqual(self.frontier.get_counts(), {
+            'pending': 0, 'in_flight': 4, 'done': 0, 'failed': 0})
+
+    def test_resume(self):
+        self.frontier.add(self.get_items(['/a', '/b', '/c', '/d']))
+        a, b, c = self.frontier.pop(3)
+        self.frontier.done(a.url)
+        self.frontier.failed(b.url)
+        self.frontier.close()
+
+        self.frontier = Frontier(self.path)
+        self.assertEqual([item.url for item in self.frontier.resume()],
+                         [BASE_URL + '/c', BASE_URL + '/d'])
+        self.assertEqual(self.frontier.get_counts(), {
+            'pending': 2, 'in_flight': 0, 'done': 1, 'failed': 1})
+        self.assertEqual([item.url for item in self.frontier.resume(True)],
+                         [BASE_URL + '/b', BASE_URL + '/c', BASE_URL + '/d'])
+        self.assertEqual(self.frontier.add(self.get_items(['/a'])), [])
+
+    def test_unnormalized_urls(self):
+        self.frontier.add(self.get_items(['/a', '/b']))
+        self.frontier.start('HTTPS://WWW.basketball-reference.com:443/a#x')
+        self.frontier.start(BASE_URL + '/b')
+        self.assertEqual(self.frontier.get_counts(), {
+            'pending': 0, 'in_flight': 2, 'done': 0, 'failed': 0})
+        self.frontier.done('HTTPS://WWW.basketball-reference.com/a#x')
+        self.frontier.failed('https://www.Basketball-Reference.com:443/b')
+        self.assertEqual(self.frontier.get_counts(), {
+            'pending': 0, 'in_flight': 0, 'done': 1, 'failed': 1})
+        self.assertEqual(self.frontier.resume(), [])
+
+    def test_requeue(self):
+        self.frontier.add(self.get_items(['/a', '/b', '/c']))
+        a, b = self.frontier.pop(2)
+        self.frontier.done(a.url)
+        self.frontier.failed(b.url)
+        new = self.frontier.add(self.get_items(['/a', '/b', '/c', '/d'],
+                                               priority=-1), requeue=True)
+        # '/c' is still pending, so it is not handed out again
+        self.assertEqual([item.url for item in new],
+                         [BASE_URL + '/d', BASE_URL + '/a', BASE_URL + '/b'])
+        self.assertEqual(self.frontier.get_counts(), {
+            'pending': 4, 'in_flight': 0, 'done': 0, 'failed': 0})
+        self.assertEqual(self.frontier.pop()[0].url, BASE_URL + '/a')
+
+    def test_context(self):
+        context = {'league': 'NBA', 'end_year': 2019,
+                   'game_date': date(2018, 10, 31)}
+        self.frontier.add([(BASE_URL + '/a', 'boxscores', context, 0)])
+        self.assertEqual(self.frontier.pop()[0].context, context)
+
+    def test_many(self):
+        paths = ['/boxscores/{}.html'.format(i) for i in range(5000)]
+        self.assertEqual(len(self.frontier.add(self.get_items(paths))), 5000)
+        self.assertEqual(self.frontier.add(self.get_items(paths)), [])
+        self.assertEqual(len(self.frontier.pop(10000)), 5000)
+
+if __name__ == "__main__":
+    unittest.main()
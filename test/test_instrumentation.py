@@ -0,0 +1,156 @@
+import unittest
+
+import json
+
+from fantalytix_python_crawler.crawler.instrumentation import (
+    Instrumentation, count_rows)
+from fantalytix_python_crawler.crawler.sports_reference.basketball\
+    .base_page_parser import BasePageParser
+from fantalytix_python_crawler.crawler.sports_reference.basketball\
+    .boxscore_page_parser import BoxscorePageParser
+from fantalytix_python_crawler.crawler.sports_reference.basketball\
+    .player_dir_page_parser import PlayersDirPageParser
+from fantalytix_python_crawler.crawler.sports_reference.basketball\
+    .season_schedule_page_parser import SeasonSchedulePageParser
+
+from test.sports_reference.basketball.fixtures import load_fixture
+
+class TickClock:
+    """Advances one second each time it is read."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        self.now += 1.0
+        return self.now
+
+class Parser:
+
+    INSTRUMENTED_METHODS = {'convert': 'convert', 'build_row': 'rows'}
+
+    def count_rows(self, data):
+        return count_rows(data)
+
+    def convert(self, text):
+        return int(text)
+
+    def build_row(self, text):
+        return {'value': self.convert(text)}
+
+    def get_data(self, texts):
+        return [self.build_row(text) for text in texts]
+
+class TestInstrumentation(unittest.TestCase):
+
+    def tearDown(self):
+        BasePageParser.disable_instrumentation()
+
+    def test_count_rows(self):
+        self.assertEqual(count_rows([1, 2, 3]), 3)
+        self.assertEqual(count_rows({'a': [1, 2], 'b': {'c': [3]}}), 3)
+        self.assertEqual(count_rows({'name': 'x'}), 1)
+
+    def test_exclusive_times(self):
+        instrumentation = Instrumentation(clock=TickClock())
+        with instrumentation:
+            instrumentation.install(Parser)
+            self.assertEqual(Parser().get_data(['1', '2']),
+                             [{'value': 1}, {'value': 2}])
+        stats = instrumentation.get_stats()['Parser']
+        self.assertEqual(stats['pages'], 1)
+        self.assertEqual(stats['rows'], 2)
+        self.assertEqual(stats['phases']['convert'],
+                         {'calls': 2, 'seconds': 2.0})
+        self.assertEqual(stats['phases']['rows'],
+                         {'calls': 2, 'seconds': 4.0})
+        self.assertEqual(stats['phases']['parse'],
+                         {'calls': 1, 'seconds': 3.0})
+        self.assertEqual(Parser.__dict__['get_data'].__name__, 'get_data')
+        self.assertFalse(hasattr(Parser.__dict__['get_data'], '__wrapped__'))
+
+    def test_failure(self):
+        instrumentation = Instrumentation()
+        instrumentation.install(Parser)
+        with self.assertRaises(ValueError):
+            Parser().get_data(['x'])
+        instrumentation.uninstall()
+        stats = instrumentation.get_stats()['Parser']
+        self.assertEqual(stats['failures'], 1)
+        self.assertEqual(stats['pages'], 0)
+
+    def test_missing_method(self):
+        class Renamed:
+            INSTRUMENTED_METHODS = {'convert': 'convert', 'make_row': 'rows'}
+            convert = Parser.convert
+
+        instrumentation = Instrumentation()
+        with self.assertRaises(AttributeError):
+            instrumentation.install(Renamed)
+        self.assertEqual(instrumentation.patched, [])
+        self.assertFalse(hasattr(Renamed.__dict__['convert'], '__wrapped__'))
+
+    def test_parsers(self):
+        original = BoxscorePageParser.__dict__['get_data']
+        instrumentation = BasePageParser.enable_instrumentation()
+        self.assertIs(BasePageParser.instrumentation, instrumentation)
+        self.assertIsNot(BoxscorePageParser.__dict__['get_data'], original)
+        with self.assertRaises(RuntimeError):
+            BasePageParser.enable_instrumentation(instrumentation)
+
+        games = SeasonSchedulePageParser(
+            load_fixture('NBA_2019_games-october.html'),
+            parser='html.parser').get_data()
+        boxscore = BoxscorePageParser(
+            load_fixture('boxscore_201810310GSW.html'),
+            parser='html.parser').get_data()
+        urls = PlayersDirPageParser(load_fixture('players.html'),
+                                    parser='html.parser').get_urls()
+        BasePageParser.disable_instrumentation()
+
+        self.assertIs(BoxscorePageParser.__dict__['get_data'], original)
+        self.assertIsNone(BasePageParser.instrumentation)
+
+        stats = instrumentation.get_stats()
+        schedule = stats['SeasonSchedulePageParser']
+        self.assertEqual(schedule['pages'], 1)
+        self.assertEqual(schedule['rows'], len(games))
+        self.assertEqual(schedule['failures'], 0)
+        self.assertGreater(schedule['selects'], 0)
+        self.assertEqual(set(schedule['phases']),
+                         {'build', 'select', 'convert', 'rows', 'parse'})
+        self.assertEqual(stats['PlayersDirPageParser']['rows'], len(urls))
+        # one selector call gets the urls, however many it makes itself
+        self.assertEqual(stats['PlayersDirPageParser']['selects'], 1)
+        self.assertEqual(stats['BoxscorePageParser']['pages'], 1)
+        self.assertEqual(stats['BoxscorePageParser']['rows'], sum(
+            len(tables['basic']) + len(tables['advanced'])
+            for tables in boxscore.values()))
+        self.assertGreater(stats['BoxscorePageParser']['rows'], 40)
+        BoxscorePageParser(load_fixture('boxscore_201810310GSW.html'),
+                           parser='html.parser').get_data()
+        # parsed after disabling, so not counted
+        self.assertEqual(instrumentation.get_stats()
+                         ['BoxscorePageParser']['pages'], 1)
+
+        text = instrumentation.to_prometheus()
+        self.assertIn('# TYPE fantalytix_parser_phase_seconds_total counter',
+                      text)
+        self.assertIn('fantalytix_parser_pages_total'
+                      '{parser="SeasonSchedulePageParser"} 1', text)
+        self.assertIn('fantalytix_parser_rows_total'
+                      '{{parser="SeasonSchedulePageParser"}} {}'.format(
+                          len(games)), text)
+        line = json.loads(instrumentation.to_log_line())
+        self.assertEqual(line['parser_metrics']['BoxscorePageParser']
+                         ['pages'], 1)
+
+    def test_count_failure(self):
+        instrumentation = BasePageParser.enable_instrumentation()
+        parser = SeasonSchedulePageParser(
+            load_fixture('NBA_2019_games-october.html'),
+            parser='html.parser')
+        parser.get_abbreviation_and_year_from_url('/not/a/team')
+        BasePageParser.disable_instrumentation()
+        self.assertEqual(instrumentation.get_stats()
+                         ['SeasonSchedulePageParser']['failures'], 1)
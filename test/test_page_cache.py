@@ -0,0 +1,138 @@
+import unittest
+
+import os
+
+import tempfile
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from fantalytix_python_crawler.crawler.fetcher import FetchError
+from fantalytix_python_crawler.crawler.page_cache import (CacheMiss,
+                                                          CachingFetcher,
+                                                          PageCache)
+
+from .sports_reference.basketball.fixtures import load_fixture
+
+class Clock:
+
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+class TestPageCache(unittest.IsolatedAsyncioTestCase):
+    """Revalidates cached pages against a local stand-in for the site that
+    answers conditional requests.
+    """
+
+    ETAG = '"201810310GSW"'
+    LAST_MODIFIED = 'Thu, 01 Nov 2018 06:00:00 GMT'
+
+    async def asyncSetUp(self):
+        self.page = load_fixture('boxscore_201810310GSW.html')
+        self.requests = []
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.clock = Clock()
+        self.cache = PageCache(self.temp_dir.name, lambda url: 60,
+                               clock=self.clock)
+        app = web.Application()
+        app.router.add_get('/page', self.handle)
+        app.router.add_get('/unmodified', self.unmodified)
+        self.server = TestServer(app)
+        await self.server.start_server()
+        self.url = str(self.server.make_url('/page'))
+
+    async def asyncTearDown(self):
+        await self.server.close()
+        self.cache.close()
+        self.temp_dir.cleanup()
+
+    async def handle(self, request):
+        self.requests.append(dict(request.headers))
+        if request.headers.get('If-None-Match') == self.ETAG:
+            return web.Response(status=304)
+        return web.Response(text=self.page, content_type='text/html',
+                            headers={'ETag': self.ETAG,
+                                     'Last-Modified': self.LAST_MODIFIED})
+
+    async def unmodified(self, request):
+        self.requests.append(dict(request.headers))
+        return web.Response(status=304)
+
+    async def test_revalidation(self):
+        async with CachingFetcher(self.cache, rate=1000) as fetcher:
+            self.assertEqual(await fetcher.fetch(self.url), self.page)
+            self.assertEqual(await fetcher.fetch(self.url), self.page)
+            self.assertEqual(len(self.requests), 1)
+            self.assertNotIn('If-None-Match', self.requests[0])
+
+            self.clock.now += 61
+            self.assertEqual(await fetcher.fetch(self.url), self.page)
+            self.assertEqual(len(self.requests), 2)
+            self.assertEqual(self.requests[1]['If-None-Match'], self.ETAG)
+            self.assertEqual(self.requests[1]['If-Modified-Since'],
+                             self.LAST_MODIFIED)
+
+            self.assertEqual(await fetcher.fetch(self.url), self.page)
+            self.assertEqual(len(self.requests), 2)
+        self.assertEqual(
+            (fetcher.hits, fetcher.revalidated, fetcher.downloads), (2, 1, 1))
+        self.assertEqual(self.cache.get(self.url).fetched_at, self.clock.now)
+
+    async def test_not_modified_without_page(self):
+        url = str(self.server.make_url('/unmodified'))
+        async with CachingFetcher(self.cache, rate=1000) as fetcher:
+            with self.assertRaises(FetchError) as cm:
+                await fetcher.fetch(url)
+            self.assertEqual(cm.exception.status, 304)
+            # a page whose body went missing is fetched unconditionally
+            self.assertEqual(await fetcher.fetch(self.url), self.page)
+            digest, = self.cache.db.execute(
+                'SELECT digest FROM pages').fetchone()
+            os.remove(self.cache.object_path(digest))
+            self.clock.now += 61
+            self.assertEqual(await fetcher.fetch(self.url), self.page)
+        self.assertNotIn('If-None-Match', self.requests[-1])
+        self.assertNotIn(url, self.cache)
+        self.assertEqual(fetcher.downloads, 2)
+
+    async def test_offline(self):
+        self.cache.put(self.url, self.page)
+        self.clock.now += 3600
+        fetcher = CachingFetcher(self.cache, offline=True)
+        self.assertEqual(await fetcher.fetch(self.url), self.page)
+        with self.assertRaises(CacheMiss) as cm:
+            await fetcher.fetch(self.url + '?missing')
+        self.assertIsNone(cm.exception.status)
+        self.assertEqual(self.requests, [])
+
+    def test_storage(self):
+        self.cache.put('https://example.com/a', self.page, etag='"a"')
+        self.cache.put('https://example.com/b', self.page)
+        self.assertEqual(len(self.cache), 2)
+        self.assertIn('https://example.com/a', self.cache)
+        self.assertIsNone(self.cache.get('https://example.com/c'))
+
+        page = self.cache.get('https://example.com/a')
+        self.assertEqual(page.html, self.page)
+        self.assertEqual(page.etag, '"a"')
+        self.assertIsNone(page.last_modified)
+
+        objects = [os.path.join(root, name) for root, _, names in os.walk(
+            os.path.join(self.temp_dir.name, PageCache.OBJECTS_DIR))
+            for name in names]
+        self.assertEqual(len(objects), 1)
+        self.assertTrue(os.path.getsize(objects[0]) < len(self.page) / 2)
+
+    def test_is_fresh(self):
+        self.cache.put(self.url, self.page)
+        self.assertTrue(self.cache.is_fresh(self.cache.get(self.url)))
+        self.clock.now += 60
+        self.assertFalse(self.cache.is_fresh(self.cache.get(self.url)))
+        self.cache.max_age = lambda url: None
+        self.assertTrue(self.cache.is_fresh(self.cache.get(self.url)))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,144 @@
+import unittest
+
+import os
+
+import sqlite3
+
+import tempfile
+
+from fantalytix_python_crawler.crawler.parse_cache import ParseCache
+from fantalytix_python_crawler.crawler.sports_reference.basketball\
+    .boxscore_page_parser import BoxscorePageParser
+from fantalytix_python_crawler.crawler.sports_reference.basketball\
+    .leagues_page_parser import LeaguesPageParser
+from fantalytix_python_crawler.crawler.sports_reference.basketball\
+    .player_dir_page_parser import PlayersDirPageParser
+
+from .sports_reference.basketball.fixtures import load_fixture
+
+class Clock:
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        self.now += 1
+        return self.now
+
+class CountingParser(LeaguesPageParser):
+
+    calls = 0
+
+    def get_data(self):
+        type(self).calls += 1
+        return super().get_data()
+
+class TestParseCache(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, 'parsed.sqlite')
+        self.cache = ParseCache(self.path, clock=Clock())
+        CountingParser.calls = 0
+        CountingParser.SCHEMA_VERSION = 1
+
+    def tearDown(self):
+        self.cache.close()
+        self.temp_dir.cleanup()
+
+    def test_parse(self):
+        page = load_fixture('leagues.html')
+        expected = LeaguesPageParser(page).get_data()
+        self.assertEqual(self.cache.parse(CountingParser, page), expected)
+        self.assertEqual(self.cache.parse(CountingParser, page), expected)
+        self.assertEqual(CountingParser.calls, 1)
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+        self.cache.close()
+        self.cache = ParseCache(self.path)
+        self.assertEqual(self.cache.parse(CountingParser, page), expected)
+        self.assertEqual(CountingParser.calls, 1)
+
+    def test_entry_method(self):
+        page = load_fixture('players.html')
+        expected = PlayersDirPageParser(page).get_urls()
+        self.assertEqual(self.cache.parse(PlayersDirPageParser, page),
+                         expected)
+        self.assertEqual(self.cache.parse(PlayersDirPageParser, page),
+                         expected)
+        self.assertEqual(self.cache.hits, 1)
+        with self.assertRaises(TypeError):
+            self.cache.parse(object, page)
+
+    def test_hits_are_not_written(self):
+        """A hit's time is written with the next put or on close."""
+        page = '<html>0</html>'
+        self.cache.parse(CountingParser, page)
+        changes = self.cache.db.total_changes
+        self.cache.parse(CountingParser, page)
+        self.assertEqual(self.cache.db.total_changes, changes)
+        self.assertFalse(self.cache.db.in_transaction)
+        self.cache.close()
+        self.cache = ParseCache(self.path)
+        self.assertEqual(self.cache.db.execute(
+            'SELECT used_at FROM results').fetchone(), (2.0,))
+
+    def test_engines(self):
+        """A result parsed with one engine is not served for another."""
+        page = load_fixture('leagues.html')
+        self.cache.parse(CountingParser, page, 'html.parser')
+        self.cache.parse(CountingParser, page, 'lxml.html')
+        self.assertEqual(CountingParser.calls, 2)
+        self.cache.parse(CountingParser, page, 'lxml.html')
+        self.assertEqual(CountingParser.calls, 2)
+        self.assertEqual(len(self.cache), 2)
+
+    def test_unkeyed_layout(self):
+        """A cache file without the engine in its key is emptied."""
+        self.cache.close()
+        os.remove(self.path)
+        db = sqlite3.connect(self.path)
+        db.execute('CREATE TABLE results (digest TEXT, parser_class TEXT, '
+                   'version INTEGER, data BLOB, used_at REAL)')
+        db.execute("INSERT INTO results VALUES ('a', 'b', 1, x'00', 0)")
+        db.commit()
+        db.close()
+        self.cache = ParseCache(self.path)
+        self.assertEqual(len(self.cache), 0)
+        self.cache.parse(CountingParser, load_fixture('leagues.html'))
+        self.assertEqual(len(self.cache), 1)
+
+    def test_schema_version(self):
+        leagues = load_fixture('leagues.html')
+        boxscore = load_fixture('boxscore_201810310GSW.html')
+        self.cache.parse(CountingParser, leagues)
+        self.cache.parse(BoxscorePageParser, boxscore)
+
+        self.cache.close()
+        CountingParser.SCHEMA_VERSION = 2
+        self.cache = ParseCache(self.path)
+        self.cache.parse(CountingParser, leagues)
+        self.assertEqual(CountingParser.calls, 2)
+        self.assertEqual(len(self.cache), 2)
+        self.cache.parse(BoxscorePageParser, boxscore)
+        self.assertEqual(self.cache.hits, 1)
+
+    def test_lru_eviction(self):
+        pages = ['<html>{}</html>'.format(i) for i in range(4)]
+        for page in pages[:3]:
+            self.cache.parse(CountingParser, page)
+        size = self.cache.size
+        self.cache.max_bytes = size
+        self.cache.parse(CountingParser, pages[0])
+        self.cache.parse(CountingParser, pages[3])
+        self.assertTrue(self.cache.size <= size)
+        self.assertEqual(len(self.cache), 3)
+        calls = CountingParser.calls
+        self.cache.parse(CountingParser, pages[0])
+        self.cache.parse(CountingParser, pages[2])
+        self.assertEqual(CountingParser.calls, calls)
+        self.cache.parse(CountingParser, pages[1])
+        self.assertEqual(CountingParser.calls, calls + 1)
+
+if __name__ == "__main__":
+    unittest.main()
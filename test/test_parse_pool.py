@@ -0,0 +1,50 @@
+import unittest
+
+from fantalytix_python_crawler.crawler.parse_pool import (ParsePool,
+                                                          parse_many,
+                                                          parse_page)
+from fantalytix_python_crawler.crawler.sports_reference.basketball\
+    .boxscore_page_parser import BoxscorePageParser
+from fantalytix_python_crawler.crawler.sports_reference.basketball\
+    .season_schedule_page_parser import SeasonSchedulePageParser
+
+from .sports_reference.basketball.fixtures import load_fixture
+
+class TestParsePool(unittest.TestCase):
+
+    def setUp(self):
+        self.boxscore = load_fixture('boxscore_201810310GSW.html')
+        self.schedule = load_fixture('NBA_2019_games-october.html')
+
+    def test_parse_page(self):
+        expected = BoxscorePageParser(self.boxscore).get_data()
+        self.assertEqual(parse_page(BoxscorePageParser, self.boxscore),
+                         expected)
+        self.assertEqual(parse_page(BoxscorePageParser,
+                                    self.boxscore.encode('utf-8')), expected)
+
+    def test_parse_many(self):
+        pages = [self.schedule, '', self.schedule.encode('utf-8')]
+        expected = [SeasonSchedulePageParser(self.schedule).get_data(), [],
+                    SeasonSchedulePageParser(self.schedule).get_data()]
+        self.assertEqual(
+            parse_many(SeasonSchedulePageParser, pages, workers=2,
+                       min_batch=1), expected)
+        self.assertEqual(
+            sorted(parse_many(SeasonSchedulePageParser, pages, workers=2,
+                              ordered=False, min_batch=1),
+                   key=lambda result: result[0]),
+            list(enumerate(expected)))
+
+    def test_in_process(self):
+        with ParsePool(workers=4, min_batch=4) as pool:
+            self.assertEqual(
+                pool.map(SeasonSchedulePageParser, [self.schedule]),
+                [SeasonSchedulePageParser(self.schedule).get_data()])
+            self.assertIsNone(pool.pool)
+        with ParsePool(workers=1, min_batch=1) as pool:
+            pool.map(SeasonSchedulePageParser, [self.schedule] * 2)
+            self.assertIsNone(pool.pool)
+
+if __name__ == "__main__":
+    unittest.main()